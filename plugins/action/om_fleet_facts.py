@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2024, Opengear Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_fleet_facts action plugin
+Gathers resource facts from many om devices concurrently, from a single
+task on the controller, without starting a worker, a persistent
+connection or a module execution per device.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import tempfile
+import time
+import types
+
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.module_utils.six.moves.http_client import HTTPException
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.urls import open_url
+from ansible.plugins.action import ActionBase
+from ansible_collections.opengear.om.plugins.httpapi.om import CircuitBreaker, RequestStats
+from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import FACT_RESOURCE_SUBSETS
+
+API_PATH = '/api/v2/'
+
+
+class OmRequestError(Exception):
+    pass
+
+
+class OmClient(object):
+    """
+    A client for the om REST API, sending each request with a blocking open_url call, with the proxy, certificate
+    and cipher settings of the httpapi connection. The facts classes read the device through it as they do through
+    the httpapi connection. When stats is given, the requests are recorded in it as the httpapi plugin records them.
+    """
+
+    def __init__(self, settings, stats=None):
+        self.url = '%s://%s:%s%s' % ('https' if settings['use_ssl'] else 'http', settings['host'],
+                                     settings['port'] or (443 if settings['use_ssl'] else 80), API_PATH)
+        self.url_kwargs = {
+            'timeout': settings['timeout'],
+            'validate_certs': settings['validate_certs'],
+            'use_proxy': settings['use_proxy'],
+            'ca_path': settings['ca_path'],
+            'client_cert': settings['client_cert'],
+            'client_key': settings['client_key'],
+        }
+        if settings['ciphers']:
+            self.url_kwargs['ciphers'] = settings['ciphers']
+        self.token = None
+        self.responses = {}
+        self.stats = stats
+
+    def _send(self, method, path, body):
+        started = time.time()
+        try:
+            status, content = self._exchange(method, path, body)
+        except Exception:
+            if self.stats:
+                self.stats.record(method, path, time.time() - started, len(body or ''), 0, True)
+            raise
+        if self.stats:
+            self.stats.record(method, path, time.time() - started, len(body or ''), len(content), status >= 400)
+        return status, content
+
+    def _exchange(self, method, path, body):
+        headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = 'Token %s' % self.token
+        try:
+            response = open_url(self.url + path, data=body, method=method, headers=headers, **self.url_kwargs)
+            return response.getcode(), response.read()
+        except HTTPError as exc:
+            return exc.code, exc.read()
+        except HTTPException as exc:
+            # A malformed or truncated response, for example from a device closing the connection
+            raise OmRequestError('%s %s returned an invalid HTTP response: %r' % (method, path, exc))
+
+    def request(self, method, path, data=None):
+        body = json.dumps(data) if data is not None else None
+        status, content = self._send(method, path, body)
+
+        try:
+            response = json.loads(content.decode('utf-8')) if content.strip() else None
+        except ValueError:
+            raise OmRequestError('%s %s returned HTTP %d with a body that is not JSON' % (method, path, status))
+        if isinstance(response, dict) and 'error' in response:
+            try:
+                raise OmRequestError(response['error'][0]['text'])
+            except (IndexError, KeyError, TypeError):
+                raise OmRequestError('%s %s returned the error %s' % (method, path, response['error']))
+        if status >= 400:
+            raise OmRequestError('%s %s returned HTTP %d' % (method, path, status))
+        return response
+
+    def get(self, command, path):
+        # Some facts classes read a path several times, or again when it holds an empty list
+        if path not in self.responses:
+            self.responses[path] = self.request('GET', path)
+        elif self.stats:
+            self.stats.record_cache_hit('GET', path)
+        return deepcopy(self.responses[path])
+
+    def get_page_size(self):
+        # Lists are fetched whole, a single request per path being already cheap on a kept alive connection
+        return None
+
+    def login(self, username, password):
+        response = self.request('POST', 'sessions/', {'username': username, 'password': password})
+        if not isinstance(response, dict) or 'session' not in response:
+            raise OmRequestError('the device did not return a session')
+        self.token = response['session']
+
+    def logout(self):
+        try:
+            self.request('DELETE', 'sessions/self')
+        except Exception:
+            pass
+        finally:
+            self.token = None
+
+
+class ActionModule(ActionBase):
+    """
+    The om_fleet_facts action plugin
+    """
+
+    _requires_connection = False
+
+    argument_spec = {
+        'hosts': {'type': 'list', 'elements': 'str'},
+        'gather_network_resources': {'type': 'list', 'elements': 'str', 'default': ['all'],
+                                     'choices': ['all'] + sorted(FACT_RESOURCE_SUBSETS.keys())},
+        'max_hosts': {'type': 'int', 'default': 100},
+        'timeout': {'type': 'float', 'default': 30},
+        'dest': {'type': 'path'},
+    }
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        dummy, args = self.validate_argument_spec(argument_spec=self.argument_spec)
+
+        hosts = args['hosts'] or task_vars.get('ansible_play_batch', [])
+        resources = args['gather_network_resources']
+        if 'all' in resources:
+            resources = sorted(FACT_RESOURCE_SUBSETS.keys())
+
+        fleet_facts = {}
+        failed_hosts = {}
+        request_stats = {}
+        settings = {}
+        for host in hosts:
+            try:
+                host_vars = task_vars['hostvars'][host]
+            except KeyError:
+                host_vars = None
+            if not host_vars:
+                failed_hosts[host] = '%s is not in the inventory' % host
+                continue
+            settings[host] = self._get_host_settings(host_vars, args['timeout'])
+
+        executor = ThreadPoolExecutor(max_workers=max(min(args['max_hosts'], len(settings)), 1))
+        try:
+            gathered = list(executor.map(lambda host_settings: self._gather_host(host_settings, resources),
+                                         settings.values()))
+        finally:
+            executor.shutdown(wait=False)
+
+        for host, (facts, error, stats) in zip(settings, gathered):
+            if stats:
+                request_stats[host] = stats
+            if error:
+                failed_hosts[host] = error
+            else:
+                fleet_facts[host] = facts
+
+        if args['dest']:
+            self._write_facts(args['dest'], fleet_facts)
+
+        result.update({
+            'changed': False,
+            'om_fleet_facts': fleet_facts,
+            'failed_hosts': failed_hosts,
+        })
+        if request_stats:
+            result['fleet_request_stats'] = request_stats
+        return result
+
+    def _get_host_settings(self, host_vars, timeout):
+        templar = self._templar.copy_with_new_env(available_variables=host_vars)
+
+        def get(*names, **kwargs):
+            for name in names:
+                if name in host_vars:
+                    return templar.template(host_vars[name])
+            return kwargs.get('default')
+
+        use_ssl = boolean(get('ansible_httpapi_use_ssl', default=False), strict=False)
+        circuit_breaker_threshold = int(get('ansible_om_circuit_breaker_threshold', default=0))
+        breaker = None
+        if circuit_breaker_threshold:
+            breaker = CircuitBreaker(get('ansible_om_circuit_breaker_dir', default='~/.ansible/om_circuit_breaker'),
+                                     get('ansible_host', 'inventory_hostname'), circuit_breaker_threshold,
+                                     float(get('ansible_om_circuit_breaker_cooldown', default=300)))
+        return {
+            'host': get('ansible_host', 'inventory_hostname'),
+            'port': get('ansible_httpapi_port', 'ansible_port'),
+            'use_ssl': use_ssl,
+            'validate_certs': boolean(get('ansible_httpapi_validate_certs', default=True), strict=False),
+            'use_proxy': boolean(get('ansible_httpapi_use_proxy', default=True), strict=False),
+            'ca_path': get('ansible_httpapi_ca_path'),
+            'client_cert': get('ansible_httpapi_client_cert'),
+            'client_key': get('ansible_httpapi_client_key'),
+            'ciphers': get('ansible_httpapi_ciphers'),
+            'username': get('ansible_user', 'ansible_httpapi_user'),
+            'password': get('ansible_httpapi_password', 'ansible_password'),
+            'max_concurrency': int(get('ansible_om_max_concurrency', default=4)),
+            'collect_stats': boolean(get('ansible_om_collect_stats', default=False), strict=False),
+            'timeout': timeout,
+            'breaker': breaker,
+        }
+
+    def _gather_host(self, settings, resources):
+        """
+        Gathers the facts of the resources from a device, the resources being read concurrently, up to the
+        max_concurrency of the device at a time.
+        :return: The facts, None, and the statistics of the requests when collect_stats is set, or None, the error
+         the facts could not be gathered with, and the statistics.
+        """
+        breaker = settings['breaker']
+        if breaker and breaker.remaining_cooldown():
+            return (None, '%s has been unreachable for %d consecutive attempts' % (settings['host'], breaker.failures),
+                    None)
+
+        stats = RequestStats() if settings['collect_stats'] else None
+        facts, error = self._gather_resources(settings, resources, OmClient(settings, stats))
+        return facts, error, stats.summary() if stats else None
+
+    def _gather_resources(self, settings, resources, client):
+        breaker = settings['breaker']
+        try:
+            client.login(settings['username'], settings['password'])
+        except OSError as exc:
+            if breaker:
+                breaker.record_failure()
+            return None, 'Could not connect to %s: %s' % (settings['host'], exc or 'timed out')
+        except Exception as exc:
+            return None, 'Could not log in to %s: %s' % (settings['host'], exc)
+        if breaker:
+            breaker.record_success()
+        executor = ThreadPoolExecutor(max_workers=max(min(settings['max_concurrency'], len(resources)), 1))
+        try:
+            network_resources = {}
+            for facts in executor.map(lambda resource: self._gather_resource(client, resource), resources):
+                network_resources.update(facts)
+            return {'ansible_network_resources': network_resources}, None
+        except Exception as exc:
+            return None, 'Failed to gather facts from %s: %s' % (settings['host'], exc or 'timed out')
+        finally:
+            executor.shutdown()
+            client.logout()
+
+    @staticmethod
+    def _gather_resource(client, resource):
+        """
+        Runs the facts class of a resource once against the client, so the facts are gathered from the same REST
+        paths and rendered by the same code as om_facts.
+        """
+        facts_class = FACT_RESOURCE_SUBSETS[resource](None)
+        data = facts_class.get_device_data(client)
+        if isinstance(data, types.GeneratorType):
+            data = list(data)
+
+        ansible_facts = {'ansible_network_resources': {}}
+        try:
+            facts_class.populate_facts(client, ansible_facts, data)
+        except ValueError as exc:
+            raise OmRequestError('the %s configuration returned by the device is not valid: %s' % (resource, exc))
+        return ansible_facts['ansible_network_resources']
+
+    @staticmethod
+    def _write_facts(dest, fleet_facts):
+        """
+        Writes the facts of each host to its own file in dest, in the format used by the jsonfile fact cache.
+        """
+        if not os.path.isdir(dest):
+            os.makedirs(dest)
+        for host, facts in fleet_facts.items():
+            fd, tmp_path = tempfile.mkstemp(dir=dest, prefix='.' + host)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(facts, f, indent=4, sort_keys=True)
+            os.rename(tmp_path, os.path.join(dest, host))
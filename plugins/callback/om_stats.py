@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2024, Opengear Inc.
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_stats callback plugin
+Aggregates the request statistics returned by the om modules across all
+the tasks and hosts of a playbook, and reports on them at its end.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r'''
+---
+name: om_stats
+type: aggregate
+short_description: Report on the REST requests sent to om devices during a play
+description:
+  - Aggregates the statistics of the requests sent to om devices by the modules of the collection, across all the
+    tasks and hosts of the playbook, and prints a summary at the end of the playbook, optionally also written to a
+    JSON file.
+  - The summary lists the slowest devices and endpoints, the requests of each task, and the retries and cache hits.
+    The share of the task time each device spent waiting for requests separates slow devices or networks from
+    controller side bottlenecks.
+  - The statistics are only returned by the modules when the C(collect_stats) option of the
+    P(opengear.om.om#httpapi) plugin is set, for example with the C(ansible_om_collect_stats) variable.
+  - The statistics returned by M(opengear.om.om_fleet_facts) are counted for each device it gathered facts from,
+    rather than for the host the task ran on.
+version_added: "1.1.0"
+author:
+  - Adrian Van Katwyk (@avankatwyk)
+  - Matt Witmer (@mattwitt)
+requirements:
+  - Enable the callback with the C(callbacks_enabled) setting.
+options:
+  top:
+    description:
+      - The number of devices and endpoints listed in the summary.
+    type: int
+    default: 10
+    env:
+      - name: ANSIBLE_OM_STATS_TOP
+    ini:
+      - section: callback_om_stats
+        key: top
+  output_file:
+    description:
+      - The path of a JSON file the full statistics are written to at the end of the playbook.
+    type: path
+    env:
+      - name: ANSIBLE_OM_STATS_OUTPUT_FILE
+    ini:
+      - section: callback_om_stats
+        key: output_file
+'''
+
+import json
+import time
+
+from ansible.plugins.callback import CallbackBase
+
+COUNTERS = ('requests', 'errors', 'retries', 'cache_hits', 'seconds', 'bytes_sent', 'bytes_received')
+
+
+def new_counters():
+    return dict((counter, 0) for counter in COUNTERS)
+
+
+def add_counters(totals, stats):
+    for counter in COUNTERS:
+        totals[counter] += stats.get(counter, 0)
+
+
+class CallbackModule(CallbackBase):
+    """
+    Aggregates the request_stats returned by the om modules and reports on them at the end of the playbook.
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'opengear.om.om_stats'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super(CallbackModule, self).__init__(*args, **kwargs)
+        self.hosts = {}
+        self.endpoints = {}
+        self.tasks = {}
+        self._started = {}
+
+    def v2_runner_on_start(self, host, task):
+        self._started[(host.get_name(), task._uuid)] = time.time()
+
+    def v2_runner_on_ok(self, result):
+        self.record(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self.record(result)
+
+    def record(self, result):
+        host = result._host.get_name()
+        started = self._started.pop((host, result._task._uuid), None)
+        task = result._task.get_name()
+        items = result._result.get('results') if isinstance(result._result.get('results'), list) else None
+        items = [item for item in items or [result._result] if isinstance(item, dict)]
+        all_stats = [item['request_stats'] for item in items if item.get('request_stats')]
+        if all_stats:
+            self.add(host, task, all_stats, time.time() - started if started is not None else 0)
+        # The requests of om_fleet_facts were sent to other devices than the host the task ran on
+        for item in items:
+            fleet_stats = item.get('fleet_request_stats')
+            if isinstance(fleet_stats, dict):
+                for device, stats in fleet_stats.items():
+                    if stats:
+                        self.add(device, task, [stats], 0)
+
+    def add(self, host, task, all_stats, task_seconds):
+        host_totals = self.hosts.setdefault(host, dict(new_counters(), tasks=0, task_seconds=0))
+        host_totals['tasks'] += 1
+        host_totals['task_seconds'] += task_seconds
+        task_totals = self.tasks.setdefault(task, dict(new_counters(), hosts=0))
+        task_totals['hosts'] += 1
+        for stats in all_stats:
+            add_counters(host_totals, stats)
+            add_counters(task_totals, stats)
+            for endpoint, endpoint_stats in stats.get('endpoints', {}).items():
+                endpoint_totals = self.endpoints.setdefault(endpoint, dict(new_counters(), max_seconds=0))
+                add_counters(endpoint_totals, endpoint_stats)
+                endpoint_totals['max_seconds'] = max(endpoint_totals['max_seconds'],
+                                                     endpoint_stats.get('max_seconds', 0))
+
+    def summary(self):
+        totals = new_counters()
+        for host_totals in self.hosts.values():
+            add_counters(totals, host_totals)
+            if host_totals['task_seconds']:
+                host_totals['request_share'] = round(min(host_totals['seconds'] / host_totals['task_seconds'], 1), 3)
+        for endpoint_totals in self.endpoints.values():
+            endpoint_totals['mean_seconds'] = round(endpoint_totals['seconds'] / max(endpoint_totals['requests'], 1), 6)
+        return {'totals': totals, 'hosts': self.hosts, 'endpoints': self.endpoints, 'tasks': self.tasks}
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.hosts:
+            return
+        summary = self.summary()
+        top = self.get_option('top')
+        totals = summary['totals']
+
+        self._display.banner('OM REQUESTS')
+        self._display.display('%d requests to %d devices in %.1fs, %d errors, %d retries, %d cache hits, '
+                              '%d bytes sent, %d bytes received'
+                              % (totals['requests'], len(self.hosts), totals['seconds'], totals['errors'],
+                                 totals['retries'], totals['cache_hits'], totals['bytes_sent'],
+                                 totals['bytes_received']))
+
+        self._display.display('\nSlowest devices:')
+        for host, host_totals in sorted(self.hosts.items(), key=lambda item: -item[1]['seconds'])[:top]:
+            share = host_totals.get('request_share')
+            self._display.display('  %-40s %8.2fs %6d requests %4d retries%s'
+                                  % (host, host_totals['seconds'], host_totals['requests'], host_totals['retries'],
+                                     '  %3d%% of task time' % (share * 100) if share is not None else ''))
+
+        self._display.display('\nSlowest endpoints:')
+        for endpoint, endpoint_totals in sorted(self.endpoints.items(),
+                                                key=lambda item: -item[1]['mean_seconds'])[:top]:
+            self._display.display('  %-40s %8.3fs mean %8.3fs max %6d requests %4d cache hits'
+                                  % (endpoint, endpoint_totals['mean_seconds'], endpoint_totals['max_seconds'],
+                                     endpoint_totals['requests'], endpoint_totals['cache_hits']))
+
+        self._display.display('\nRequests per task:')
+        for task, task_totals in self.tasks.items():
+            self._display.display('  %-40s %6d requests on %d devices, %.2fs'
+                                  % (task, task_totals['requests'], task_totals['hosts'], task_totals['seconds']))
+
+        output_file = self.get_option('output_file')
+        if output_file:
+            with open(output_file, 'w') as file_handle:
+                json.dump(summary, file_handle, indent=2, sort_keys=True)
@@ -13,18 +13,237 @@ name: om
 short_description: HttpApi Plugin for Opengear OM & CM8100 devices
 description:
   - This HttpApi plugin provides methods to connect to Opengear OM & CM8100 devices over a HTTP(S)-based API.
-options: {}
 version_added: "1.0.2"
 author:
   - Adrian Van Katwyk (@avankatwyk)
   - Matt Witmer (@mattwitt)
+options:
+  rate_limit:
+    description:
+      - The maximum number of requests per second sent to the device.
+      - Set to C(0) to disable rate limiting.
+    type: float
+    default: 0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_RATE_LIMIT
+    vars:
+      - name: ansible_om_rate_limit
+  rate_burst:
+    description:
+      - The number of requests that may be sent in a burst before I(rate_limit) applies.
+    type: int
+    default: 1
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_RATE_BURST
+    vars:
+      - name: ansible_om_rate_burst
+  max_concurrency:
+    description:
+      - The maximum number of requests in flight to the device when requests are sent concurrently.
+      - The number of requests in flight is adapted between 1 and this value, increasing it additively
+        while the device responds normally and halving it when the device is throttling or timing out.
+    type: int
+    default: 4
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_MAX_CONCURRENCY
+    vars:
+      - name: ansible_om_max_concurrency
+  retries:
+    description:
+      - The number of times a request is retried when the device responds with HTTP 429 or 503, or the
+        request times out.
+      - A POST that times out is not retried, as the device may have created the instance already.
+    type: int
+    default: 3
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_RETRIES
+    vars:
+      - name: ansible_om_retries
+  retry_backoff:
+    description:
+      - The base delay in seconds between retries. The delay doubles with every retry and is randomly jittered.
+      - A C(Retry-After) header sent by the device takes precedence when it is longer.
+    type: float
+    default: 1.0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_RETRY_BACKOFF
+    vars:
+      - name: ansible_om_retry_backoff
+  retry_max_backoff:
+    description:
+      - The maximum delay in seconds between retries.
+    type: float
+    default: 30.0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_RETRY_MAX_BACKOFF
+    vars:
+      - name: ansible_om_retry_max_backoff
+  circuit_breaker_threshold:
+    description:
+      - The number of consecutive failures to reach the device after which requests to it fail immediately,
+        without waiting for connection timeouts, for I(circuit_breaker_cooldown) seconds.
+      - The state is kept in I(circuit_breaker_dir) so that it is shared by all tasks run against the device.
+      - Only requests that fail to reach the device count as failures. Probes, such as those waiting for the
+        device to restart, do not.
+      - The circuit breaker is disabled when set to C(0), the default.
+    type: int
+    default: 0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CIRCUIT_BREAKER_THRESHOLD
+    vars:
+      - name: ansible_om_circuit_breaker_threshold
+  circuit_breaker_cooldown:
+    description:
+      - The number of seconds requests fail immediately once the circuit breaker has opened. After this period
+        a single lightweight probe is sent to the device, closing the circuit breaker if the device responds.
+    type: float
+    default: 300
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CIRCUIT_BREAKER_COOLDOWN
+    vars:
+      - name: ansible_om_circuit_breaker_cooldown
+  circuit_breaker_probe_timeout:
+    description:
+      - The timeout in seconds of the probe sent to the device when the cooldown has elapsed.
+    type: float
+    default: 5
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CIRCUIT_BREAKER_PROBE_TIMEOUT
+    vars:
+      - name: ansible_om_circuit_breaker_probe_timeout
+  circuit_breaker_dir:
+    description:
+      - The directory on the controller holding the circuit breaker state of each device.
+    type: path
+    default: ~/.ansible/om_circuit_breaker
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CIRCUIT_BREAKER_DIR
+    vars:
+      - name: ansible_om_circuit_breaker_dir
+  request_cache:
+    description:
+      - Whether GET responses are cached for the duration of a task, so that a path read several times, for
+        example before and after a configuration change or by several resources of M(opengear.om.om_facts), is
+        only requested once. Identical GET requests in flight at the same time are also sent only once.
+      - A write to a path invalidates the cached responses under the same top level path, for example a PUT to
+        C(users/users-3) invalidates C(users).
+    type: bool
+    default: true
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_REQUEST_CACHE
+    vars:
+      - name: ansible_om_request_cache
+  page_size:
+    description:
+      - The number of instances requested at a time from the list endpoints of the device, such as C(users) or
+        C(groups), using the C(offset) and C(limit) query parameters. The facts of each page are rendered
+        before the next page is requested.
+      - A device that does not support these parameters returns the whole list with the first page.
+      - Set to C(0) to request each list in a single request.
+    type: int
+    default: 0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_PAGE_SIZE
+    vars:
+      - name: ansible_om_page_size
+  cassette:
+    description:
+      - The path of a cassette file on the controller, recording the requests sent to the device with their
+        responses, or replaying them instead of contacting the device, as set by I(cassette_mode).
+      - The cassette holds an exchange per line, as a JSON object with the C(method), C(path) and C(data) of the
+        request, the C(status) and C(body) of the response, and the response time in seconds in C(elapsed).
+      - Only the requests of the REST API are recorded. Uploads, downloads and probes always reach the device.
+      - The passwords sent to open a session are not recorded.
+    type: path
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CASSETTE
+    vars:
+      - name: ansible_om_cassette
+  cassette_mode:
+    description:
+      - C(record) sends the requests to the device and appends them to I(cassette), so that the exchanges of all the
+        tasks of a play are recorded. Remove the file before recording it again.
+      - C(replay) answers the requests from I(cassette), without contacting the device. A request is answered with
+        the next recorded exchange with the same method and path, or with the last one once all of them were
+        replayed. The data of the requests is recorded but not compared, as the order of some lists sent to the
+        device may vary from run to run.
+    type: str
+    choices:
+      - record
+      - replay
+    default: replay
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CASSETTE_MODE
+    vars:
+      - name: ansible_om_cassette_mode
+  cassette_latency:
+    description:
+      - When replaying, the factor the recorded response time of each exchange is multiplied by before answering,
+        C(1) reproducing the response times of the device.
+    type: float
+    default: 0
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_CASSETTE_LATENCY
+    vars:
+      - name: ansible_om_cassette_latency
+  collect_stats:
+    description:
+      - Whether the number, duration, size, retries and cache hits of the requests sent for a task are collected
+        and returned by the modules of the collection in C(request_stats), for the
+        P(opengear.om.om_stats#callback) callback plugin to report on.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+    env:
+      - name: ANSIBLE_OM_COLLECT_STATS
+    vars:
+      - name: ansible_om_collect_stats
 '''
 
+import gzip
+import hashlib
 import json
+import math
+import os
+import random
+import re
+import socket
+import tempfile
+import threading
+import time
+import uuid
 
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from io import BytesIO
+
+from ansible.errors import AnsibleConnectionFailure
 from ansible.module_utils.connection import ConnectionError
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.urls import open_url
 from ansible.plugins.httpapi import HttpApiBase
 
+RETRY_STATUS_CODES = frozenset([429, 503])
+LOGIN_PATH = 'sessions/'
+LOGOUT_PATH = 'sessions/self'
+INSTANCE_ID = re.compile(r'[^/?]+-\d+(?=/|$)')
+DOWNLOAD_BLOCK_SIZE = 64 * 1024
+
 
 def handle_response(response):
     if response:
@@ -36,31 +255,678 @@ def handle_response(response):
     return response
 
 
+def is_timeout(exc):
+    if isinstance(exc, socket.timeout):
+        return True
+    return 'timed out' in str(exc)
+
+
+def get_retry_after(response):
+    try:
+        retry_after = response.headers.get('Retry-After')
+        return float(retry_after) if retry_after else 0
+    except (AttributeError, ValueError):
+        return 0
+
+
+class TokenBucket(object):
+    """
+    Paces requests to a sustained rate, allowing bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.timestamp = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.time()
+            self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+class AdaptiveLimiter(object):
+    """
+    Bounds the number of requests in flight, using additive increase on success and multiplicative
+    decrease when the device throttles or times out.
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_limit = float(max(max_concurrency, 1))
+        self.limit = 1.0
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class CircuitBreaker(object):
+    """
+    Tracks consecutive failures to reach a device in a state file, so that tasks can fail fast while the
+    device is unreachable instead of each waiting for connection timeouts.
+    """
+
+    def __init__(self, state_dir, host, threshold, cooldown):
+        self.path = os.path.join(os.path.expanduser(state_dir), re.sub(r'[^\w.-]', '_', host) + '.json')
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            self.failures = state.get('failures', 0)
+            self.opened_at = state.get('opened_at')
+        except (IOError, OSError, ValueError):
+            self.failures = 0
+            self.opened_at = None
+
+    def save(self):
+        state_dir = os.path.dirname(self.path)
+        if not os.path.isdir(state_dir):
+            os.makedirs(state_dir)
+        fd, tmp_path = tempfile.mkstemp(dir=state_dir, prefix='.' + os.path.basename(self.path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'failures': self.failures, 'opened_at': self.opened_at}, f)
+        os.rename(tmp_path, self.path)
+
+    def remaining_cooldown(self):
+        """
+        :return: The number of seconds the circuit remains open, 0 if a probe is due, or None if it is closed.
+        """
+        if self.opened_at is None:
+            return None
+        return max(0, self.opened_at + self.cooldown - time.time())
+
+    def record_success(self):
+        with self._lock:
+            if self.failures or self.opened_at is not None:
+                self.failures = 0
+                self.opened_at = None
+                self.save()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.time()
+            self.save()
+
+
+class RequestMemo(object):
+    """
+    Caches GET responses by path and coalesces concurrent GETs of the same path into a single request.
+    """
+
+    def __init__(self):
+        self._responses = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_prefix(path):
+        # The pages of a list, such as users?offset=0&limit=50, are under the same prefix as its instances
+        return path.split('?')[0].strip('/').split('/')[0]
+
+    def get(self, path, fetch):
+        while True:
+            with self._lock:
+                if path in self._responses:
+                    return deepcopy(self._responses[path])
+                event = self._pending.get(path)
+                owner = event is None
+                if owner:
+                    event = self._pending[path] = threading.Event()
+            if owner:
+                break
+            # Another thread is fetching the path, use its response, or fetch it if that request failed
+            event.wait()
+
+        try:
+            response = fetch()
+            with self._lock:
+                # Do not cache a response that was invalidated by a write while in flight
+                if self._pending.get(path) is event:
+                    self._responses[path] = deepcopy(response)
+            return response
+        finally:
+            with self._lock:
+                if self._pending.get(path) is event:
+                    del self._pending[path]
+            event.set()
+
+    def invalidate(self, path):
+        prefix = self.get_prefix(path)
+        with self._lock:
+            for cached in [cached for cached in self._responses if self.get_prefix(cached) == prefix]:
+                del self._responses[cached]
+            for pending in [pending for pending in self._pending if self.get_prefix(pending) == prefix]:
+                del self._pending[pending]
+
+
+class MultipartBody(object):
+    """
+    A multipart/form-data body streaming a file from disk, so that large files such as firmware images are sent
+    in blocks and never held in memory.
+    """
+
+    def __init__(self, src, field, fields=None):
+        boundary = uuid.uuid4().hex
+        self.content_type = 'multipart/form-data; boundary=' + boundary
+        preamble = ''
+        for name, value in sorted((fields or {}).items()):
+            preamble += '--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n%s\r\n' % (boundary, name, value)
+        preamble += ('--%s\r\nContent-Disposition: form-data; name="%s"; filename="%s"\r\n'
+                     'Content-Type: application/octet-stream\r\n\r\n' % (boundary, field, os.path.basename(src)))
+        self._parts = [preamble.encode('utf-8'), None, ('\r\n--%s--\r\n' % boundary).encode('utf-8')]
+        self._src = src
+        self._file = None
+        self.length = len(self._parts[0]) + os.path.getsize(src) + len(self._parts[2])
+
+    def read(self, size=-1):
+        data = b''
+        while self._parts and (size < 0 or len(data) < size):
+            wanted = -1 if size < 0 else size - len(data)
+            if self._parts[0] is None:
+                if self._file is None:
+                    self._file = open(self._src, 'rb')
+                block = self._file.read(wanted)
+                if not block:
+                    self._file.close()
+                    self._parts.pop(0)
+            else:
+                block = self._parts[0] if wanted < 0 else self._parts[0][:wanted]
+                if len(block) == len(self._parts[0]):
+                    self._parts.pop(0)
+                else:
+                    self._parts[0] = self._parts[0][len(block):]
+            data += block
+        return data
+
+
+class CassetteResponse(object):
+    """
+    A response replayed from a cassette.
+    """
+
+    def __init__(self, status):
+        self.status = status
+        self.headers = {}
+
+    def getcode(self):
+        return self.status
+
+
+class Cassette(object):
+    """
+    Records the exchanges with the device to a file, one JSON object per line, or replays them from it.
+    """
+
+    def __init__(self, path, mode, latency=0):
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._replayed = set()
+        self.exchanges = []
+        # A recording is appended to the file as the exchanges happen, as the cassette is built again for every task
+        # on the controller and in every persistent connection, none of which can tell whether it is the first one
+        if mode == 'replay':
+            with open(path) as cassette_file:
+                self.exchanges = [json.loads(line) for line in cassette_file if line.strip()]
+
+    @staticmethod
+    def get_recorded_data(path, data):
+        # The credentials sent to open a session are left out
+        return None if path == LOGIN_PATH else data
+
+    def record(self, method, path, data, status, content, elapsed):
+        try:
+            body = json.loads(content) if content else None
+        except ValueError:
+            body = content
+        exchange = {'method': method, 'path': path, 'data': self.get_recorded_data(path, data), 'status': status,
+                    'body': body, 'elapsed': round(elapsed, 4)}
+        with self._lock:
+            self.exchanges.append(exchange)
+            with open(self.path, 'a') as cassette_file:
+                cassette_file.write(json.dumps(exchange, sort_keys=True) + '\n')
+
+    def play(self, method, path):
+        with self._lock:
+            matches = [index for index, exchange in enumerate(self.exchanges)
+                       if (exchange['method'], exchange['path']) == (method, path)]
+            if not matches:
+                raise AnsibleConnectionFailure('%s has no recorded exchange for %s %s' % (self.path, method, path))
+            index = next((index for index in matches if index not in self._replayed), matches[-1])
+            self._replayed.add(index)
+        exchange = self.exchanges[index]
+        if self.latency:
+            time.sleep(exchange['elapsed'] * self.latency)
+        body = exchange['body']
+        if body is not None and not isinstance(body, str):
+            body = json.dumps(body)
+        return CassetteResponse(exchange['status']), BytesIO((body or '').encode('utf-8'))
+
+
+class RequestStats(object):
+    """
+    Collects the number, duration, size, retries and cache hits of the requests sent to the device, per endpoint.
+    Every attempt of a retried request counts as a request. The ids of the instances are left out of the endpoints,
+    so that C(users/users-3) counts as C(users/{id}).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    @staticmethod
+    def get_endpoint(method, path):
+        return '%s %s' % (method, INSTANCE_ID.sub('{id}', path.split('?')[0]))
+
+    def _get_endpoint_stats(self, method, path):
+        return self.endpoints.setdefault(self.get_endpoint(method, path), {
+            'requests': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+            'bytes_sent': 0, 'bytes_received': 0})
+
+    def record(self, method, path, elapsed, bytes_sent, bytes_received, failed):
+        with self._lock:
+            stats = self._get_endpoint_stats(method, path)
+            stats['requests'] += 1
+            stats['errors'] += int(failed)
+            stats['seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+            stats['bytes_sent'] += bytes_sent
+            stats['bytes_received'] += bytes_received
+
+    def record_retry(self, method, path):
+        with self._lock:
+            self._get_endpoint_stats(method, path)['retries'] += 1
+
+    def record_cache_hit(self, method, path):
+        with self._lock:
+            self._get_endpoint_stats(method, path)['cache_hits'] += 1
+
+    def summary(self):
+        with self._lock:
+            endpoints = deepcopy(self.endpoints)
+        for stats in endpoints.values():
+            stats['seconds'] = round(stats['seconds'], 4)
+            stats['max_seconds'] = round(stats['max_seconds'], 4)
+        summary = dict((key, sum(stats[key] for stats in endpoints.values()))
+                       for key in ('requests', 'errors', 'retries', 'cache_hits', 'seconds', 'bytes_sent',
+                                   'bytes_received'))
+        summary['seconds'] = round(summary['seconds'], 4)
+        summary['endpoints'] = endpoints
+        return summary
+
+
 class HttpApi(HttpApiBase):
 
     def __init__(self, *args, **kwargs):
         super(HttpApi, self).__init__(*args, **kwargs)
         self._device_info = None
+        self._bucket = None
+        self._limiter = None
+        self._breaker = None
+        self._memo = None
+        self._cassette = None
+        self._stats = None
         self.path = '/api/v2/'
 
+    def set_options(self, task_keys=None, var_options=None, direct=None):
+        super(HttpApi, self).set_options(task_keys=task_keys, var_options=var_options, direct=direct)
+        self._bucket = None
+        if self.get_option('rate_limit'):
+            self._bucket = TokenBucket(self.get_option('rate_limit'), self.get_option('rate_burst'))
+        if not self._limiter or self._limiter.max_limit != self.get_option('max_concurrency'):
+            self._limiter = AdaptiveLimiter(self.get_option('max_concurrency'))
+        self._breaker = None
+        if self.get_option('circuit_breaker_threshold'):
+            self._breaker = CircuitBreaker(self.get_option('circuit_breaker_dir'), self.connection.get_option('host'),
+                                           self.get_option('circuit_breaker_threshold'),
+                                           self.get_option('circuit_breaker_cooldown'))
+        # The options are set for every task, so cached responses never outlive a task
+        self._memo = RequestMemo() if self.get_option('request_cache') else None
+        self._stats = RequestStats() if self.get_option('collect_stats') else None
+        # The cassette is kept across tasks, so that it records or replays all the exchanges of the connection
+        cassette = self.get_option('cassette')
+        cassette_mode = self.get_option('cassette_mode')
+        if not cassette:
+            self._cassette = None
+        elif not self._cassette or (self._cassette.path, self._cassette.mode) != (cassette, cassette_mode):
+            self._cassette = Cassette(cassette, cassette_mode, self.get_option('cassette_latency'))
+        else:
+            self._cassette.latency = self.get_option('cassette_latency')
+
+    def check_circuit(self):
+        """
+        Fails immediately while the circuit breaker of the device is open. Once the cooldown has elapsed, a single
+        probe decides whether the circuit closes or stays open for another cooldown period.
+        """
+        if not self._breaker:
+            return
+        remaining = self._breaker.remaining_cooldown()
+        if remaining is None:
+            return
+        if remaining > 0:
+            raise AnsibleConnectionFailure('%s has been unreachable for %d consecutive attempts, not retrying for '
+                                           'another %d seconds' % (self.connection.get_option('host'),
+                                                                   self._breaker.failures, math.ceil(remaining)))
+        try:
+            open_url(self.connection._url, timeout=self.get_option('circuit_breaker_probe_timeout'),
+                     validate_certs=self.connection.get_option('validate_certs'))
+        except HTTPError:
+            # Any HTTP response shows the device is reachable
+            pass
+        except Exception as exc:
+            self._breaker.record_failure()
+            raise AnsibleConnectionFailure('%s is still unreachable: %s' % (self.connection.get_option('host'), exc))
+        self._breaker.record_success()
+
     def login(self, username, password):
-        login_path = 'sessions/'
         data = {'username': username, 'password': password}
-        response = self.send_request(data, login_path, 'POST')
+        response = self.send_request(data, LOGIN_PATH, 'POST')
         self.connection._auth = {'Authorization': 'Token ' + response['session']}
 
     def get(self, command, path):
         return self.send_request(data=command, path=path)
 
     def send_request(self, data, path, method='GET'):
+        if not self._memo:
+            return self._send_request(data, path, method)
+        if method == 'GET' and data is None:
+            fetched = []
+
+            def fetch():
+                fetched.append(True)
+                return self._send_request(data, path, method)
+
+            response = self._memo.get(path, fetch)
+            if self._stats and not fetched:
+                self._stats.record_cache_hit(method, path)
+            return response
+        self._memo.invalidate(path)
+        try:
+            return self._send_request(data, path, method)
+        finally:
+            # Also drop responses fetched while the write was in flight
+            self._memo.invalidate(path)
+
+    def _send_request(self, data, path, method='GET'):
         headers = {'Content-Type': 'application/json'}
-        response, response_content = self.connection.send(self.path + path, json.dumps(data),
-                                                          method=method, headers=headers)
+        if not self._limiter:
+            self._limiter = AdaptiveLimiter(1)
+        # The connection logs in from within the request that needs a session, while holding a slot of the
+        # limiter, so the login does not wait for a slot
+        limiter = self._limiter if path != LOGIN_PATH else None
+        attempt = 0
+        while True:
+            self.check_circuit()
+            if self._bucket:
+                self._bucket.acquire()
+            if limiter:
+                limiter.acquire()
+            throttled = False
+            error = None
+            retry_after = 0
+            try:
+                response, response_content = self.exchange(data, path, method, headers)
+                throttled = response.getcode() in RETRY_STATUS_CODES
+                if throttled:
+                    retry_after = get_retry_after(response)
+            except (socket.timeout, AnsibleConnectionFailure) as exc:
+                # A failed login is reported by the nested request, count it only once
+                if self._breaker and not getattr(exc, '_om_circuit_recorded', False):
+                    self._breaker.record_failure()
+                    exc._om_circuit_recorded = True
+                # The device may have applied a POST that timed out, and would create the instance twice
+                if not is_timeout(exc) or method == 'POST':
+                    raise
+                throttled = True
+                error = exc
+            finally:
+                if limiter:
+                    limiter.release(throttled)
+            if self._breaker and not error:
+                self._breaker.record_success()
+            if not throttled or attempt >= self.get_option('retries'):
+                break
+            delay = min(self.get_option('retry_max_backoff'), self.get_option('retry_backoff') * 2 ** attempt)
+            time.sleep(max(random.uniform(0, delay), retry_after))
+            attempt += 1
+            if self._stats:
+                self._stats.record_retry(method, path)
+        if error:
+            raise error
         return handle_response(response_content)
 
+    def exchange(self, data, path, method, headers):
+        """
+        Sends a single request to the device, or replays it from the cassette.
+        :return: The response and its content.
+        """
+        started = time.time()
+        body = json.dumps(data)
+        try:
+            if self._cassette and self._cassette.mode == 'replay':
+                response, response_content = self._cassette.play(method, path)
+            else:
+                response, response_content = self.connection.send(self.path + path, body, method=method,
+                                                                  headers=headers)
+                if self._cassette:
+                    self._cassette.record(method, path, data, response.getcode(),
+                                          response_content.getvalue().decode('utf-8'), time.time() - started)
+        except Exception:
+            if self._stats:
+                self._stats.record(method, path, time.time() - started, len(body), 0, True)
+            raise
+        if self._stats:
+            self._stats.record(method, path, time.time() - started, len(body), len(response_content.getvalue()),
+                               response.getcode() >= 400)
+        return response, response_content
+
+    def send_requests(self, commands, max_in_flight=None, refresh=False):
+        """
+        Sends independent commands to the device concurrently, within the adaptive concurrency limit.
+        :param commands: A list of commands, as produced by the command builder.
+        :param max_in_flight: The maximum number of commands in flight, below the adaptive concurrency limit.
+        :param refresh: Whether GET commands bypass the request cache, for example to poll a status.
+        :return: A list with a result for each command, in order. A result holds either the response or the
+         error text and code returned by the device.
+        """
+        def send(command):
+            try:
+                if refresh and command['method'] == 'GET':
+                    return {'response': self._send_request(command['data'], command['path'], command['method'])}
+                return {'response': self.send_request(command['data'], command['path'], command['method'])}
+            except ConnectionError as exc:
+                return {'error': str(exc), 'code': getattr(exc, 'code', None)}
+            except ValueError:
+                # The device sends an empty body for some successful writes
+                return {'response': None}
+
+        if not commands:
+            return []
+        max_workers = min(len(commands), int(self._limiter.max_limit) if self._limiter else 1)
+        if max_in_flight:
+            max_workers = min(max_workers, max_in_flight)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            return list(executor.map(send, commands))
+        finally:
+            executor.shutdown()
+
+    def upload(self, path, src, field='file', fields=None):
+        """
+        Uploads a file from the controller to the device as a multipart/form-data POST, streamed from disk. The
+        upload is not retried: a failed upload has to be restarted by the caller.
+        :param path: The path the file is posted to.
+        :param src: The path of the file on the controller.
+        :param field: The name of the form field holding the file.
+        :param fields: The other form fields.
+        :return: The response of the device.
+        """
+        self.check_circuit()
+        body = MultipartBody(src, field, fields)
+        headers = {'Content-Type': body.content_type, 'Content-Length': str(body.length)}
+        if self._memo:
+            self._memo.invalidate(path)
+        response, response_content = self.connection.send(self.path + path, body, method='POST', headers=headers)
+        return handle_response(response_content)
+
+    def download(self, path, dest_dir, compress=False, algorithm='sha256'):
+        """
+        Streams the response of a GET to a new file on the controller, a block at a time, so that large payloads such
+        as configuration exports are never held in memory.
+        :param path: The path requested.
+        :param dest_dir: The directory the file is created in, the default temporary directory when None.
+        :param compress: Whether the file is written gzip compressed.
+        :param algorithm: The hashlib algorithm the checksum of the payload is computed with.
+        :return: A dictionary with the path of the new file, the size of the payload and its checksum, both computed
+         before compression.
+        """
+        self.check_circuit()
+        self.connection._connect()
+        url_kwargs = {'timeout': self.connection.get_option('persistent_command_timeout'),
+                      'validate_certs': self.connection.get_option('validate_certs')}
+        try:
+            try:
+                response = open_url(self.connection._url + self.path + path, headers=dict(self.connection._auth or {}),
+                                    **url_kwargs)
+            except HTTPError as exc:
+                if exc.code != 401:
+                    raise
+                # The session expired, open a new one
+                self.connection._auth = None
+                self.login(self.connection.get_option('remote_user'), self.connection.get_option('password'))
+                response = open_url(self.connection._url + self.path + path, headers=dict(self.connection._auth),
+                                    **url_kwargs)
+        except HTTPError as exc:
+            raise ConnectionError('%s: %s' % (exc, exc.read()), code=exc.code)
+
+        digest = hashlib.new(algorithm)
+        size = 0
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix='.', suffix='.part')
+        try:
+            with os.fdopen(file_descriptor, 'wb') as raw_file:
+                out_file = gzip.GzipFile(fileobj=raw_file, mode='wb', mtime=0) if compress else raw_file
+                for block in iter(lambda: response.read(DOWNLOAD_BLOCK_SIZE), b''):
+                    digest.update(block)
+                    size += len(block)
+                    out_file.write(block)
+                if compress:
+                    out_file.close()
+        except Exception:
+            os.remove(tmp_path)
+            raise
+        if self._breaker:
+            self._breaker.record_success()
+        return {'path': tmp_path, 'size': size, 'checksum': digest.hexdigest()}
+
+    def get_page_size(self):
+        """
+        Gets the page_size option, which the modules cannot read with get_option as it is an option of this plugin,
+        not of the connection.
+        :return: The number of instances requested at a time from the list endpoints, 0 when lists are not paged.
+        """
+        return self.get_option('page_size')
+
+    def get_stats(self):
+        """
+        Gets the statistics of the requests sent since the options were last set, at the start of the task, or since
+        the statistics were last read.
+        :return: The statistics, per endpoint and in total, or None when collect_stats is not set.
+        """
+        if not self._stats:
+            return None
+        summary = self._stats.summary()
+        self._stats = RequestStats()
+        return summary
+
+    def probe(self, timeout, login=True):
+        """
+        Probes the device with a single short request, without the retries, rate limits and circuit breaker applied
+        to the other requests, for example while waiting for the device to restart.
+        :param timeout: The timeout in seconds of each request of the probe.
+        :param login: Whether the probe opens a new session and reads system/version with it. Otherwise, any HTTP
+         response shows the device is reachable.
+        :return: True if the device is reachable, or ready when login is set. A new session the device is ready
+         with replaces the session of the connection, which may not have survived a restart, and the replaced
+         session is logged out.
+        """
+        url = self.connection._url + self.path
+        validate_certs = self.connection.get_option('validate_certs')
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        auth = None
+        try:
+            if not login:
+                open_url(url + 'system/version', headers=headers, timeout=timeout, validate_certs=validate_certs)
+                return True
+            data = json.dumps({'username': self.connection.get_option('remote_user'),
+                               'password': self.connection.get_option('password')})
+            response = open_url(url + LOGIN_PATH, data=data, method='POST', headers=headers, timeout=timeout,
+                                validate_certs=validate_certs)
+            auth = {'Authorization': 'Token ' + json.loads(response.read())['session']}
+            response = open_url(url + 'system/version', headers=dict(headers, **auth), timeout=timeout,
+                                validate_certs=validate_certs)
+            json.loads(response.read())['system_version']
+        except HTTPError:
+            self._close_session(auth, timeout)
+            return not login
+        except Exception:
+            self._close_session(auth, timeout)
+            return False
+        self._close_session(self.connection._auth, timeout)
+        self.connection._auth = auth
+        if self._memo:
+            self._memo = RequestMemo()
+        if self._breaker:
+            self._breaker.record_success()
+        return True
+
+    def _close_session(self, auth, timeout):
+        """
+        Logs out a session with a single request, ignoring any error, as the session may not have survived a restart
+        of the device.
+        :param auth: The authorization header of the session, None when there is no session to close.
+        :param timeout: The timeout in seconds of the request.
+        """
+        if not auth:
+            return
+        headers = dict({'Content-Type': 'application/json', 'Accept': 'application/json'}, **auth)
+        try:
+            open_url(self.connection._url + self.path + LOGOUT_PATH, method='DELETE', headers=headers, timeout=timeout,
+                     validate_certs=self.connection.get_option('validate_certs'))
+        except Exception:
+            pass
+
     def logout(self):
-        logout_path = 'sessions/self'
-        self.send_request(None, logout_path, method='DELETE')
+        self.send_request(None, LOGOUT_PATH, method='DELETE')
         self.connection._auth = None
 
     def get_device_info(self):
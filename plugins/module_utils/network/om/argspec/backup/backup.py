@@ -0,0 +1,27 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The arg spec for the om_backup module
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class BackupArgs(object):  # pylint: disable=R0903
+    """The arg spec for the om_backup module
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    argument_spec = {'compress': {'default': True, 'type': 'bool'},
+                     'dedup': {'default': True, 'type': 'bool'},
+                     'dest': {'required': True, 'type': 'path'},
+                     'keep': {'default': 0, 'type': 'int'},
+                     'prefix': {'type': 'str'}}  # pylint: disable=C0301
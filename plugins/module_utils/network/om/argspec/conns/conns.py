@@ -57,11 +57,20 @@ class ConnsArgs(object):  # pylint: disable=R0903
                                             'name': {'type': 'str'},
                                             'physif': {'type': 'str'}},
                                 'type': 'list'},
+                     'health_check_timeout': {'default': 120, 'type': 'int'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
+                     'settle_time': {'default': 0, 'type': 'int'},
                      'state': {'choices': ['merged',
                                            'replaced',
                                            'overridden',
                                            'deleted',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
                                'type': 'str'}}  # pylint: disable=C0301
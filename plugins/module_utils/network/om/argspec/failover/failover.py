@@ -42,10 +42,17 @@ class FailoverArgs(object):  # pylint: disable=R0903
                                             'probe_address': {'type': 'str'},
                                             'probe_physif': {'type': 'str'}},
                                 'type': 'dict'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
                      'state': {'choices': ['merged',
                                            'replaced',
                                            'overridden',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
                                'type': 'str'}}  # pylint: disable=C0301
@@ -0,0 +1,30 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The arg spec for the om_firmware module
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class FirmwareArgs(object):  # pylint: disable=R0903
+    """The arg spec for the om_firmware module
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    argument_spec = {'checksum': {'type': 'str'},
+                     'firmware_options': {'type': 'str'},
+                     'firmware_url': {'type': 'str'},
+                     'src': {'type': 'path'},
+                     'timeout': {'default': 1800, 'type': 'int'},
+                     'upload_retries': {'default': 3, 'type': 'int'},
+                     'version': {'type': 'str'},
+                     'wait': {'default': True, 'type': 'bool'}}  # pylint: disable=C0301
@@ -47,11 +47,19 @@ class GroupsArgs(object):  # pylint: disable=R0903
                                             'ports': {'elements': 'str', 'type': 'list'},
                                             'role': {'type': 'str'}},
                                 'type': 'list'},
+                     'port_format': {'choices': ['expanded', 'compact'], 'default': 'expanded', 'type': 'str'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
                      'state': {'choices': ['merged',
                                            'replaced',
                                            'overridden',
                                            'deleted',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
                                'type': 'str'}}  # pylint: disable=C0301
@@ -69,11 +69,18 @@ class PduArgs(object):  # pylint: disable=R0903
                                                                  'version': {'type': 'str'}},
                                                      'type': 'dict'}},
                                 'type': 'list'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
                      'state': {'choices': ['merged',
                                            'replaced',
                                            'overridden',
                                            'deleted',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
                                'type': 'str'}}  # pylint: disable=C0301
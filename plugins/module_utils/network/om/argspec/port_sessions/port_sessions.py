@@ -0,0 +1,29 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The arg spec for the om_port_sessions module
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class PortSessionsArgs(object):  # pylint: disable=R0903
+    """The arg spec for the om_port_sessions module
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    argument_spec = {'client_pids': {'elements': 'int', 'type': 'list'},
+                     'max_in_flight': {'default': 8, 'type': 'int'},
+                     'ports': {'elements': 'str', 'type': 'list'},
+                     'state': {'choices': ['gathered', 'terminated'],
+                               'default': 'gathered',
+                               'type': 'str'},
+                     'usernames': {'elements': 'str', 'type': 'list'}}  # pylint: disable=C0301
@@ -48,13 +48,19 @@ class PortsArgs(object):  # pylint: disable=R0903
                                                                               'minute': {'type': 'int'},
                                                                               'period': {'type': 'str'}},
                                                                               'type': 'dict'},
-                                                                          'start': {'type': 'bool'}},
+                                                                          'start': {'type': 'bool'},
+                                                                          'wait': {'type': 'bool'},
+                                                                          'wait_timeout': {'type': 'int'}},
                                                               'type': 'dict'},
                                             'ports': {'elements': 'dict',
                                                       'options': {'baudrate': {'type': 'str'},
                                                                   'available_baudrates': {'type': 'str'},
                                                                   'databits': {'type': 'str'},
                                                                   'escape_char': {'type': 'str'},
+                                                                  'filter': {'options': {'label': {'type': 'str'},
+                                                                                         'mode': {'type': 'str'},
+                                                                                         'pinout': {'type': 'str'}},
+                                                                             'type': 'dict'},
                                                                   'id': {'type': 'str'},
                                                                   'ip_alias': {'elements': 'dict',
                                                                                'options': {'interface': {'type': 'str'},
@@ -81,11 +87,18 @@ class PortsArgs(object):  # pylint: disable=R0903
                                                                   'raw_tcp': {'type': 'bool'}},
                                                       'type': 'list'}},
                                 'type': 'dict'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
                      'state': {'choices': ['merged',
                                            'replaced',
                                            'overridden',
                                            'deleted',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
                                'type': 'str'}}  # pylint: disable=C0301
\ No newline at end of file
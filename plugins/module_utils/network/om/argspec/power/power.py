@@ -0,0 +1,34 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The arg spec for the om_power module
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class PowerArgs(object):  # pylint: disable=R0903
+    """The arg spec for the om_power module
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    argument_spec = {'action': {'choices': ['on', 'off', 'cycle'],
+                                'required': True,
+                                'type': 'str'},
+                     'max_in_flight': {'default': 8, 'type': 'int'},
+                     'outlets': {'elements': 'dict',
+                                 'options': {'outlets': {'elements': 'str', 'type': 'list'},
+                                             'pdu': {'required': True, 'type': 'str'}},
+                                 'type': 'list'},
+                     'ports': {'elements': 'str', 'type': 'list'},
+                     'stagger': {'default': 0, 'type': 'float'},
+                     'timeout': {'default': 60, 'type': 'int'},
+                     'wait': {'default': True, 'type': 'bool'}}  # pylint: disable=C0301
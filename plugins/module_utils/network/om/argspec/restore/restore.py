@@ -0,0 +1,24 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""
+The arg spec for the om_restore module
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+class RestoreArgs(object):  # pylint: disable=R0903
+    """The arg spec for the om_restore module
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    argument_spec = {'src': {'required': True, 'type': 'path'},
+                     'verify': {'default': True, 'type': 'bool'}}  # pylint: disable=C0301
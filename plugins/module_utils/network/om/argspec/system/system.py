@@ -60,6 +60,7 @@ class SystemArgs(object):  # pylint: disable=R0903
                                             'system_authorized_keys': {'elements': 'dict',
                                                                        'options': {'id': {'type': 'str'},
                                                                                    'key': {'type': 'str'},
+                                                                                   'key_fingerprint': {'type': 'str'},
                                                                                    'username': {'type': 'str'},
                                                                                    'multi_field_identifier': {'type': 'str'}},
                                                                        'type': 'list'},
@@ -67,10 +68,19 @@ class SystemArgs(object):  # pylint: disable=R0903
                                             'timezone': {'type': 'str'},
                                             'webui_session_timeout': {'type': 'int'}},
                                 'type': 'dict'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'reboot_timeout': {'default': 600, 'type': 'int'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
                      'state': {'choices': ['merged',
                                            'overridden',
                                            'deleted',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
-                               'type': 'str'}}  # pylint: disable=C0301
+                               'type': 'str'},
+                     'wait_for_reboot': {'default': False, 'type': 'bool'}}  # pylint: disable=C0301
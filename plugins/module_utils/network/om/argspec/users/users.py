@@ -49,11 +49,19 @@ class UsersArgs(object):  # pylint: disable=R0903
                                             'ssh_password_enabled': {'type': 'bool'},
                                             'username': {'type': 'str'}},
                                 'type': 'list'},
+                     'hash_passwords': {'default': False, 'type': 'bool'},
+                     'plan_file': {'type': 'path'},
+                     'plan_mode': {'choices': ['plan', 'apply'], 'type': 'str'},
+                     'result_format': {'choices': ['full', 'diff', 'summary'],
+                                       'default': 'full',
+                                       'type': 'str'},
+                     'running_config': {'type': 'str'},
                      'state': {'choices': ['merged',
                                            'replaced',
                                            'overridden',
                                            'deleted',
                                            'gathered',
-                                           'rendered'],
+                                           'rendered',
+                                           'parsed'],
                                'default': 'merged',
                                'type': 'str'}}  # pylint: disable=C0301
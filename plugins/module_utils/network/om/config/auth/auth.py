@@ -15,100 +15,22 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 
 
-class Auth(ConfigBase):
+class Auth(ResourceConfigBase):
     """
     The om_auth class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
-
-    gather_network_resources = [
-        'auth',
-    ]
-
-    def __init__(self, module):
-        super(Auth, self).__init__(module)
-
-    def get_auth_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        auth_facts = facts['ansible_network_resources'].get('auth')
-        if not auth_facts:
-            return []
-        return auth_facts
-
-    def execute_module(self):
-        """ Execute the module
-
-        :rtype: A dictionary
-        :returns: The result from module execution
-        """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_auth_facts = self.get_auth_facts()
-        else:
-            existing_auth_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_auth_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_auth_facts = self.get_auth_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_auth_facts
-            if result['changed']:
-                result['after'] = changed_auth_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_auth_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_auth_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
+    resource = 'auth'
 
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
-        """
-        want = self._module.params['config']
-        have = existing_auth_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+    empty_facts = {}
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -122,7 +44,7 @@ class Auth(ConfigBase):
         state = self._module.params['state']
         if state == 'overridden':
             commands = self._state_overridden(want, have)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, have)
         elif state == 'replaced':
             commands = self._state_replaced(want, have)
@@ -162,7 +84,7 @@ class Auth(ConfigBase):
         commands = []
         want = remove_empties(want)
         have = remove_empties(have)
-        if dict_diff(want, have):
-            to_set = dict_merge(want, have)
+        if dict_diff(have, want):
+            to_set = dict_merge(have, want)
             commands.append({'data': {'auth': to_set}, 'path': 'auth', 'method': 'PUT'})
         return commands
@@ -0,0 +1,113 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_backup class
+It is in this file where the configuration export of the device is
+streamed to a file on the controller, compared to the previous backup
+and kept only when it changed
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import re
+import time
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.network import (
+    get_resource_connection,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    add_request_stats,
+    get_file_checksum,
+)
+
+EXPORT = 'export'
+BACKUP_SUFFIX = re.compile(r'-\d{8}T\d{6}\.json(\.gz)?$')
+
+
+class Backup(object):
+    """
+    The om_backup class
+    """
+
+    def __init__(self, module):
+        self._module = module
+        self._connection = get_resource_connection(module)
+
+    def get_prefix(self):
+        """ Get the prefix of the backup file names, the device host by default
+
+        :rtype: A string
+        :returns: The prefix
+        """
+        return self._module.params['prefix'] or self._connection.get_option('host')
+
+    def get_backups(self, prefix):
+        """ Get the backups of the device in the dest directory
+
+        :rtype: A list
+        :returns: The paths of the backups, oldest first
+        """
+        dest = self._module.params['dest']
+        names = [name for name in os.listdir(dest)
+                 if name.startswith(prefix) and BACKUP_SUFFIX.match(name[len(prefix):])]
+        return [os.path.join(dest, name) for name in sorted(names)]
+
+    def remove_old_backups(self, prefix):
+        """ Remove the backups of the device beyond the keep newest ones
+
+        :rtype: A list
+        :returns: The paths of the removed backups
+        """
+        keep = self._module.params['keep']
+        removed = self.get_backups(prefix)[:-keep] if keep > 0 else []
+        for path in removed:
+            os.remove(path)
+        return removed
+
+    def execute_module(self):
+        """ Execute the module
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        params = self._module.params
+        result = {'changed': False}
+        warnings = list()
+
+        if not os.path.isdir(params['dest']):
+            if os.path.exists(params['dest']):
+                self._module.fail_json(msg='%s is not a directory' % params['dest'])
+            if self._module.check_mode:
+                result.update({'changed': True, 'warnings': warnings})
+                return result
+            os.makedirs(params['dest'])
+
+        prefix = self.get_prefix()
+        export = self._connection.download(EXPORT, params['dest'], params['compress'])
+        result.update({'checksum': 'sha256:' + export['checksum'], 'size': export['size']})
+        previous = self.get_backups(prefix)[-1:]
+        if params['dedup'] and previous and export['checksum'] == get_file_checksum(
+                previous[0], decompress=previous[0].endswith('.gz')):
+            os.remove(export['path'])
+            result['backup_file'] = previous[0]
+        elif self._module.check_mode:
+            # The export is only downloaded to tell whether it would be kept as a new backup
+            os.remove(export['path'])
+            result['changed'] = True
+        else:
+            result['backup_file'] = os.path.join(params['dest'], '%s-%s.json%s' % (
+                prefix, time.strftime('%Y%m%dT%H%M%S', time.gmtime()), '.gz' if params['compress'] else ''))
+            os.rename(export['path'], result['backup_file'])
+            result['changed'] = True
+        if not self._module.check_mode:
+            result['removed_backups'] = self.remove_old_backups(prefix)
+
+        result['warnings'] = warnings
+        add_request_stats(self._connection, result)
+        return result
@@ -0,0 +1,294 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om resource config base class
+It is in this file where the module execution pipeline shared by
+all the om resource config classes is implemented: the current
+configuration is gathered, the commands are planned, dispatched to
+the device, and the resulting configuration is verified.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import time
+
+from copy import deepcopy
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
+    ConfigBase,
+)
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
+    remove_empties,
+    to_list,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
+
+from ansible.module_utils.connection import ConnectionError
+
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    StageProfiler,
+    add_request_stats,
+    find_secrets,
+    get_facts_changes,
+    get_fingerprint,
+    read_plan,
+    write_plan,
+)
+
+# The directory profile files are written to, profiling being disabled when unset
+PROFILE_DIR_ENV = 'ANSIBLE_OM_PROFILE_DIR'
+
+
+class ResourceConfigBase(ConfigBase):
+    """
+    The om resource config base class
+
+    Subclasses set the resource name and implement set_state. The gather, plan, dispatch and verify stages
+    may be overridden to change how a resource is read from and written to the device.
+
+    When the ANSIBLE_OM_PROFILE_DIR environment variable is set, each stage is profiled with cProfile and
+    tracemalloc, and the stats are written to that directory.
+    """
+
+    gather_subset = [
+        '!all',
+        '!min',
+    ]
+
+    resource = None
+
+    # The facts of a resource with no configuration
+    empty_facts = []
+
+    # Whether the commands can be planned against running_config, without connecting to the device
+    offline_plan = True
+
+    # The keys of the commands whose values are not written to plan files
+    secret_keys = ()
+
+    def __init__(self, module):
+        self.offline = module.params.get('plan_mode') == 'plan' and bool(module.params.get('running_config'))
+        if self.offline:
+            if not self.offline_plan:
+                module.fail_json(msg='running_config cannot be used to plan %s, the device is needed to plan the '
+                                     'changes' % self.resource)
+            # The config and facts classes share the connection netcommon keeps on the module
+            module._connection = None
+        super(ResourceConfigBase, self).__init__(module)
+        self.existing_facts = None
+        self.profiler = StageProfiler(os.environ.get(PROFILE_DIR_ENV), self.get_profile_prefix)
+
+    def get_profile_prefix(self):
+        """ Get the prefix of the names of the profile files of this run, from the device host, resource and state
+
+        :rtype: A string
+        :returns: The prefix
+        """
+        host = self._connection.get_option('host') if self._connection else 'local'
+        return '%s-%s-%s-%s-%d' % (host, self.resource, self.state, time.strftime('%Y%m%dT%H%M%S'), os.getpid())
+
+    @property
+    def gather_network_resources(self):
+        return [self.resource]
+
+    def gather(self, data=None):
+        """ Get the 'facts' (the current configuration)
+
+        :param data: previously collected configuration, or None to read it from the device
+        :rtype: A dictionary or list
+        :returns: The current configuration
+        """
+        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources, data)
+        resource_facts = facts['ansible_network_resources'].get(self.resource)
+        if not resource_facts:
+            return deepcopy(self.empty_facts)
+        return resource_facts
+
+    def parse(self, running_config):
+        """ Get the 'facts' from a saved configuration, without connecting to the device
+
+        :param running_config: the configuration as JSON, in the form read from the device by the facts
+        :rtype: A dictionary or list
+        :returns: The parsed configuration
+        """
+        try:
+            data = json.loads(running_config)
+        except ValueError as exc:
+            self._module.fail_json(msg='running_config is not valid JSON: %s' % exc)
+        if not data:
+            # The facts read the device when given no data
+            return deepcopy(self.empty_facts)
+        return self.gather(data)
+
+    def plan(self, have):
+        """ Generate the commands bringing the current configuration to the desired configuration
+
+        :param have: the current configuration
+        :rtype: A list
+        :returns: the commands
+        """
+        return self.set_config(have)
+
+    def dispatch(self, commands):
+        """ Send the commands to the device, in order
+
+        :param commands: the commands to send
+        """
+        for command in commands:
+            try:
+                self._connection.send_request(command['data'], command['path'], command['method'])
+            except ConnectionError as exc:
+                if not exc.args[0].startswith('Expecting value:'):
+                    raise exc
+
+    def verify(self):
+        """ Get the configuration after the commands were dispatched
+
+        :rtype: A dictionary or list
+        :returns: The resulting configuration
+        """
+        return self.gather()
+
+    def format_facts(self, facts):
+        """ Format the facts returned in the module result
+
+        :param facts: the facts, as gathered
+        :rtype: A dictionary or list
+        :returns: The facts to return
+        """
+        return facts
+
+    def execute_module(self):
+        """ Execute the module
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        result = {'changed': False}
+        warnings = list()
+        commands = list()
+
+        plan_mode = self._module.params['plan_mode']
+        plan_file = self._module.params['plan_file']
+
+        if self.state in self.ACTION_STATES:
+            with self.profiler.stage('gather'):
+                if self.offline:
+                    existing_facts = self.parse(self._module.params['running_config'])
+                else:
+                    existing_facts = self.gather()
+            fingerprint = get_fingerprint(existing_facts)
+        else:
+            existing_facts = deepcopy(self.empty_facts)
+        self.existing_facts = existing_facts
+        if self.state in self.ACTION_STATES or self.state == 'rendered':
+            with self.profiler.stage('plan'):
+                if self.state in self.ACTION_STATES and plan_mode == 'apply':
+                    try:
+                        commands.extend(read_plan(plan_file, self.resource, self.state, fingerprint))
+                    except (IOError, ValueError) as exc:
+                        self._module.fail_json(msg=str(exc))
+                else:
+                    commands.extend(self.plan(deepcopy(existing_facts)))
+        if self.state in self.ACTION_STATES and plan_mode == 'plan':
+            secrets = find_secrets(commands, self.secret_keys)
+            if secrets:
+                self._module.fail_json(msg='the %s commands hold a clear text %s, which is not written to plan files'
+                                       % (self.resource, ', '.join(secrets)))
+            write_plan(plan_file, self.resource, self.state, fingerprint, commands)
+            result['plan_file'] = plan_file
+        if commands and self.state in self.ACTION_STATES:
+            if not self._module.check_mode and plan_mode != 'plan':
+                with self.profiler.stage('dispatch'):
+                    self.dispatch(commands)
+            result['changed'] = True
+
+        if self.state in self.ACTION_STATES:
+            result['commands'] = commands
+            after = None
+            # Nothing was sent in check mode or for a plan, so the configuration is not read back
+            if result['changed'] and not self._module.check_mode and plan_mode != 'plan':
+                with self.profiler.stage('verify'):
+                    after = self.verify()
+            with self.profiler.stage('format'):
+                result['before'] = self.format_facts(existing_facts)
+                if after is not None:
+                    result['after'] = self.format_facts(after)
+                self.format_result(result)
+        elif self.state == 'gathered':
+            with self.profiler.stage('gather'):
+                facts = self.gather()
+            with self.profiler.stage('format'):
+                result['gathered'] = self.format_facts(facts)
+        elif self.state == 'rendered':
+            result['rendered'] = commands
+        elif self.state == 'parsed':
+            with self.profiler.stage('gather'):
+                facts = self.parse(self._module.params['running_config'])
+            with self.profiler.stage('format'):
+                result['parsed'] = self.format_facts(facts)
+        if self.profiler.stages:
+            result['profile'] = self.profiler.stages
+
+        result['warnings'] = warnings
+        add_request_stats(self._connection, result)
+        return result
+
+    def format_result(self, result):
+        """ Replace the configuration before and after the module ran with the changes between them, or with the
+            number of objects changed, as requested by the result_format option
+
+        :param result: the result of an action state, updated in place
+        """
+        result_format = self._module.params.get('result_format') or 'full'
+        if result_format == 'full':
+            return
+        before = result.pop('before')
+        if result['changed'] and 'after' not in result:
+            # The configuration was not read back, in check mode or for a plan, so only the commands are counted
+            result['counts'] = {'commands': len(result['commands'])}
+        else:
+            changes, counts = get_facts_changes(before, result.pop('after', before))
+            counts['commands'] = len(result['commands'])
+            result['counts'] = counts
+            if result_format == 'diff':
+                result['changes'] = changes
+        if result_format == 'summary':
+            del result['commands']
+
+    def set_config(self, have):
+        """ Collect the configuration from the args passed to the module,
+            collect the current configuration (as a dict from facts)
+
+        :rtype: A list
+        :returns: the commands necessary to migrate the current configuration
+                  to the desired configuration
+        """
+        want = self._module.params['config']
+        if self.state == 'rendered':
+            # There is no device configuration to compare the options left unset with, they would be rendered as
+            # null values
+            if isinstance(want, list):
+                want = [remove_empties(item) for item in want]
+            elif want:
+                want = remove_empties(want)
+        resp = self.set_state(want, have)
+        return to_list(resp)
+
+    def set_state(self, want, have):
+        """ Select the appropriate function based on the state provided
+
+        :param want: the desired configuration
+        :param have: the current configuration
+        :rtype: A list
+        :returns: the commands necessary to migrate the current configuration
+                  to the desired configuration
+        """
+        raise NotImplementedError
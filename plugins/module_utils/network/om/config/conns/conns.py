@@ -15,109 +15,62 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
-from ansible.module_utils.connection import ConnectionError
-
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from copy import deepcopy
 
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    batch_network_commands,
     command_builder,
     find_instance_id,
+    get_management_conns,
+    send_command_batches,
 )
 
 
-class Conns(ConfigBase):
+class Conns(ResourceConfigBase):
     """
     The om_conns class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
+    resource = 'conns'
 
-    gather_network_resources = [
-        'conns',
-    ]
+    # The management connection, changed last, is found from the host the device is connected to
+    offline_plan = False
 
-    def __init__(self, module):
-        super(Conns, self).__init__(module)
+    def get_management_paths(self):
+        """ Get the paths of the network connections carrying the management connection
 
-    def get_conns_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
+        :rtype: A list
+        :returns: The paths of the management network connections
         """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        conns_facts = facts['ansible_network_resources'].get('conns')
-        if not conns_facts:
-            return []
-        return conns_facts
+        conns = get_management_conns(self.existing_facts, self._connection.get_option('host'))
+        return ['conns/' + conn['id'] for conn in conns]
 
-    def execute_module(self):
-        """ Execute the module
+    def plan(self, have):
+        """ Generate the commands, ordered in the batches they are applied in
 
-        :rtype: A dictionary
-        :returns: The result from module execution
+        :param have: the current configuration
+        :rtype: A list
+        :returns: the commands
         """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_conns_facts = self.get_conns_facts()
-        else:
-            existing_conns_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_conns_facts))
+        commands = self.set_config(have)
         if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_conns_facts = self.get_conns_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_conns_facts
-            if result['changed']:
-                result['after'] = changed_conns_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_conns_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_conns_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
+            batches = batch_network_commands(commands, self.get_management_paths())
+        else:
+            batches = batch_network_commands(commands)
+        return [command for batch in batches for command in batch]
 
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
+    def dispatch(self, commands):
+        """ Send the commands to the device in batches, waiting for the device to settle after each batch
         """
-        want = self._module.params['config']
-        have = existing_conns_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+        batches = batch_network_commands(commands, self.get_management_paths())
+        send_command_batches(self._connection, batches, self._module.params['settle_time'],
+                             self._module.params['health_check_timeout'])
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -139,7 +92,7 @@ class Conns(ConfigBase):
             commands = self._state_overridden(want, name_id_map, id_conn_map)
         elif state == 'deleted':
             commands = self._state_deleted(want, name_id_map)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, name_id_map, id_conn_map)
         elif state == 'replaced':
             commands = self._state_replaced(want, name_id_map, id_conn_map)
@@ -0,0 +1,209 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_firmware class
+It is in this file where the firmware image is checked, uploaded to
+or fetched by the device, and the upgrade is followed until the device
+is ready again with the new firmware
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import os
+import time
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.network import (
+    get_resource_connection,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    add_request_stats,
+    get_file_checksum,
+    wait_until_ready,
+)
+
+FIRMWARE_UPGRADE = 'system/firmware_upgrade'
+FIRMWARE_UPGRADE_STATUS = 'system/firmware_upgrade_status'
+PROBE_TIMEOUT = 5
+POLL_INTERVAL = 2
+MAX_POLL_INTERVAL = 15
+UPLOAD_BACKOFF = 5
+# The states of system/firmware_upgrade_status. Any other state is unknown, and is neither taken for a finished
+# upgrade nor for a running one
+UPGRADE_IDLE = 'idle'
+UPGRADE_ERROR = 'error'
+UPGRADE_RUNNING = ('running', 'in_progress', 'started', 'installing', 'upgrading')
+
+
+class Firmware(object):
+    """
+    The om_firmware class
+    """
+
+    def __init__(self, module):
+        self._module = module
+        self._connection = get_resource_connection(module)
+
+    def get_version(self):
+        """ Get the firmware version running on the device
+
+        :rtype: A string
+        :returns: The firmware version
+        """
+        return self._connection.get(None, 'system/version')['system_version']['firmware_version']
+
+    def verify_checksum(self):
+        """ Check the image against the expected checksum, given as C(digest) or C(algorithm:digest)
+
+        :rtype: A string
+        :returns: The checksum of the image, as C(algorithm:digest)
+        """
+        params = self._module.params
+        if not os.path.isfile(params['src']):
+            self._module.fail_json(msg='the firmware image %s does not exist' % params['src'])
+        algorithm, dummy, expected = (params['checksum'] or '').rpartition(':')
+        algorithm = (algorithm or 'sha256').lower()
+        if algorithm not in hashlib.algorithms_available:
+            self._module.fail_json(msg='unsupported checksum algorithm %s' % algorithm)
+        checksum = get_file_checksum(params['src'], algorithm)
+        if expected and checksum != expected.lower():
+            self._module.fail_json(msg='the checksum of %s is %s, expected %s' % (params['src'], checksum, expected))
+        return '%s:%s' % (algorithm, checksum)
+
+    def start_upgrade(self):
+        """ Start the upgrade, either by having the device fetch the image from firmware_url, or by uploading the
+            image from the controller. A failed upload is restarted up to upload_retries times, unless the device
+            reports that the upgrade is already running.
+
+        :rtype: An int
+        :returns: The number of upload attempts
+        """
+        params = self._module.params
+        fields = {'firmware_options': params['firmware_options'] or ''}
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if params['firmware_url']:
+                    fields['firmware_url'] = params['firmware_url']
+                    self._connection.send_request({'system_firmware_upgrade': fields}, FIRMWARE_UPGRADE, 'POST')
+                else:
+                    self._connection.upload(FIRMWARE_UPGRADE, params['src'], 'file', fields)
+                return attempt
+            except ConnectionError as exc:
+                # The device sends an empty body when it accepts the image
+                if exc.args[0].startswith('Expecting value:'):
+                    return attempt
+                if params['firmware_url']:
+                    self._module.fail_json(msg='the firmware upgrade could not be started: %s' % exc,
+                                           upload_attempts=attempt)
+                time.sleep(UPLOAD_BACKOFF * attempt)
+                # The device may have received the whole image before the upload failed, and be installing it
+                state = self.get_upgrade_state()
+                if state in UPGRADE_RUNNING:
+                    return attempt
+                if state not in (None, UPGRADE_IDLE, UPGRADE_ERROR):
+                    self._module.fail_json(msg='the upload failed and the device reports the unknown firmware upgrade '
+                                               'state %s, the image is not uploaded again: %s' % (state, exc),
+                                           upload_attempts=attempt, changed=True)
+                if attempt > params['upload_retries']:
+                    self._module.fail_json(msg='the firmware upgrade could not be started: %s' % exc,
+                                           upload_attempts=attempt)
+
+    def get_upgrade_status(self):
+        """ Read the status of the upgrade, bypassing the request cache
+
+        :rtype: A dictionary
+        :returns: The upgrade status, None if it could not be read
+        """
+        command = {'data': None, 'path': FIRMWARE_UPGRADE_STATUS, 'method': 'GET'}
+        response = self._connection.send_requests([command], refresh=True)[0].get('response')
+        return (response or {}).get('system_firmware_upgrade_status')
+
+    def get_upgrade_state(self):
+        """ Read the state of the upgrade
+
+        :rtype: A string
+        :returns: The state, None if it could not be read
+        """
+        try:
+            status = self.get_upgrade_status() or {}
+        except ConnectionError:
+            return None
+        return status.get('state')
+
+    def wait_for_upgrade(self, started):
+        """ Follow the upgrade until the device goes down to install the image, failing as soon as the device reports
+            an error, then probe it with a new session and an increasing interval until it is ready again. The device
+            is polled while it reports any other state, an unknown one included, until the timeout.
+
+        :rtype: A float
+        :returns: The number of seconds from the start of the upgrade until the device was ready
+        """
+        timeout = self._module.params['timeout']
+        deadline = started + timeout
+        interval = POLL_INTERVAL
+        while self._connection.probe(PROBE_TIMEOUT, False):
+            try:
+                status = self.get_upgrade_status() or {}
+            except ConnectionError:
+                # The device went down while answering
+                break
+            state = status.get('state')
+            if state == UPGRADE_ERROR:
+                self._module.fail_json(msg='the firmware upgrade failed: %s' % status.get('error_message'),
+                                       changed=True)
+            if time.time() >= deadline:
+                msg = 'the device did not restart within %d seconds' % timeout
+                if state not in UPGRADE_RUNNING:
+                    msg += ', the firmware upgrade state is %s' % state
+                self._module.fail_json(msg=msg, changed=True)
+            time.sleep(interval)
+            interval = min(interval * 1.5, MAX_POLL_INTERVAL)
+
+        if not wait_until_ready(self._connection, deadline, PROBE_TIMEOUT, POLL_INTERVAL, MAX_POLL_INTERVAL):
+            self._module.fail_json(msg='the device was not ready within %d seconds of the upgrade' % timeout,
+                                   changed=True)
+        return round(time.time() - started, 1)
+
+    def execute_module(self):
+        """ Execute the module
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        params = self._module.params
+        result = {'changed': False}
+        warnings = list()
+
+        result['firmware_version'] = self.get_version()
+        if params['version'] and result['firmware_version'] == params['version']:
+            result['warnings'] = warnings
+            add_request_stats(self._connection, result)
+            return result
+        if params['src']:
+            result['checksum'] = self.verify_checksum()
+        elif params['checksum']:
+            warnings.append('checksum is only verified for an image uploaded from src')
+
+        result['changed'] = True
+        if not self._module.check_mode:
+            started = time.time()
+            result['upload_attempts'] = self.start_upgrade()
+            if params['wait']:
+                result['time_to_ready'] = self.wait_for_upgrade(started)
+                result['previous_firmware_version'] = result['firmware_version']
+                result['firmware_version'] = self.get_version()
+                if params['version'] and result['firmware_version'] != params['version']:
+                    self._module.fail_json(msg='the device runs firmware %s after the upgrade, expected %s'
+                                           % (result['firmware_version'], params['version']), changed=True)
+
+        result['warnings'] = warnings
+        add_request_stats(self._connection, result)
+        return result
@@ -15,118 +15,79 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 
 from ansible.module_utils.connection import ConnectionError
-
 from copy import deepcopy
 
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
     command_builder,
+    compress_port_intervals,
+    expand_port_intervals,
     find_instance_id,
+    get_port_intervals,
+    merge_port_intervals,
 )
 
 
-class Groups(ConfigBase):
+class Groups(ResourceConfigBase):
     """
     The om_groups class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
-
-    gather_network_resources = [
-        'groups',
-    ]
+    resource = 'groups'
 
     def __init__(self, module):
         super(Groups, self).__init__(module)
         self.current_state = None
 
-    def get_groups_facts(self, data=None):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
+    def dispatch(self, commands):
+        """ Send the commands to the device, in order, tracking the resulting groups from the responses
         """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources, data)
-        groups_facts = facts['ansible_network_resources'].get('groups')
-        if not groups_facts:
-            return []
-        return groups_facts
+        self.current_state = dict((group['id'], deepcopy(group)) for group in self.existing_facts)
+        for command in commands:
+            group_id = None
+            if command['method'] in ['PUT', 'DELETE']:
+                group_id = command['path'].split('/')[-1]
+            try:
+                response = self._connection.send_request(command['data'], command['path'], command['method'])
+                if group_id and command['method'] == 'PUT':
+                    self.current_state[group_id] = response['group']
+                else:
+                    self.current_state[response['group']['id']] = response['group']
+            except ConnectionError as exc:
+                if not exc.args[0].startswith('Expecting value:'):
+                    raise exc
+                self.current_state.pop(group_id, None)
 
-    def execute_module(self):
-        """ Execute the module
+    def verify(self):
+        """ Get the groups after the commands were dispatched, from the responses of the device
 
-        :rtype: A dictionary
-        :returns: The result from module execution
+        :rtype: A list
+        :returns: The resulting configuration
         """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_groups_facts = self.get_groups_facts()
-        else:
-            existing_groups_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_groups_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    group_id = None
-                    if command['method'] in ['PUT', 'DELETE']:
-                        group_id = command['path'].split('/')[-1]
-                    try:
-                        response = self._connection.send_request(command['data'], command['path'], command['method'])
-                        if group_id and command['method'] == 'PUT':
-                            self.current_state[group_id] = response['group']
-                        else:
-                            self.current_state[response['group']['id']] = response['group']
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-                        self.current_state.pop(group_id, None)
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_groups_facts = self.get_groups_facts(self.current_state.values())
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_groups_facts
-            if result['changed']:
-                result['after'] = changed_groups_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_groups_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_groups_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
+        if self.current_state is None:
+            return self.gather(self.existing_facts)
+        return self.gather(self.current_state.values())
+
+    def format_facts(self, groups_facts):
+        """ Write the ports of the groups as port range expressions, if requested
 
         :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
+        :returns: The groups facts, in the requested port format
         """
-        want = self._module.params['config']
-        have = existing_groups_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+        if self._module.params['port_format'] != 'compact':
+            return groups_facts
+        groups_facts = deepcopy(groups_facts)
+        for group in groups_facts:
+            if group.get('ports'):
+                group['ports'] = compress_port_intervals(get_port_intervals(group['ports']))
+        return groups_facts
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -143,14 +104,25 @@ class Groups(ConfigBase):
             groupname_id_map[group['groupname']] = group['id']
             id_group_map[group['id']] = group
 
-        self.current_state = deepcopy(id_group_map)
+        # Ports are compared as sorted intervals, and only expanded into port names in the commands
+        id_group_map = deepcopy(id_group_map)
+        for group in id_group_map.values():
+            if group.get('ports') is not None:
+                group['ports'] = get_port_intervals(group['ports'])
+        want = deepcopy(want or [])
+        for group in want:
+            if group.get('ports') is not None:
+                try:
+                    group['ports'] = get_port_intervals(group['ports'])
+                except ValueError as exc:
+                    self._module.fail_json(msg=str(exc))
 
         state = self._module.params['state']
         if state == 'overridden':
             commands = self._state_overridden(want, groupname_id_map, id_group_map)
         elif state == 'deleted':
             commands = self._state_deleted(want, groupname_id_map)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, groupname_id_map, id_group_map)
         elif state == 'replaced':
             commands = self._state_replaced(want, groupname_id_map, id_group_map)
@@ -172,7 +144,7 @@ class Groups(ConfigBase):
                 data['id'] = group_id
                 if data == remove_empties(id_group_map[group_id]):
                     continue
-            command = command_builder({'group': group}, 'groups/', group_id)
+            command = command_builder({'group': Groups._expand_ports(group)}, 'groups/', group_id)
             if command:
                 commands.append(command)
         return commands
@@ -215,19 +187,31 @@ class Groups(ConfigBase):
             group_id = find_instance_id(groupname_id_map, 'groupname', data)
             if group_id in id_group_map:
                 device_group = id_group_map[group_id]
+                ports = data.pop('ports', None)
                 merged_data = dict_merge(device_group, data)
-                if dict_diff(merged_data, device_group):
+                if ports:
+                    merged_data['ports'] = merge_port_intervals(device_group.get('ports', ()) + ports)
+                if dict_diff(device_group, merged_data):
                     data = merged_data
                 else:
                     continue
                 data.pop('id', None)
             else:
                 group_id = None
-            command = command_builder({'group': data}, 'groups/', group_id)
+            command = command_builder({'group': Groups._expand_ports(data)}, 'groups/', group_id)
             if command:
                 commands.append(command)
         return commands
 
+    @staticmethod
+    def _expand_ports(group):
+        """ Expand the port intervals of a group into the port names expected by the device
+        """
+        if group.get('ports') is not None:
+            group = dict(group)
+            group['ports'] = expand_port_intervals(group['ports'])
+        return group
+
     @staticmethod
     def _state_deleted(want, groupname_id_map):
         """ The command generator when state is deleted
@@ -15,19 +15,12 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
-from ansible.module_utils.connection import ConnectionError
-
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from copy import deepcopy
 
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
@@ -36,88 +29,12 @@ from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils
 )
 
 
-class Pdu(ConfigBase):
+class Pdu(ResourceConfigBase):
     """
     The om_pdu class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
-
-    gather_network_resources = [
-        'pdu',
-    ]
-
-    def __init__(self, module):
-        super(Pdu, self).__init__(module)
-
-    def get_pdu_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        pdu_facts = facts['ansible_network_resources'].get('pdu')
-        if not pdu_facts:
-            return []
-        return pdu_facts
-
-    def execute_module(self):
-        """ Execute the module
-
-        :rtype: A dictionary
-        :returns: The result from module execution
-        """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_pdu_facts = self.get_pdu_facts()
-        else:
-            existing_pdu_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_pdu_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_pdu_facts = self.get_pdu_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_pdu_facts
-            if result['changed']:
-                result['after'] = changed_pdu_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_pdu_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_pdu_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
-
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
-        """
-        want = self._module.params['config']
-        have = existing_pdu_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+    resource = 'pdu'
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -139,7 +56,7 @@ class Pdu(ConfigBase):
             commands = self._state_overridden(want, name_id_map, id_pdu_map)
         elif state == 'deleted':
             commands = self._state_deleted(want, name_id_map)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, name_id_map, id_pdu_map)
         elif state == 'replaced':
             commands = self._state_replaced(want, name_id_map, id_pdu_map)
@@ -15,107 +15,65 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
-)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
-from ansible.module_utils.connection import ConnectionError
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    batch_network_commands,
+    get_management_conns,
+    send_command_batches,
+)
 
 from copy import deepcopy
 
 
-class Physifs(ConfigBase):
+class Physifs(ResourceConfigBase):
     """
     The om_physifs class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
-
-    gather_network_resources = [
-        'physifs',
-    ]
+    resource = 'physifs'
 
-    def __init__(self, module):
-        super(Physifs, self).__init__(module)
+    # The management connection, changed last, is found from the host the device is connected to
+    offline_plan = False
 
-    def get_physifs_facts(self):
-        """ Get the 'facts' (the current configuration)
+    def get_management_paths(self):
+        """ Get the paths of the physical interfaces carrying the management connection
 
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
+        :rtype: A list
+        :returns: The paths of the management physical interfaces
         """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        physifs_facts = facts['ansible_network_resources'].get('physifs')
-        if not physifs_facts:
-            return []
-        return physifs_facts
+        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, ['conns'])
+        conns = get_management_conns(facts['ansible_network_resources'].get('conns') or [],
+                                     self._connection.get_option('host'))
+        physifs = set(conn['physif'] for conn in conns if conn.get('physif'))
+        return ['physifs/' + physif['id'] for physif in self.existing_facts
+                if physif['id'] in physifs or physif.get('name') in physifs]
 
-    def execute_module(self):
-        """ Execute the module
+    def plan(self, have):
+        """ Generate the commands, ordered in the batches they are applied in
 
-        :rtype: A dictionary
-        :returns: The result from module execution
+        :param have: the current configuration
+        :rtype: A list
+        :returns: the commands
         """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_physifs_facts = self.get_physifs_facts()
-        else:
-            existing_physifs_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_physifs_facts))
+        commands = self.set_config(have)
         if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_physifs_facts = self.get_physifs_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_physifs_facts
-            if result['changed']:
-                result['after'] = changed_physifs_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_physifs_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_physifs_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
+            batches = batch_network_commands(commands, self.get_management_paths())
+        else:
+            batches = batch_network_commands(commands)
+        return [command for batch in batches for command in batch]
 
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
+    def dispatch(self, commands):
+        """ Send the commands to the device in batches, waiting for the device to settle after each batch
         """
-        want = self._module.params['config']
-        have = existing_physifs_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+        batches = batch_network_commands(commands, self.get_management_paths())
+        send_command_batches(self._connection, batches, self._module.params['settle_time'],
+                             self._module.params['health_check_timeout'])
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -137,7 +95,7 @@ class Physifs(ConfigBase):
             commands = self._state_overridden(want, physifname_id_map, id_physif_map)
         elif state == 'deleted':
             commands = self._state_deleted(want, physifname_id_map)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, physifname_id_map, id_physif_map)
         elif state == 'replaced':
             commands = self._state_replaced(want, physifname_id_map, id_physif_map)
@@ -0,0 +1,116 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_port_sessions class
+It is in this file where the active sessions of the serial ports are
+listed, and the selected sessions are terminated
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
+    ConfigBase,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    add_request_stats,
+    command_builder,
+    get_instances,
+    select_port_ids,
+)
+
+
+class PortSessions(ConfigBase):
+    """
+    The om_port_sessions class
+    """
+
+    def get_sessions(self):
+        """ Get the active sessions of all the ports, from a single listing of the ports
+
+        :rtype: A list
+        :returns: The sessions, with the id and label of their port
+        """
+        sessions = []
+        for port in get_instances(self._connection, 'ports', 'ports'):
+            for session in port.get('sessions') or []:
+                sessions.append({
+                    'port': port['id'],
+                    'label': port.get('label'),
+                    'username': session.get('username'),
+                    'client_pid': session.get('client_pid'),
+                })
+        return sessions
+
+    def select_sessions(self, sessions):
+        """ Select the sessions matching the ports, usernames and client_pids options
+
+        :rtype: A list
+        :returns: The selected sessions
+        """
+        params = self._module.params
+        if params['ports']:
+            try:
+                port_ids = set(select_port_ids(params['ports'], [session['port'] for session in sessions]))
+            except ValueError as exc:
+                self._module.fail_json(msg=str(exc))
+            sessions = [session for session in sessions if session['port'] in port_ids]
+        if params['usernames']:
+            sessions = [session for session in sessions if session['username'] in params['usernames']]
+        if params['client_pids']:
+            sessions = [session for session in sessions if session['client_pid'] in params['client_pids']]
+        return sessions
+
+    def terminate_sessions(self, sessions):
+        """ Terminate the sessions concurrently, at most max_in_flight at a time. A session without a client_pid
+            cannot be terminated, and is reported as such. In check mode, nothing is sent to the device
+
+        :rtype: A list
+        :returns: The sessions, each with the outcome of its termination
+        """
+        outcomes = [dict(session) for session in sessions]
+        terminated = []
+        for outcome in outcomes:
+            if outcome['client_pid'] is None:
+                outcome['terminated'] = False
+                outcome['msg'] = 'the session has no client_pid to terminate it with'
+            else:
+                terminated.append(outcome)
+        if self._module.check_mode or not terminated:
+            return outcomes
+
+        commands = [command_builder(None, 'ports/' + outcome['port'] + '/sessions/', str(outcome['client_pid']))
+                    for outcome in terminated]
+        responses = self._connection.send_requests(commands, max_in_flight=self._module.params['max_in_flight'])
+        for outcome, response in zip(terminated, responses):
+            outcome['terminated'] = 'error' not in response
+            if 'error' in response:
+                outcome['msg'] = response['error']
+        return outcomes
+
+    def execute_module(self):
+        """ Execute the module
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        result = {'changed': False}
+        warnings = list()
+
+        sessions = self.select_sessions(self.get_sessions())
+        if self.state == 'terminated' and sessions:
+            sessions = self.terminate_sessions(sessions)
+            failed = [session for session in sessions if session.get('terminated') is False]
+            result['changed'] = len(failed) < len(sessions)
+            if failed:
+                self._module.fail_json(msg='%d of %d sessions could not be terminated' % (len(failed), len(sessions)),
+                                       sessions=sessions, changed=result['changed'])
+        result['sessions'] = sessions
+
+        result['warnings'] = warnings
+        add_request_stats(self._connection, result)
+        return result
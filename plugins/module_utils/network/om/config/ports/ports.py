@@ -15,107 +15,118 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     remove_empties,
     dict_merge,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 
 from ansible.module_utils.connection import ConnectionError
 
+import time
+
+from copy import deepcopy
+from fnmatch import fnmatchcase
+
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    PORT_RANGE_RE,
     command_builder,
+    expand_port_intervals,
+    get_instances,
+    get_status,
     is_subset,
+    get_port_intervals,
+    select_port_ids,
 )
 
+AUTO_DISCOVER = 'ports/auto_discover'
+# The statuses ending the Auto-Discovery process. The process is polled while it reports any other status, an
+# unknown one included, until the timeout
+AUTO_DISCOVER_COMPLETED = ('completed', 'complete', 'finished')
+AUTO_DISCOVER_FAILED = ('failed', 'error')
+AUTO_DISCOVER_POLL_INTERVAL = 2
+AUTO_DISCOVER_MAX_POLL_INTERVAL = 30
 
-class Ports(ConfigBase):
+
+class Ports(ResourceConfigBase):
     """
     The om_ports class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
+    resource = 'ports'
 
-    gather_network_resources = [
-        'ports',
-    ]
+    empty_facts = {
+        'ports': [],
+        'auto_discover': {
+            'ports': None,
+            'schedule': {},
+        },
+    }
 
     def __init__(self, module):
         super(Ports, self).__init__(module)
-
-    def get_ports_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        ports_facts = facts['ansible_network_resources'].get('ports')
-        if not ports_facts:
-            return []
-        return ports_facts
+        self.discovered_ports = None
 
     def execute_module(self):
-        """ Execute the module
+        """ Execute the module, adding the ports discovered while waiting for the Auto-Discovery process
 
         :rtype: A dictionary
         :returns: The result from module execution
         """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_ports_facts = self.get_ports_facts()
-        else:
-            existing_ports_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_ports_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_ports_facts = self.get_ports_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_ports_facts
-            if result['changed']:
-                result['after'] = changed_ports_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_ports_facts
-
-        result['warnings'] = warnings
+        result = super(Ports, self).execute_module()
+        if self.discovered_ports is not None:
+            result['discovered_ports'] = self.discovered_ports
         return result
 
-    def set_config(self, existing_ports_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
+    def dispatch(self, commands):
+        """ Send the port configuration commands in order, then the power commands, concurrently. When requested,
+            wait for the Auto-Discovery process the commands started to complete.
+        """
+        power_commands = [command for command in commands if command['path'].endswith('/power')]
+        super(Ports, self).dispatch([command for command in commands if command not in power_commands])
+        for response in self._connection.send_requests(power_commands):
+            if 'error' in response:
+                raise ConnectionError(response['error'], code=response['code'])
+
+        auto_discover = (self._module.params['config'] or {}).get('auto_discover') or {}
+        if auto_discover.get('wait') and any(command['path'] == AUTO_DISCOVER and command['method'] == 'POST'
+                                             for command in commands):
+            self.discovered_ports = self._wait_for_auto_discover(auto_discover.get('wait_timeout') or 300)
+
+    def _wait_for_auto_discover(self, timeout):
+        """ Poll the status of the Auto-Discovery process until it reports that it completed, with an increasing
+            interval, failing as soon as it reports that it failed
 
         :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
+        :returns: The ports whose label was changed by the Auto-Discovery process
         """
-        want = self._module.params['config']
-        have = existing_ports_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+        deadline = time.time() + timeout
+        interval = AUTO_DISCOVER_POLL_INTERVAL
+        status_command = {'data': None, 'path': AUTO_DISCOVER, 'method': 'GET'}
+        while True:
+            time.sleep(max(min(interval, deadline - time.time()), 0))
+            response = self._connection.send_requests([status_command], refresh=True)[0]
+            if 'error' in response:
+                self._module.fail_json(msg='Could not read the Auto-Discovery status: %s' % response['error'],
+                                       changed=True)
+            status = get_status(response['response'])
+            if status in AUTO_DISCOVER_COMPLETED:
+                break
+            if status in AUTO_DISCOVER_FAILED:
+                self._module.fail_json(msg='Auto-Discovery failed, its status is %s' % status, changed=True)
+            if time.time() >= deadline:
+                if status is None:
+                    self._module.fail_json(msg='the Auto-Discovery status was not reported within %d seconds'
+                                           % timeout, changed=True)
+                self._module.fail_json(msg='Auto-Discovery did not complete within %d seconds, its status is %s'
+                                       % (timeout, status), changed=True)
+            interval = min(interval * 1.5, AUTO_DISCOVER_MAX_POLL_INTERVAL)
+
+        labels = dict((port['id'], port.get('label')) for port in self.existing_facts['ports'])
+        return [{'id': port['id'], 'label': port.get('label'), 'previous_label': labels.get(port['id'])}
+                for port in get_instances(self._connection, 'ports', 'ports')
+                if port.get('label') != labels.get(port['id'])]
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -127,11 +138,18 @@ class Ports(ConfigBase):
                   to the desired configuration
         """
 
+        state = self._module.params['state']
+        if state == 'rendered':
+            return self._state_rendered(want)
+
         id_port_map = {}
         for port in have['ports']:
             id_port_map[port['id']] = port
 
-        state = self._module.params['state']
+        if want.get('ports'):
+            want = dict(want)
+            want['ports'] = self._expand_selectors(want['ports'], have['ports'])
+
         if state == 'overridden':
             commands = self._state_overridden(want, id_port_map, have['auto_discover'])
         elif state == 'deleted':
@@ -142,6 +160,94 @@ class Ports(ConfigBase):
             commands = self._state_replaced(want, id_port_map, have['auto_discover'])
         return commands
 
+    def _expand_selectors(self, want_ports, have_ports):
+        """ Expand the port entries selecting several ports into an entry per port. The id of an entry may be a
+            range expression (ports-[1:16,20]) or a glob pattern (ports-*), and its filter selects the ports whose
+            mode, pinout and label match the given patterns. A port selected by several entries takes the values
+            of the later entries.
+
+        :rtype: A list
+        :returns: the port entries, with a single port id each
+        """
+        expanded = {}
+        for port in want_ports:
+            port_filter = port.get('filter') or {}
+            selector = port.get('id')
+            if not selector and not any(port_filter.values()):
+                self._module.fail_json(msg='each port entry needs an id or a filter')
+            if selector and PORT_RANGE_RE.match(selector):
+                try:
+                    port_ids = select_port_ids([selector], [device_port['id'] for device_port in have_ports])
+                except ValueError as exc:
+                    self._module.fail_json(msg=str(exc))
+            elif selector and not any(char in selector for char in '*?[') and not any(port_filter.values()):
+                port_ids = [selector]
+            else:
+                port_ids = [device_port['id'] for device_port in have_ports
+                            if (not selector or fnmatchcase(device_port['id'], selector))
+                            and self._matches_filter(device_port, port_filter)]
+
+            for port_id in port_ids:
+                data = dict((option, value) for option, value in port.items() if option != 'filter')
+                data['id'] = port_id
+                if port_id in expanded:
+                    expanded[port_id].update((option, value) for option, value in data.items() if value is not None)
+                else:
+                    expanded[port_id] = deepcopy(data)
+        return list(expanded.values())
+
+    def _state_rendered(self, want):
+        """ The command generator when state is rendered. The device ports are not known, so a port entry selects
+            the ports named by its id or range expression, and is rendered with the options it sets only
+
+        :rtype: A list
+        :returns: the commands configuring the provided ports
+        """
+        commands = []
+        want = want or {}
+        rendered = {}
+        for port in want.get('ports') or []:
+            selector = port.get('id')
+            is_range = selector and PORT_RANGE_RE.match(selector)
+            if not selector or port.get('filter') or (not is_range and any(char in selector for char in '*?[')):
+                self._module.fail_json(msg='the rendered state selects the ports by id or range expression, the '
+                                           'filters and glob patterns need the ports of the device')
+            if is_range:
+                try:
+                    port_ids = expand_port_intervals(get_port_intervals([selector]))
+                except ValueError as exc:
+                    self._module.fail_json(msg=str(exc))
+            else:
+                port_ids = [selector]
+            for port_id in port_ids:
+                data = rendered.setdefault(port_id, {})
+                data.update(deepcopy(port))
+                data['id'] = port_id
+        for port_id, port in rendered.items():
+            port.pop('sessions', None)
+            power = port.pop('power', None)
+            commands.append(command_builder({'port': port}, 'ports/', port_id))
+            if power:
+                commands.append(command_builder({'cmd': power}, 'ports/', port_id + '/power'))
+        if want.get('auto_discover'):
+            commands.extend(self._state_merged({'auto_discover': want['auto_discover']}, {},
+                                               deepcopy(self.empty_facts['auto_discover'])))
+        return commands
+
+    @staticmethod
+    def _matches_filter(device_port, port_filter):
+        """ Check a device port against the patterns of a filter, a pattern starting with ! excluding the ports
+            it matches
+        """
+        for option, pattern in port_filter.items():
+            if pattern is None:
+                continue
+            negated = pattern.startswith('!')
+            matched = fnmatchcase(str(device_port.get(option) or ''), pattern[1:] if negated else pattern)
+            if matched == negated:
+                return False
+        return True
+
     @staticmethod
     def _state_replaced(want, id_port_map, auto_discover):
         """ The command generator when state is replaced
@@ -152,7 +258,7 @@ class Ports(ConfigBase):
         """
         commands = []
         want = remove_empties(want)
-        for port in want['ports']:
+        for port in want.get('ports', []):
             port_id = port['id']
             if port_id in id_port_map:
                 current_port = id_port_map[port_id]
@@ -185,7 +291,7 @@ class Ports(ConfigBase):
                 #         unwanted_session_pids.remove(session['pid'])
                 #         remove_all = False
         if 'auto_discover' in want:
-            path = 'ports/auto_discover'
+            path = AUTO_DISCOVER
             ports = None
             if 'ports' in want['auto_discover']:
                 ports = want['auto_discover']['ports']
@@ -234,7 +340,7 @@ class Ports(ConfigBase):
         """
         commands = []
         want = remove_empties(want)
-        for port in want['ports']:
+        for port in want.get('ports', []):
             port_id = port['id']
             if port_id in id_port_map:
                 current_port = remove_empties(id_port_map[port_id])
@@ -262,7 +368,7 @@ class Ports(ConfigBase):
                 #         unwanted_session_pids.remove(session['pid'])
                 #         remove_all = False
         if 'auto_discover' in want:
-            path = 'ports/auto_discover'
+            path = AUTO_DISCOVER
             ports = None
             if 'ports' in want['auto_discover']:
                 ports = want['auto_discover']['ports']
@@ -292,13 +398,13 @@ class Ports(ConfigBase):
         for port in want:
             port_id = port['id']
             path = 'ports/' + port_id
-            if port['sessions']:
+            if port.get('sessions'):
                 for session in port['sessions']:
-                    command = command_builder(None, path, '/sessions/' + session['client_pid'])
+                    command = command_builder(None, path, '/sessions/' + str(session['client_pid']))
                     if command:
-                        commands.add(command)
+                        commands.append(command)
             else:
                 command = command_builder(None, path, '/sessions/')
                 if command:
-                    commands.add(command)
+                    commands.append(command)
         return commands
@@ -0,0 +1,231 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_power class
+It is in this file where the power of the ports and PDU outlets is
+switched, concurrently and staggered, and the targets are polled
+until they reach the requested state
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+
+from fnmatch import fnmatchcase
+
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.network import (
+    get_resource_connection,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    add_request_stats,
+    get_instances,
+    get_status,
+    select_port_ids,
+)
+
+POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 5
+
+
+class Power(object):
+    """
+    The om_power class
+    """
+
+    def __init__(self, module):
+        self._module = module
+        self._connection = get_resource_connection(module)
+
+    def get_targets(self):
+        """ Get the ports and PDU outlets selected by the ports and outlets options
+
+        :rtype: A list
+        :returns: The targets, each holding either a port id, or a PDU id and an outlet id
+        """
+        params = self._module.params
+        targets = []
+        if params['ports']:
+            port_ids = [port['id'] for port in get_instances(self._connection, 'ports', 'ports')]
+            try:
+                targets.extend({'port': port_id} for port_id in select_port_ids(params['ports'], port_ids))
+            except ValueError as exc:
+                self._module.fail_json(msg=str(exc))
+        if params['outlets']:
+            pdus = list(get_instances(self._connection, 'pdus', 'pdus'))
+            for outlet_set in params['outlets']:
+                pdu_ids = [pdu['id'] for pdu in pdus if outlet_set['pdu'] in (pdu['id'], pdu.get('name'))]
+                if not pdu_ids:
+                    self._module.fail_json(msg='PDU %s does not exist' % outlet_set['pdu'])
+                outlets = self._connection.get(None, 'pdus/%s/outlets' % pdu_ids[0])['outlets']
+                patterns = outlet_set['outlets'] or ['*']
+                for outlet in outlets:
+                    names = (outlet['id'], outlet.get('name') or '')
+                    if any(fnmatchcase(name, pattern) for name in names for pattern in patterns):
+                        targets.append({'pdu': pdu_ids[0], 'outlet': outlet['id']})
+        return targets
+
+    @staticmethod
+    def _action_command(target, action):
+        if 'port' in target:
+            return {'data': {'cmd': action}, 'path': 'ports/%s/power' % target['port'], 'method': 'PUT'}
+        return {'data': None, 'path': 'pdus/%s/outlets/%s/%s' % (target['pdu'], target['outlet'], action),
+                'method': 'POST'}
+
+    def get_statuses(self, targets):
+        """ Read the power status of the targets concurrently, bypassing the request cache. The outlets of a PDU are
+            read with a single request.
+
+        :rtype: A list
+        :returns: The status of each target, None if the target does not report one, along with the error
+                  returned by the device when the status could not be read
+        """
+        commands = []
+        for target in targets:
+            if 'port' in target:
+                path = 'ports/%s/power' % target['port']
+            else:
+                path = 'pdus/%s/outlets' % target['pdu']
+            command = {'data': None, 'path': path, 'method': 'GET'}
+            if command not in commands:
+                commands.append(command)
+        responses = dict((command['path'], response)
+                         for command, response in zip(commands, self._connection.send_requests(commands, refresh=True)))
+
+        statuses = []
+        for target in targets:
+            if 'port' in target:
+                response = responses['ports/%s/power' % target['port']]
+            else:
+                response = responses['pdus/%s/outlets' % target['pdu']]
+            if 'error' in response:
+                statuses.append((None, response['error']))
+            elif 'port' in target:
+                statuses.append((get_status(response.get('response')), None))
+            else:
+                outlets = (response.get('response') or {}).get('outlets') or []
+                statuses.append((next((outlet.get('status') for outlet in outlets
+                                       if outlet['id'] == target['outlet']), None), None))
+        return statuses
+
+    def send_actions(self, commands):
+        """ Send the power actions, at most max_in_flight at a time, or one at a time starting at least stagger
+            seconds apart. The stagger is waited for here, between the calls to the persistent connection, so that
+            each call completes well within its command timeout however many targets are switched.
+
+        :rtype: A list
+        :returns: The result of each command, in order
+        """
+        params = self._module.params
+        if not params['stagger']:
+            responses = []
+            for index in range(0, len(commands), params['max_in_flight']):
+                responses.extend(self._connection.send_requests(commands[index:index + params['max_in_flight']],
+                                                                max_in_flight=params['max_in_flight']))
+            return responses
+
+        responses = []
+        started = time.time()
+        for index, command in enumerate(commands):
+            delay = started + index * params['stagger'] - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            responses.extend(self._connection.send_requests([command]))
+        return responses
+
+    def switch(self, targets, action):
+        """ Send the power action to the targets, then poll them until they reach the requested state. A cycled
+            target is complete once it was seen off, then on again.
+
+        :rtype: A list
+        :returns: The targets, each with the outcome of the action
+        """
+        params = self._module.params
+        wanted = 'off' if action == 'off' else 'on'
+        started = time.time()
+        responses = self.send_actions([self._action_command(target, action) for target in targets])
+        pending = []
+        for index, (target, response) in enumerate(zip(targets, responses)):
+            if 'error' in response:
+                target.update({'succeeded': False, 'msg': response['error']})
+            elif params['wait']:
+                pending.append(index)
+            else:
+                target['succeeded'] = True
+
+        cycled = set()
+        interval = POLL_INTERVAL
+        deadline = started + params['timeout']
+        while pending:
+            time.sleep(interval)
+            statuses = self.get_statuses([targets[index] for index in pending])
+            for index, (status, error) in zip(pending, statuses):
+                target = targets[index]
+                target['status'] = status
+                target.pop('msg', None)
+                if error:
+                    # Read again until the deadline, the device may be busy switching the power
+                    target['msg'] = 'the power status could not be read: %s' % error
+                elif status is None:
+                    target.update({'status': 'unknown', 'succeeded': None,
+                                   'msg': 'the power status is not reported, the action was accepted'})
+                elif action == 'cycle' and index not in cycled:
+                    if status != 'on':
+                        cycled.add(index)
+                elif status == wanted:
+                    target.update({'succeeded': True, 'elapsed': round(time.time() - started, 1)})
+            pending = [index for index in pending if 'succeeded' not in targets[index]]
+            # The off phase of a cycle may be short, it is looked for at the initial interval
+            if action != 'cycle' or all(index in cycled for index in pending):
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
+            if pending and time.time() >= deadline:
+                for index in pending:
+                    target = targets[index]
+                    if 'msg' not in target:
+                        expected = 'off then on' if action == 'cycle' and index not in cycled else wanted
+                        target['msg'] = 'did not report %s within %d seconds' % (expected, params['timeout'])
+                    target['succeeded'] = False
+                pending = []
+        return targets
+
+    def execute_module(self):
+        """ Execute the module
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        result = {'changed': False}
+        warnings = list()
+
+        action = self._module.params['action']
+        targets = self.get_targets()
+        if targets and action != 'cycle':
+            # Targets already in the requested state are left alone
+            for target, (status, dummy) in zip(targets, self.get_statuses(targets)):
+                target['status'] = status
+            targets = [target for target in targets if target['status'] != action]
+        for target in targets:
+            target['action'] = action
+
+        if targets:
+            result['changed'] = True
+            if not self._module.check_mode:
+                targets = self.switch(targets, action)
+            for target in targets:
+                if target.get('status') == 'unknown':
+                    warnings.append('%s does not report its power status, the %s action was only accepted'
+                                    % (target.get('port') or '%s outlet %s' % (target['pdu'], target['outlet']),
+                                       action))
+            failed = [target for target in targets if target.get('succeeded') is False]
+            if failed:
+                self._module.fail_json(msg='%d of %d targets failed to power %s' % (len(failed), len(targets), action),
+                                       targets=targets, changed=True)
+        result['targets'] = targets
+
+        result['warnings'] = warnings
+        add_request_stats(self._connection, result)
+        return result
@@ -0,0 +1,102 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The om_restore class
+It is in this file where a configuration backup is compared to the
+configuration exported by the device, imported with a single request
+and verified against a new export
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import json
+import os
+import zlib
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.network import (
+    get_resource_connection,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    add_request_stats,
+    get_facts_changes,
+)
+
+EXPORT = 'export'
+IMPORT = 'import'
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class Restore(object):
+    """
+    The om_restore class
+    """
+
+    def __init__(self, module):
+        self._module = module
+        self._connection = get_resource_connection(module)
+
+    @staticmethod
+    def load_config(path):
+        """ Load a configuration backup, gzip compressed or not
+
+        :rtype: A dictionary
+        :returns: The configuration
+        """
+        with open(path, 'rb') as file_handle:
+            compressed = file_handle.read(2) == GZIP_MAGIC
+        with (gzip.open(path, 'rb') if compressed else open(path, 'rb')) as file_handle:
+            return json.loads(file_handle.read().decode('utf-8'))
+
+    def export_config(self):
+        """ Export the configuration of the device, through a temporary file on the controller
+
+        :rtype: A dictionary
+        :returns: The configuration
+        """
+        export = self._connection.download(EXPORT, None)
+        try:
+            return self.load_config(export['path'])
+        finally:
+            os.remove(export['path'])
+
+    def execute_module(self):
+        """ Execute the module
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        params = self._module.params
+        result = {'changed': False}
+        warnings = list()
+
+        try:
+            config = self.load_config(params['src'])
+        except (IOError, OSError, ValueError, EOFError, zlib.error) as exc:
+            # A truncated or corrupt gzip backup raises EOFError or zlib.error
+            self._module.fail_json(msg='the configuration backup %s could not be read: %s' % (params['src'], exc))
+
+        result['changes'], result['counts'] = get_facts_changes(self.export_config(), config)
+        if result['changes']:
+            result['changed'] = True
+            if not self._module.check_mode:
+                try:
+                    self._connection.send_request(config, IMPORT, 'POST')
+                except ConnectionError as exc:
+                    if not exc.args[0].startswith('Expecting value:'):
+                        self._module.fail_json(msg='the configuration could not be imported: %s' % exc)
+                if params['verify']:
+                    differences = get_facts_changes(config, self.export_config())[0]
+                    if differences:
+                        self._module.fail_json(msg='the configuration of the device differs from %s after the import'
+                                               % params['src'], differences=differences, changed=True)
+
+        result['warnings'] = warnings
+        add_request_stats(self._connection, result)
+        return result
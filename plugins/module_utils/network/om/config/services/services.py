@@ -15,17 +15,12 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from copy import deepcopy
 
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
@@ -48,88 +43,14 @@ def get_id_instance_map(instance_list):
     return id_instance_map
 
 
-class Services(ConfigBase):
+class Services(ResourceConfigBase):
     """
     The om_services class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
-
-    gather_network_resources = [
-        'services',
-    ]
-
-    def __init__(self, module):
-        super(Services, self).__init__(module)
-
-    def get_services_facts(self):
-        """ Get the 'facts' (the current configuration)
+    resource = 'services'
 
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        services_facts = facts['ansible_network_resources'].get('services')
-        if not services_facts:
-            return []
-        return services_facts
-
-    def execute_module(self):
-        """ Execute the module
-
-        :rtype: A dictionary
-        :returns: The result from module execution
-        """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_services_facts = self.get_services_facts()
-        else:
-            existing_services_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_services_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_services_facts = self.get_services_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_services_facts
-            if result['changed']:
-                result['after'] = changed_services_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_services_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_services_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
-
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
-        """
-        want = self._module.params['config']
-        have = existing_services_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+    empty_facts = {}
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -145,7 +66,7 @@ class Services(ConfigBase):
             commands = self._state_overridden(want, have)
         elif state == 'deleted':
             commands = self._state_deleted(want, have)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, have)
         elif state == 'replaced':
             commands = self._state_replaced(want, have)
@@ -163,8 +84,8 @@ class Services(ConfigBase):
         want = remove_empties(want)
         for option in want:
             if isinstance(want[option], list):
-                name_id_map = get_name_id_map(have[option])
-                id_instance_map = get_id_instance_map(have[option])
+                name_id_map = get_name_id_map(have.get(option, []))
+                id_instance_map = get_id_instance_map(have.get(option, []))
                 for instance in want[option]:
                     instance_id = find_instance_id(name_id_map, 'name', instance)
                     if instance_id in id_instance_map:
@@ -197,8 +118,8 @@ class Services(ConfigBase):
 
         for option in want:
             if isinstance(want[option], list):
-                name_id_map = get_name_id_map(have[option])
-                id_instance_map = get_id_instance_map(have[option])
+                name_id_map = get_name_id_map(have.get(option, []))
+                id_instance_map = get_id_instance_map(have.get(option, []))
                 deleted_instances = deepcopy(id_instance_map)
                 for instance in want[option]:
                     if 'id' in instance and instance['id'] in id_instance_map:
@@ -224,8 +145,8 @@ class Services(ConfigBase):
         for option in want:
             path = 'services/'
             if isinstance(want[option], list):
-                name_id_map = get_name_id_map(have[option])
-                id_instance_map = get_id_instance_map(have[option])
+                name_id_map = get_name_id_map(have.get(option, []))
+                id_instance_map = get_id_instance_map(have.get(option, []))
                 for instance in want[option]:
                     instance_id = find_instance_id(name_id_map, 'name', instance)
                     if instance_id in id_instance_map:
@@ -261,7 +182,7 @@ class Services(ConfigBase):
         commands = []
         for option in want:
             if isinstance(want[option], list):
-                name_id_map = get_name_id_map(have[option])
+                name_id_map = get_name_id_map(have.get(option, []))
                 commands.extend(Services._delete_instance(want, name_id_map, option + '/'))
         return commands
 
@@ -15,109 +15,27 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
-from ansible.module_utils.connection import ConnectionError
-
-from copy import deepcopy
-
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
     command_builder,
-    find_instance_id,
+    get_route_key,
 )
 
+# The options of a route making its identity, compared in their normalised form
+ROUTE_KEY_OPTIONS = ('destination_address', 'destination_netmask', 'gateway_address', 'interface')
+
 
-class StaticRoutes(ConfigBase):
+class StaticRoutes(ResourceConfigBase):
     """
     The om_static routes class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
-
-    gather_network_resources = [
-        'static_routes',
-    ]
-
-    def __init__(self, module):
-        super(StaticRoutes, self).__init__(module)
-
-    def get_static_routes_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        static_routes_facts = facts['ansible_network_resources'].get('static_routes')
-        if not static_routes_facts:
-            return []
-        return static_routes_facts
-
-    def execute_module(self):
-        """ Execute the module
-
-        :rtype: A dictionary
-        :returns: The result from module execution
-        """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES:
-            existing_static_routes_facts = self.get_static_routes_facts()
-        else:
-            existing_static_routes_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_static_routes_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_static_routes_facts = self.get_static_routes_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_static_routes_facts
-            if result['changed']:
-                result['after'] = changed_static_routes_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_static_routes_facts
-
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_static_routes_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
-
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
-        """
-        want = self._module.params['config']
-        have = existing_static_routes_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+    resource = 'static_routes'
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -128,46 +46,83 @@ class StaticRoutes(ConfigBase):
         :returns: the commands necessary to migrate the current configuration
                   to the desired configuration
         """
-        destination_id_map = {}
         id_route_map = {}
+        key_route_map = {}
         for route in have:
-            destination_id_map[route['destination_address']] = route['id']
             id_route_map[route['id']] = route
+            key_route_map.setdefault(get_route_key(route), route)
 
+        want = want or []
         state = self._module.params['state']
         if state == 'overridden':
-            commands = self._state_overridden(want, destination_id_map, id_route_map)
+            commands = self._state_overridden(want, key_route_map, id_route_map)
         elif state == 'deleted':
-            commands = self._state_deleted(want, destination_id_map)
-        elif state == 'merged':
-            commands = self._state_merged(want, destination_id_map, id_route_map)
+            commands = self._state_deleted(want, key_route_map, id_route_map)
+        elif state in ('merged', 'rendered'):
+            commands = self._state_merged(want, key_route_map, id_route_map)
         elif state == 'replaced':
-            commands = self._state_replaced(want, destination_id_map, id_route_map)
+            commands = self._state_replaced(want, key_route_map, id_route_map)
         return commands
 
     @staticmethod
-    def _state_replaced(want, destination_id_map, id_route_map):
-        """ The command generator when state is replaced
+    def _find_route(route, key_route_map, id_route_map):
+        """ Find the device route matching a route, by id or by destination, netmask, gateway and interface.
+            A route leaving out some of these matches the single device route equal in the others.
+
+        :rtype: A dictionary
+        :returns: the matching device route, or None
+        """
+        if route.get('id') in id_route_map:
+            return id_route_map[route['id']]
+        key = get_route_key(route)
+        if key in key_route_map:
+            return key_route_map[key]
+        if None not in key:
+            return None
+        matches = [device_route for device_key, device_route in key_route_map.items()
+                   if all(field is None or field == device_field for field, device_field in zip(key, device_key))]
+        if len(matches) == 1:
+            return matches[0]
+        return None
+
+    @staticmethod
+    def _is_same_route(route, device_route):
+        """ Compare a route with a device route, using the normalised route identity
+        """
+        route = remove_empties(route)
+        device_route = remove_empties(device_route)
+        if get_route_key(route) != get_route_key(device_route):
+            return False
+        return all(route.get(option) == device_route.get(option) for option in ('description', 'metric'))
+
+    def _state_replaced(self, want, key_route_map, id_route_map):
+        """ The command generator when state is replaced. Two routes replacing the same device route fail, as only
+            one of them could be kept
 
         :rtype: A list
         :returns: the commands necessary to migrate the current configuration
                   to the desired configuration
         """
         commands = []
+        seen_ids = set()
         for route in want:
-            route_id = find_instance_id(destination_id_map, 'destination_address', route)
-            if route_id in id_route_map:
-                data = remove_empties(route)
-                data['id'] = route_id
-                if data == remove_empties(id_route_map[route_id]):
+            data = remove_empties(route)
+            data.pop('id', None)
+            device_route = StaticRoutes._find_route(route, key_route_map, id_route_map)
+            route_id = device_route['id'] if device_route else None
+            if route_id in seen_ids:
+                self._module.fail_json(msg='several routes match the device route %s, only one of them can replace it'
+                                           % route_id)
+            if device_route:
+                seen_ids.add(route_id)
+                if StaticRoutes._is_same_route(data, device_route):
                     continue
-            command = command_builder({'static_route': route}, 'static_routes/', route_id)
+            command = command_builder({'static_route': data}, 'static_routes/', route_id)
             if command:
                 commands.append(command)
         return commands
 
-    @staticmethod
-    def _state_overridden(want, destination_id_map, id_route_map):
+    def _state_overridden(self, want, key_route_map, id_route_map):
         """ The command generator when state is overridden
 
         :rtype: A list
@@ -176,26 +131,20 @@ class StaticRoutes(ConfigBase):
         """
         commands = []
 
-        deleted_routes = deepcopy(id_route_map)
-
+        kept_ids = set()
         for route in want:
-            if 'id' in route and route['id'] in id_route_map:
-                route_id = route['id']
-            else:
-                route_id = find_instance_id(destination_id_map, 'destination_address', route)
-            if route_id in deleted_routes:
-                deleted_routes.pop(route_id)
-
-        if len(deleted_routes) == len(id_route_map):
-            commands.append({'data': {'static_routes': want}, 'path': 'static_routes/', 'method': 'PUT'})
-        else:
-            commands.extend(StaticRoutes._state_deleted(deleted_routes.values(), destination_id_map))
-            commands.extend(StaticRoutes._state_replaced(want, destination_id_map, id_route_map))
+            device_route = StaticRoutes._find_route(route, key_route_map, id_route_map)
+            if device_route:
+                kept_ids.add(device_route['id'])
+        for route_id in id_route_map:
+            if route_id not in kept_ids:
+                commands.append(command_builder(None, 'static_routes/', route_id))
+        commands.extend(self._state_replaced(want, key_route_map, id_route_map))
 
         return commands
 
     @staticmethod
-    def _state_merged(want, destination_id_map, id_route_map):
+    def _state_merged(want, key_route_map, id_route_map):
         """ The command generator when state is merged
 
         :rtype: A list
@@ -205,12 +154,18 @@ class StaticRoutes(ConfigBase):
         commands = []
         for route in want:
             data = remove_empties(route)
-            route_id = find_instance_id(destination_id_map, 'destination_address', data)
-            if route_id in id_route_map:
-                device_route = id_route_map[route_id]
+            device_route = StaticRoutes._find_route(data, key_route_map, id_route_map)
+            data.pop('id', None)
+            if device_route:
+                route_id = device_route['id']
                 merged_data = dict_merge(device_route, data)
-                if dict_diff(merged_data, device_route):
+                if get_route_key(merged_data) == get_route_key(device_route):
+                    # The route identity is the same, only written differently, so it is kept as the device has it
+                    merged_data.update((option, device_route.get(option)) for option in ROUTE_KEY_OPTIONS)
+                if dict_diff(device_route, merged_data):
                     data = merged_data
+                    # Record the change, so a later route matching the same device route merges into it
+                    key_route_map[get_route_key(device_route)] = id_route_map[route_id] = dict(merged_data)
                 else:
                     continue
                 data.pop('id', None)
@@ -222,7 +177,7 @@ class StaticRoutes(ConfigBase):
         return commands
 
     @staticmethod
-    def _state_deleted(want, destination_id_map):
+    def _state_deleted(want, key_route_map, id_route_map):
         """ The command generator when state is deleted
 
         :rtype: A list
@@ -230,9 +185,10 @@ class StaticRoutes(ConfigBase):
                   of the provided objects
         """
         commands = []
+        deleted_ids = set()
         for route in want:
-            route_id = find_instance_id(destination_id_map, 'destination_address', route)
-            command = command_builder(None, 'static_routes/', route_id)
-            if command:
-                commands.append(command)
+            device_route = StaticRoutes._find_route(remove_empties(route), key_route_map, id_route_map)
+            if device_route and device_route['id'] not in deleted_ids:
+                deleted_ids.add(device_route['id'])
+                commands.append(command_builder(None, 'static_routes/', device_route['id']))
         return commands
@@ -15,105 +15,147 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_diff,
+    remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
     get_restapi_body_structure,
-    command_builder
+    command_builder,
+    get_ssh_key_fingerprint,
+    wait_until_ready,
 )
 
 from ansible.module_utils.connection import ConnectionError
 
+import time
+
+
+AUTHORIZED_KEYS = 'system_authorized_keys'
+REBOOT = 'system/reboot'
+UPTIME = 'system/uptime'
+REBOOT_PROBE_TIMEOUT = 5
+REBOOT_POLL_INTERVAL = 2
+REBOOT_MAX_POLL_INTERVAL = 15
+# The number of seconds the device is watched going down before its uptime shows whether it restarted
+REBOOT_DOWN_TIMEOUT = 60
+
 
-class System(ConfigBase):
+class System(ResourceConfigBase):
     """
     The om_system class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
+    resource = 'system'
 
-    gather_network_resources = [
-        'system',
-    ]
+    empty_facts = {}
 
     def __init__(self, module):
         super(System, self).__init__(module)
-
-    def get_system_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        system_facts = facts['ansible_network_resources'].get('system')
-        if not system_facts:
-            return {}
-        return system_facts
+        self.time_to_ready = None
 
     def execute_module(self):
-        """ Execute the module
+        """ Execute the module, adding the time the device took to be ready again after a reboot
 
         :rtype: A dictionary
         :returns: The result from module execution
         """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
+        result = super(System, self).execute_module()
+        if self.time_to_ready is not None:
+            result['time_to_ready'] = self.time_to_ready
+        return result
+
+    def dispatch(self, commands):
+        """ Send the commands to the device. The authorized key commands are independent of each other and are sent
+            concurrently, before the other commands, which are sent in order. A reboot is requested last and, when
+            requested, waited for.
+        """
+        key_commands = [command for command in commands if command['path'].startswith('system/' + AUTHORIZED_KEYS)]
+        for response in self._connection.send_requests(key_commands):
+            if 'error' in response:
+                raise ConnectionError(response['error'], code=response['code'])
+        reboot_commands = [command for command in commands if command['path'] == REBOOT]
+        for command in commands:
+            if command in key_commands or command in reboot_commands:
+                continue
+            try:
+                self._connection.send_request(command['data'], command['path'], command['method'])
+            except ConnectionError as exc:
+                if not exc.args[0].startswith('Expecting value:'):
+                    raise exc
+        if reboot_commands:
+            try:
+                self._connection.send_request(None, REBOOT, 'POST')
+            except ConnectionError as exc:
+                # The device may close the connection as it goes down
+                if not self._module.params['wait_for_reboot']:
+                    if not exc.args[0].startswith('Expecting value:'):
+                        raise exc
+            if self._module.params['wait_for_reboot']:
+                self.time_to_ready = self._wait_for_reboot(self._module.params['reboot_timeout'])
+
+    def _wait_for_reboot(self, timeout):
+        """ Wait for the device to go down, then probe it with a new session and an increasing interval until it
+            answers on system/version. A device restarting between two probes is not seen going down, its uptime
+            then shows whether it restarted since the reboot was requested
 
-        if self.state in self.ACTION_STATES:
-            existing_system_facts = self.get_system_facts()
+        :rtype: A float
+        :returns: The number of seconds from the reboot request until the device was ready
+        """
+        started = time.time()
+        deadline = started + timeout
+        down_deadline = min(started + REBOOT_DOWN_TIMEOUT, deadline)
+        # The device keeps answering for a moment after the reboot is requested
+        while self._connection.probe(REBOOT_PROBE_TIMEOUT, False):
+            if time.time() >= down_deadline:
+                break
+            time.sleep(1)
         else:
-            existing_system_facts = {}
-        if self.state in self.ACTION_STATES or self.state == 'rendered':
-            commands.extend(self.set_config(existing_system_facts))
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        if self.state in self.ACTION_STATES:
-            result['commands'] = commands
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            changed_system_facts = self.get_system_facts()
-        elif self.state == 'rendered':
-            result['rendered'] = commands
-        if self.state in self.ACTION_STATES:
-            result['before'] = existing_system_facts
-            if result['changed']:
-                result['after'] = changed_system_facts
-        elif self.state == 'gathered':
-            result['gathered'] = changed_system_facts
-
-        result['warnings'] = warnings
-        return result
+            if not wait_until_ready(self._connection, deadline, REBOOT_PROBE_TIMEOUT, REBOOT_POLL_INTERVAL,
+                                    REBOOT_MAX_POLL_INTERVAL):
+                self._module.fail_json(msg='the device was not ready within %d seconds of the reboot' % timeout,
+                                       changed=True)
+            return round(time.time() - started, 1)
 
-    def set_config(self, existing_system_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
+        interval = REBOOT_POLL_INTERVAL
+        while True:
+            if not wait_until_ready(self._connection, deadline, REBOOT_PROBE_TIMEOUT, REBOOT_POLL_INTERVAL,
+                                    REBOOT_MAX_POLL_INTERVAL):
+                self._module.fail_json(msg='the device was not ready within %d seconds of the reboot' % timeout,
+                                       changed=True)
+            uptime = self._read_uptime()
+            if uptime is not None and uptime <= time.time() - started:
+                return round(time.time() - started, 1)
+            if time.time() >= deadline:
+                if uptime is None:
+                    self._module.fail_json(msg='the device was not seen restarting and its uptime could not be read '
+                                               'within %d seconds' % timeout, changed=True)
+                self._module.fail_json(msg='the device did not restart within %d seconds' % timeout, changed=True)
+            time.sleep(max(min(interval, deadline - time.time()), 0))
+            interval = min(interval * 1.5, REBOOT_MAX_POLL_INTERVAL)
 
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
+    def _read_uptime(self):
+        """ Read the number of seconds the device has been up for
+
+        :rtype: A float
+        :returns: The uptime, or None if it could not be read
         """
-        want = self._module.params['config']
-        have = existing_system_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+        try:
+            response = self._connection.send_request(None, UPTIME, 'GET')
+        except ConnectionError:
+            return None
+        while isinstance(response, dict):
+            if 'uptime' in response:
+                response = response['uptime']
+                break
+            if len(response) != 1:
+                return None
+            response = list(response.values())[0]
+        try:
+            return float(response)
+        except (TypeError, ValueError):
+            return None
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -129,7 +171,7 @@ class System(ConfigBase):
             commands = self._state_overridden(want, have)
         elif state == 'deleted':
             commands = self._state_deleted(want, have)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, have)
         elif state == 'replaced':
             commands = self._state_replaced(want, have)
@@ -145,7 +187,8 @@ class System(ConfigBase):
         """
 
         commands = []
-        commands.extend(System._state_deleted(want, have))
+        if want.get(AUTHORIZED_KEYS) is not None:
+            commands.extend(System._remove_extra_keys(want[AUTHORIZED_KEYS], have.get(AUTHORIZED_KEYS) or []))
         commands.extend(System._state_merged(want, have))
         return commands
 
@@ -158,7 +201,7 @@ class System(ConfigBase):
                   to the desired configuration
         """
         commands = []
-        commands.extend(System._state_deleted(have, have))
+        commands.extend(System._remove_extra_keys(want.get(AUTHORIZED_KEYS) or [], have.get(AUTHORIZED_KEYS) or []))
         commands.extend(System._state_merged(want, have))
         return commands
 
@@ -172,21 +215,16 @@ class System(ConfigBase):
         """
         body_structure = get_restapi_body_structure()['system']
         commands = []
-        to_set = dict_diff(have, want)
+        if want.get(AUTHORIZED_KEYS):
+            commands.extend(System._add_missing_keys(want[AUTHORIZED_KEYS], have.get(AUTHORIZED_KEYS) or []))
+        to_set = dict_diff(dict((option, value) for option, value in have.items() if option != AUTHORIZED_KEYS),
+                           dict((option, value) for option, value in want.items() if option != AUTHORIZED_KEYS))
+        # The options without an endpoint in the body structure, such as cell_reliability_test, are not written
         for option in to_set.keys():
-            if isinstance(to_set[option], list):
-                for key in want[option]:
-                    data = key
-                    if 'id' in data:
-                        data.pop('id')
-                    data = {"system_authorized_key": data}
-                    # command = {'data': data, 'path': 'system/' + option, 'method': 'POST'}
-                    command = command_builder(data, 'system/' + option)
-                    commands.append(command)
-            elif option == 'reboot':
-                command = {'data': None, 'path': 'system/reboot', 'method': 'POST'}
+            if option == 'reboot':
+                command = {'data': None, 'path': REBOOT, 'method': 'POST'}
                 commands.append(command)
-            else:
+            elif option in body_structure:
                 data = to_set[option]
                 for key in reversed(body_structure[option]):
                     data = {key: data}
@@ -205,14 +243,69 @@ class System(ConfigBase):
         """
 
         commands = []
-        for option in want:
-            if isinstance(want[option], list) and isinstance(have[option], list):
-                device_ids = []
-                for key in have[option]:
-                    if 'id' in key:
-                        device_ids.append(key['id'])
-                for key in want[option]:
-                    if 'id' in key and key['id'] in device_ids:
-                        command = {'data': None, 'path': 'system/' + option + '/' + key['id'], 'method': 'DELETE'}
-                        commands.append(command)
+        deleted_ids = set()
+        for key in want.get(AUTHORIZED_KEYS) or []:
+            for device_key in System._find_keys(key, have.get(AUTHORIZED_KEYS) or []):
+                if device_key['id'] not in deleted_ids:
+                    deleted_ids.add(device_key['id'])
+                    commands.append(System._delete_key_command(device_key))
+        return commands
+
+    @staticmethod
+    def _get_key_fingerprint(key):
+        return get_ssh_key_fingerprint(key.get('key')) or key.get('key_fingerprint')
+
+    @staticmethod
+    def _find_keys(key, device_keys):
+        """ Find the device keys matching a key by id, or by fingerprint and user
+
+        :rtype: A list
+        :returns: the matching device keys
+        """
+        if key.get('id'):
+            return [device_key for device_key in device_keys if device_key.get('id') == key['id']]
+        fingerprint = System._get_key_fingerprint(key)
+        if not fingerprint:
+            return []
+        return [device_key for device_key in device_keys
+                if System._get_key_fingerprint(device_key) == fingerprint
+                and (not key.get('username') or key['username'] == device_key.get('username'))]
+
+    @staticmethod
+    def _add_missing_keys(want_keys, device_keys):
+        """ The commands adding the keys that are not on the device yet
+
+        :rtype: A list
+        :returns: the commands necessary to add the missing keys
+        """
+        commands = []
+        added = set()
+        for key in want_keys:
+            fingerprint = System._get_key_fingerprint(key)
+            if not key.get('key') or (key.get('username'), fingerprint) in added:
+                continue
+            if System._find_keys({'key': key['key'], 'username': key.get('username')}, device_keys):
+                continue
+            added.add((key.get('username'), fingerprint))
+            data = remove_empties(key)
+            data.pop('id', None)
+            data.pop('key_fingerprint', None)
+            commands.append(command_builder({'system_authorized_key': data}, 'system/' + AUTHORIZED_KEYS))
         return commands
+
+    @staticmethod
+    def _remove_extra_keys(want_keys, device_keys):
+        """ The commands removing the device keys that are not wanted
+
+        :rtype: A list
+        :returns: the commands necessary to remove the extra keys
+        """
+        kept_ids = set()
+        for key in want_keys:
+            kept_ids.update(device_key['id'] for device_key in System._find_keys(key, device_keys))
+        return [System._delete_key_command(device_key) for device_key in device_keys
+                if device_key.get('id') not in kept_ids]
+
+    @staticmethod
+    def _delete_key_command(device_key):
+        return {'data': None, 'path': 'system/' + AUTHORIZED_KEYS + '/' + device_key['id'], 'method': 'DELETE'}
@@ -15,106 +15,30 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base import (
-    ConfigBase,
-)
 from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.utils import (
-    to_list,
     dict_merge,
     remove_empties,
 )
-from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
-
-from ansible.module_utils.connection import ConnectionError
-
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import ResourceConfigBase
 from copy import deepcopy
 
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
     command_builder,
     find_instance_id,
+    hash_password,
     is_subset,
+    verify_password,
 )
 
 
-class Users(ConfigBase):
+class Users(ResourceConfigBase):
     """
     The om_users class
     """
 
-    gather_subset = [
-        '!all',
-        '!min',
-    ]
+    resource = 'users'
 
-    gather_network_resources = [
-        'users',
-    ]
-
-    def __init__(self, module):
-        super(Users, self).__init__(module)
-
-    def get_users_facts(self):
-        """ Get the 'facts' (the current configuration)
-
-        :rtype: A dictionary
-        :returns: The current configuration as a dictionary
-        """
-        facts, _warnings = Facts(self._module).get_facts(self.gather_subset, self.gather_network_resources)
-        users_facts = facts['ansible_network_resources'].get('users')
-        if not users_facts:
-            return []
-        return users_facts
-
-    def execute_module(self):
-        """ Execute the module
-
-        :rtype: A dictionary
-        :returns: The result from module execution
-        """
-        result = {'changed': False}
-        warnings = list()
-        commands = list()
-
-        if self.state in self.ACTION_STATES or self.state == 'gathered':
-            existing_users_facts = self.get_users_facts()
-            if self.state != 'gathered':
-                commands.extend(self.set_config(existing_users_facts))
-        else:
-            existing_users_facts = {}
-        if commands and self.state in self.ACTION_STATES:
-            if not self._module.check_mode:
-                for command in commands:
-                    try:
-                        self._connection.send_request(command['data'], command['path'], command['method'])
-                    except ConnectionError as exc:
-                        if not exc.args[0].startswith('Expecting value:'):
-                            raise exc
-            result['changed'] = True
-        result['commands'] = commands
-        if self.state in self.ACTION_STATES:
-            changed_users_facts = self.get_users_facts()
-            result['before'] = existing_users_facts
-            if result['changed']:
-                result['after'] = changed_users_facts
-        elif self.state == 'rendered':
-            result['rendered'] = self._module.params['config']
-        elif self.state == 'gathered':
-            result['gathered'] = existing_users_facts
-        result['warnings'] = warnings
-        return result
-
-    def set_config(self, existing_users_facts):
-        """ Collect the configuration from the args passed to the module,
-            collect the current configuration (as a dict from facts)
-
-        :rtype: A list
-        :returns: the commands necessary to migrate the current configuration
-                  to the desired configuration
-        """
-        want = self._module.params['config']
-        have = existing_users_facts
-        resp = self.set_state(want, have)
-        return to_list(resp)
+    secret_keys = ('password',)
 
     def set_state(self, want, have):
         """ Select the appropriate function based on the state provided
@@ -131,17 +55,44 @@ class Users(ConfigBase):
             username_id_map[user['username']] = user['id']
             id_user_map[user['id']] = user
 
+        want = self._resolve_passwords(want, id_user_map, username_id_map, self._module.params['hash_passwords'])
+
         state = self._module.params['state']
         if state == 'overridden':
             commands = self._state_overridden(want, username_id_map, id_user_map)
         elif state == 'deleted':
             commands = self._state_deleted(want, username_id_map)
-        elif state == 'merged':
+        elif state in ('merged', 'rendered'):
             commands = self._state_merged(want, username_id_map, id_user_map)
         elif state == 'replaced':
             commands = self._state_replaced(want, username_id_map, id_user_map)
         return commands
 
+    @staticmethod
+    def _resolve_passwords(want, id_user_map, username_id_map, hash_passwords):
+        """ Replaces the plain text passwords that match the password hash of the device with that hash, so that
+            unchanged users compare equal to the device. Other passwords are hashed locally if requested.
+
+        :rtype: A list
+        :returns: the desired configuration, with resolved passwords
+        """
+        resolved = []
+        for user in want or []:
+            user = deepcopy(user)
+            password = user.get('password')
+            if password:
+                device_user = id_user_map.get(find_instance_id(username_id_map, 'username', deepcopy(user)), {})
+                device_hash = device_user.get('hashed_password')
+                if verify_password(password, device_hash):
+                    user['hashed_password'] = device_hash
+                    user['password'] = None
+                elif hash_passwords:
+                    method = '6' if device_hash and device_hash.startswith('$6$') else '5'
+                    user['hashed_password'] = hash_password(password, method)
+                    user['password'] = None
+            resolved.append(user)
+        return resolved
+
     @staticmethod
     def _state_replaced(want, username_id_map, id_user_map):
         """ The command generator when state is replaced
@@ -205,9 +156,9 @@ class Users(ConfigBase):
             if user_id in id_user_map:
                 device_user = id_user_map[user_id]
                 if 'password' in data:
-                    device_user.pop('hashed_password')
+                    device_user.pop('hashed_password', None)
                 elif 'hashed_password' in data:
-                    device_user.pop('password')
+                    device_user.pop('password', None)
                 merged_data = dict_merge(device_user, data)
                 if is_subset(merged_data, device_user):
                     continue
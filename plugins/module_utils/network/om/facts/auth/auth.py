@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.auth.auth import AuthArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import validate_config
 
 
 class AuthFacts(object):
@@ -62,7 +63,7 @@ class AuthFacts(object):
         ansible_facts['ansible_network_resources'].pop('auth', None)
         facts = {}
         if obj:
-            params = utils.validate_config(self.argument_spec, {'config': obj})
+            params = validate_config(self.argument_spec, {'config': obj}, self._module)
             facts['auth'] = params['config']
         else:
             facts['auth'] = {}
@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.conns.conns import ConnsArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import get_instances, validate_config
 
 
 class ConnsFacts(object):
@@ -41,7 +42,7 @@ class ConnsFacts(object):
         self.generated_spec = utils.generate_dict(facts_argument_spec)
 
     def get_device_data(self, connection):
-        return connection.get(None, 'conns')['conns']
+        return get_instances(connection, 'conns', 'conns')
 
     def populate_facts(self, connection, ansible_facts, data=None):
         """ Populate the facts for conns
@@ -65,7 +66,7 @@ class ConnsFacts(object):
         ansible_facts['ansible_network_resources'].pop('conns', None)
         facts = {}
         if objs:
-            params = utils.validate_config(self.argument_spec, {'config': objs})
+            params = validate_config(self.argument_spec, {'config': objs}, self._module)
             facts['conns'] = params['config']
 
         ansible_facts['ansible_network_resources'].update(facts)
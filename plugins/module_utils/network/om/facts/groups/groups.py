@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.groups.groups import GroupsArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import get_instances, validate_config
 
 
 class GroupsFacts(object):
@@ -41,7 +42,7 @@ class GroupsFacts(object):
         self.generated_spec = utils.generate_dict(facts_argument_spec)
 
     def get_device_data(self, connection):
-        return connection.get(None, 'groups')['groups']
+        return get_instances(connection, 'groups', 'groups')
 
     def populate_facts(self, connection, ansible_facts, data=None):
         """ Populate the facts for groups
@@ -64,7 +65,7 @@ class GroupsFacts(object):
         ansible_facts['ansible_network_resources'].pop('groups', None)
         facts = {}
         if objs:
-            params = utils.validate_config(self.argument_spec, {'config': objs})
+            params = validate_config(self.argument_spec, {'config': objs}, self._module)
             facts['groups'] = params['config']
 
         ansible_facts['ansible_network_resources'].update(facts)
@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.pdu.pdu import PduArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import get_instances, validate_config
 
 
 class PduFacts(object):
@@ -41,7 +42,7 @@ class PduFacts(object):
         self.generated_spec = utils.generate_dict(facts_argument_spec)
 
     def get_device_data(self, connection):
-        return connection.get(None, 'pdus')['pdus']
+        return get_instances(connection, 'pdus', 'pdus')
 
     def populate_facts(self, connection, ansible_facts, data=None):
         """ Populate the facts for pdu
@@ -64,7 +65,7 @@ class PduFacts(object):
         ansible_facts['ansible_network_resources'].pop('pdu', None)
         facts = {}
         if objs:
-            params = utils.validate_config(self.argument_spec, {'config': objs})
+            params = validate_config(self.argument_spec, {'config': objs}, self._module)
             facts['pdu'] = params['config']
 
         ansible_facts['ansible_network_resources'].update(facts)
@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.ports.ports import PortsArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import validate_config
 
 
 class PortsFacts(object):
@@ -72,7 +73,7 @@ class PortsFacts(object):
         ansible_facts['ansible_network_resources'].pop('ports', None)
         facts = {}
         if obj:
-            params = utils.validate_config(self.argument_spec, {'config': obj})
+            params = validate_config(self.argument_spec, {'config': obj}, self._module)
             facts['ports'] = params['config']
         else:
             facts['ports'] = {}
@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.services.services import ServicesArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import validate_config
 
 
 class ServicesFacts(object):
@@ -68,7 +69,7 @@ class ServicesFacts(object):
         ansible_facts['ansible_network_resources'].pop('services', None)
         facts = {}
         if obj:
-            params = utils.validate_config(self.argument_spec, {'config': obj})
+            params = validate_config(self.argument_spec, {'config': obj}, self._module)
             facts['services'] = params['config']
         else:
             facts['services'] = {}
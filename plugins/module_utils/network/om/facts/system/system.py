@@ -23,6 +23,7 @@ from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.sys
 
 from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
     get_restapi_body_structure,
+    validate_config,
 )
 
 
@@ -78,7 +79,7 @@ class SystemFacts(object):
         ansible_facts['ansible_network_resources'].pop('system', None)
         facts = {}
         if obj:
-            params = utils.validate_config(self.argument_spec, {'config': obj})
+            params = validate_config(self.argument_spec, {'config': obj}, self._module)
             facts['system'] = params['config']
         else:
             facts['system'] = {}
@@ -104,7 +105,4 @@ class SystemFacts(object):
                 for key in option_structure:
                     value = value[key]
             config[option] = value
-        for key in config['system_authorized_keys']:
-            if 'key_fingerprint' in key:
-                key.pop('key_fingerprint')
         return utils.remove_empties(config)
@@ -20,6 +20,7 @@ from ansible_collections.ansible.netcommon.plugins.module_utils.network.common i
     utils,
 )
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.users.users import UsersArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import get_instances, validate_config
 
 
 class UsersFacts(object):
@@ -41,7 +42,7 @@ class UsersFacts(object):
         self.generated_spec = utils.generate_dict(facts_argument_spec)
 
     def get_device_data(self, connection):
-        return connection.get(None, 'users')['users']
+        return get_instances(connection, 'users', 'users')
 
     def populate_facts(self, connection, ansible_facts, data=None):
         """ Populate the facts for users
@@ -64,7 +65,7 @@ class UsersFacts(object):
         ansible_facts['ansible_network_resources'].pop('users', None)
         facts = {}
         if objs:
-            params = utils.validate_config(self.argument_spec, {'config': objs})
+            params = validate_config(self.argument_spec, {'config': objs}, self._module)
             facts['users'] = params['config']
 
         ansible_facts['ansible_network_resources'].update(facts)
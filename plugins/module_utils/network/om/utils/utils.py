@@ -9,7 +9,51 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import base64
+import binascii
+import cProfile
+import gzip
+import hashlib
+import ipaddress
 import json
+import os
+import random
+import re
+import socket
+import tempfile
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from copy import deepcopy
+from fnmatch import fnmatchcase
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.connection import ConnectionError
+
+CRYPT_ALPHABET = './0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+SHA_CRYPT_METHODS = {
+    '5': (hashlib.sha256, (
+        (0, 10, 20), (21, 1, 11), (12, 22, 2), (3, 13, 23), (24, 4, 14),
+        (15, 25, 5), (6, 16, 26), (27, 7, 17), (18, 28, 8), (9, 19, 29),
+        (None, 31, 30),
+    )),
+    '6': (hashlib.sha512, (
+        (0, 21, 42), (22, 43, 1), (44, 2, 23), (3, 24, 45), (25, 46, 4),
+        (47, 5, 26), (6, 27, 48), (28, 49, 7), (50, 8, 29), (9, 30, 51),
+        (31, 52, 10), (53, 11, 32), (12, 33, 54), (34, 55, 13), (56, 14, 35),
+        (15, 36, 57), (37, 58, 16), (59, 17, 38), (18, 39, 60), (40, 61, 19),
+        (62, 20, 41), (None, None, 63),
+    )),
+}
+
+PORT_RANGE_RE = re.compile(r'^(.*?)\[([0-9:,]+)\](.*)$')
+PORT_NAME_RE = re.compile(r'^(.*?)([0-9]+)([^0-9]*)$')
+
+# The probes checking that the device is ready again after a batch of network changes
+HEALTH_CHECK_PROBE_TIMEOUT = 5
+HEALTH_CHECK_INTERVAL = 2
 
 structure = """{
   "system": {
@@ -89,3 +133,704 @@ def is_subset(want, have):
         if want[key] != have[key]:
             return False
     return True
+
+
+def get_ssh_key_fingerprint(key):
+    """
+    Computes the fingerprint of an SSH public key, in the format displayed by ssh-keygen -l.
+    :param key: The public key, in authorized_keys format (options, type, base64 encoded key and comment).
+    :return: The SHA256 fingerprint of the key, or None if the key could not be parsed.
+    """
+    if not key:
+        return None
+    fields = key.split()
+    for key_type, encoded in zip(fields, fields[1:]):
+        try:
+            blob = base64.b64decode(encoded.encode('ascii'))
+        except (binascii.Error, TypeError, ValueError):
+            continue
+        # The key blob starts with its length prefixed type
+        if blob[4:4 + len(key_type)] == key_type.encode('ascii'):
+            digest = base64.b64encode(hashlib.sha256(blob).digest()).decode('ascii')
+            return 'SHA256:' + digest.rstrip('=')
+    return None
+
+
+def get_route_key(route):
+    """
+    Computes the identity of a static route, so that routes can be matched regardless of their id and of how their
+    addresses are written.
+    :param route: The static route.
+    :return: A (destination network, prefix length, gateway, interface) tuple, with the addresses normalised. Fields
+     missing from the route are None.
+    """
+    destination = route.get('destination_address')
+    prefix = route.get('destination_netmask')
+    if destination:
+        try:
+            if prefix is not None:
+                network = ipaddress.ip_network(u'%s/%s' % (destination.split('/')[0], prefix), strict=False)
+            else:
+                network = ipaddress.ip_network(u'%s' % destination, strict=False)
+                prefix = network.prefixlen if '/' in destination else None
+            destination = str(network.network_address)
+        except ValueError:
+            destination = destination.lower()
+    gateway = route.get('gateway_address')
+    if gateway:
+        try:
+            gateway = str(ipaddress.ip_address(u'%s' % gateway))
+        except ValueError:
+            gateway = gateway.lower()
+    return destination or None, prefix, gateway or None, route.get('interface') or None
+
+
+def _get_port_width(digits):
+    return len(digits) if len(digits) > 1 and digits.startswith('0') else 0
+
+
+def _split_port_interval(prefix, suffix, width, start, end):
+    """
+    Splits a zero padded interval, so that numbers whose padding has no effect are in an unpadded interval. This
+    gives each port a single representation, port10 being the same port in port[01:10] and port[9:10].
+    """
+    unpadded = 10 ** (width - 1) if width else start
+    intervals = []
+    if start < unpadded:
+        intervals.append((prefix, suffix, width, start, min(end, unpadded - 1)))
+    if end >= unpadded:
+        intervals.append((prefix, suffix, 0, max(start, unpadded), end))
+    return intervals
+
+
+def _get_port_order(interval):
+    prefix, suffix, width, start, dummy = interval
+    return prefix, suffix, start, -width
+
+
+def merge_port_intervals(intervals):
+    """
+    Sorts port intervals and merges the overlapping and adjacent ones.
+    :param intervals: A list of (prefix, suffix, width, start, end) port intervals.
+    :return: The sorted and merged intervals, as a tuple.
+    """
+    merged = []
+    for interval in sorted(intervals):
+        last = merged[-1] if merged else None
+        if last and last[:3] == interval[:3] and interval[3] <= last[4] + 1:
+            merged[-1] = last[:4] + (max(last[4], interval[4]),)
+        else:
+            merged.append(interval)
+    return tuple(merged)
+
+
+def get_port_intervals(ports):
+    """
+    Parses port names and port range expressions into intervals. A range expression lists numbers and ranges of
+    numbers in brackets, for example serial/by-opengear-id/port[01:16,20] for ports 1 to 16 and 20.
+    :param ports: A list of port names and port range expressions.
+    :return: The sorted and merged (prefix, suffix, width, start, end) intervals of the ports, as a tuple. Ports
+     without a number are represented by a (name, '', 0, -1, -1) interval.
+    :raises ValueError: If a range expression is not valid.
+    """
+    intervals = []
+    for port in ports or []:
+        match = PORT_RANGE_RE.match(port)
+        if match:
+            prefix, ranges, suffix = match.groups()
+            for number_range in ranges.split(','):
+                bounds = number_range.split(':')
+                if len(bounds) > 2 or not all(bounds) or int(bounds[0]) > int(bounds[-1]):
+                    raise ValueError('invalid port range expression %s' % port)
+                intervals.extend(_split_port_interval(prefix, suffix, _get_port_width(bounds[0]),
+                                                      int(bounds[0]), int(bounds[-1])))
+            continue
+        match = PORT_NAME_RE.match(port)
+        if match:
+            prefix, number, suffix = match.groups()
+            intervals.extend(_split_port_interval(prefix, suffix, _get_port_width(number), int(number), int(number)))
+        else:
+            intervals.append((port, '', 0, -1, -1))
+    return merge_port_intervals(intervals)
+
+
+def expand_port_intervals(intervals):
+    """
+    Expands port intervals into port names.
+    :param intervals: The port intervals, as returned by get_port_intervals.
+    :return: The list of port names, in port number order.
+    """
+    ports = []
+    for prefix, suffix, width, start, end in sorted(intervals, key=_get_port_order):
+        if start < 0:
+            ports.append(prefix)
+            continue
+        for number in range(start, end + 1):
+            ports.append('%s%0*d%s' % (prefix, width, number, suffix))
+    return ports
+
+
+def compress_port_intervals(intervals):
+    """
+    Formats port intervals as compact port range expressions.
+    :param intervals: The port intervals, as returned by get_port_intervals.
+    :return: The list of port range expressions, with a single port written as a plain port name.
+    """
+    groups = {}
+    order = []
+    for prefix, suffix, width, start, end in intervals:
+        if (prefix, suffix) not in groups:
+            groups[(prefix, suffix)] = []
+            order.append((prefix, suffix))
+        groups[(prefix, suffix)].append((start, end, width))
+    for key in order:
+        ranges = []
+        for start, end, width in sorted(groups[key], key=lambda number_range: (number_range[0], -number_range[2])):
+            last = ranges[-1] if ranges else None
+            if last and last[2] and not width and last[1] + 1 == start:
+                # Join padded and unpadded intervals, port[01:09] and port[10:16] are written port[01:16]
+                ranges[-1] = (last[0], end, last[2])
+            else:
+                ranges.append((start, end, width))
+        groups[key] = ranges
+
+    expressions = []
+    for prefix, suffix in order:
+        ranges = groups[(prefix, suffix)]
+        if ranges[0][0] < 0 or (len(ranges) == 1 and ranges[0][0] == ranges[0][1]):
+            expressions.extend(expand_port_intervals([(prefix, suffix, width, start, end)
+                                                      for start, end, width in ranges]))
+            continue
+        formatted = []
+        for start, end, width in ranges:
+            if start == end:
+                formatted.append('%0*d' % (width, start))
+            else:
+                formatted.append('%0*d:%0*d' % (width, start, width, end))
+        expressions.append('%s[%s]%s' % (prefix, ','.join(formatted), suffix))
+    return expressions
+
+
+def _get_port_key(port_id):
+    match = PORT_NAME_RE.match(port_id)
+    if match:
+        prefix, number, suffix = match.groups()
+        return prefix, int(number), suffix
+    return port_id, None, None
+
+
+def select_port_ids(selectors, port_ids):
+    """
+    Selects ports by id, range expression (ports-[1:16,20]) or glob pattern (ports-*). The port numbers are compared
+    by value, so that ports-[01:03] and ports-01 select ports-1.
+    :param selectors: The port selectors.
+    :param port_ids: The ids of the ports of the device.
+    :return: The ids of the selected ports, in the order of port_ids.
+    :raises ValueError: If a range expression is not valid.
+    """
+    selected = set()
+    for selector in selectors:
+        if PORT_RANGE_RE.match(selector):
+            selected.update(_get_port_key(port_id) for port_id in expand_port_intervals(get_port_intervals([selector])))
+        elif any(char in selector for char in '*?['):
+            selected.update(_get_port_key(port_id) for port_id in port_ids if fnmatchcase(port_id, selector))
+        else:
+            selected.add(_get_port_key(selector))
+    return [port_id for port_id in port_ids if _get_port_key(port_id) in selected]
+
+
+def get_instances(connection, path, key):
+    """
+    Yields the instances of a list endpoint. When the page_size option of the httpapi plugin is set, the instances are
+    requested a page at a time with the offset and limit query parameters, and each page is yielded before the next
+    one is requested.
+    :param connection: The device connection.
+    :param path: The path of the list endpoint (users, groups, etc).
+    :param key: The key of the list in the response.
+    :return: A generator of the instances.
+    """
+    try:
+        page_size = connection.get_page_size()
+    except ConnectionError:
+        page_size = None
+    if not page_size:
+        for instance in connection.get(None, path)[key]:
+            yield instance
+        return
+
+    offset = 0
+    first_id = None
+    while True:
+        instances = connection.get(None, '%s?offset=%d&limit=%d' % (path, offset, page_size))[key]
+        if not instances:
+            return
+        if offset and instances[0].get('id') == first_id:
+            # The device ignores the paging parameters, and already returned the whole list with the first page
+            return
+        if not offset:
+            first_id = instances[0].get('id')
+        for instance in instances:
+            yield instance
+        if len(instances) != page_size:
+            return
+        offset += page_size
+
+
+def validate_config(spec, data, module=None):
+    """
+    Validates data against an argument spec. Unlike the validate_config of netcommon, no AnsibleModule is built,
+    so the facts classes can also validate the configuration of devices from the controller, in an action plugin.
+    :param spec: The argument spec.
+    :param data: The data to validate.
+    :param module: The module failed when the data is not valid. Without a module, a ValueError is raised.
+    :return: The validated data.
+    """
+    result = ArgumentSpecValidator(spec).validate(data)
+    if result.error_messages:
+        if module:
+            module.fail_json(msg=', '.join(result.error_messages))
+        raise ValueError(', '.join(result.error_messages))
+    return result.validated_parameters
+
+
+def get_status(response):
+    """
+    Finds the status in a response of the device, which may be wrapped in single key objects.
+    :param response: The response.
+    :return: The status, or None if the response does not hold a status.
+    """
+    while isinstance(response, dict):
+        if 'status' in response:
+            return response['status']
+        if len(response) != 1:
+            return None
+        response = list(response.values())[0]
+    return None
+
+
+def add_request_stats(connection, result):
+    """
+    Adds the statistics of the requests sent to the device for the task to a module result, as request_stats, when
+    the collect_stats option of the connection is set.
+    :param connection: The device connection, None when the module did not connect to the device.
+    :param result: The module result, updated in place.
+    """
+    if not connection:
+        return
+    try:
+        stats = connection.get_stats()
+    except ConnectionError:
+        return
+    if isinstance(stats, dict):
+        result['request_stats'] = stats
+
+
+def coalesce_commands(commands):
+    """
+    Combines the commands addressing the same instance, so that each instance is changed by a single request.
+    Successive PUTs are merged, with the later values taking precedence, and a DELETE supersedes any earlier PUT.
+    :param commands: A list of commands, as produced by the command builder.
+    :return: The coalesced commands, in the order of the first command addressing each instance.
+    """
+    coalesced = []
+    positions = {}
+    for command in commands:
+        path = command['path'].rstrip('/')
+        if command['method'] == 'POST' or path not in positions:
+            if command['method'] != 'POST':
+                positions[path] = len(coalesced)
+            coalesced.append(deepcopy(command))
+            continue
+        previous = coalesced[positions[path]]
+        if previous['method'] == 'PUT' and command['method'] == 'PUT':
+            for key, value in command['data'].items():
+                if isinstance(value, dict) and isinstance(previous['data'].get(key), dict):
+                    previous['data'][key].update(deepcopy(value))
+                else:
+                    previous['data'][key] = deepcopy(value)
+        else:
+            coalesced[positions[path]] = deepcopy(command)
+    return coalesced
+
+
+def batch_network_commands(commands, management_paths=None):
+    """
+    Orders network configuration commands into batches, the device being checked between two batches. Instances
+    are removed first, freeing the resources they use, then created, then updated. The changes to the
+    instances carrying the management connection come last, so that the rest of the change set is applied even if
+    they disrupt the connection.
+    :param commands: A list of commands, as produced by the command builder.
+    :param management_paths: The paths of the instances carrying the management connection.
+    :return: A list of non-empty batches of commands.
+    """
+    management_paths = set(path.rstrip('/') for path in management_paths or [])
+    batches = {'DELETE': [], 'POST': [], 'PUT': [], 'management': []}
+    for command in coalesce_commands(commands):
+        if command['path'].rstrip('/') in management_paths:
+            batches['management'].append(command)
+        else:
+            batches[command['method']].append(command)
+    return [batches[key] for key in ('DELETE', 'POST', 'PUT', 'management') if batches[key]]
+
+
+def get_management_conns(conns, host):
+    """
+    Finds the network connections carrying the management connection, by their static address.
+    :param conns: The network connections, as returned by the conns facts.
+    :param host: The address or name the device is managed through.
+    :return: The network connections whose static address is the management address.
+    """
+    addresses = set([host])
+    try:
+        addresses.add(socket.gethostbyname(host))
+    except (socket.error, UnicodeError):
+        pass
+    management_conns = []
+    for conn in conns:
+        for setting in ('ipv4_static_settings', 'ipv6_static_settings'):
+            address = (conn.get(setting) or {}).get('address')
+            if address and address.split('/')[0] in addresses:
+                management_conns.append(conn)
+                break
+    return management_conns
+
+
+def send_command_batches(connection, batches, settle_time, timeout):
+    """
+    Sends batches of commands to the device, one command at a time. After each batch, waits for the device to settle,
+    then probes it until it is ready again before sending the next batch. The probes do not count as failures of the
+    circuit breaker of the device.
+    :param connection: The device connection.
+    :param batches: The batches of commands, as produced by batch_network_commands.
+    :param settle_time: The number of seconds to wait after each batch.
+    :param timeout: The number of seconds after which the device is considered unreachable.
+    :raises ConnectionError: If a command fails, or the device is not ready after a batch.
+    """
+    for number, batch in enumerate(batches, 1):
+        for command in batch:
+            try:
+                connection.send_request(command['data'], command['path'], command['method'])
+            except ConnectionError as exc:
+                if not exc.args[0].startswith('Expecting value:'):
+                    raise exc
+        if settle_time:
+            time.sleep(settle_time)
+        if not wait_until_ready(connection, time.time() + timeout, HEALTH_CHECK_PROBE_TIMEOUT,
+                                HEALTH_CHECK_INTERVAL, HEALTH_CHECK_INTERVAL):
+            raise ConnectionError('the device was not ready within %d seconds of applying batch %d of %d'
+                                  % (timeout, number, len(batches)))
+
+
+def wait_until_ready(connection, deadline, probe_timeout, interval, max_interval):
+    """
+    Probes the device with a new session and an increasing interval until it answers on system/version, for example
+    after it restarted.
+    :param connection: The device connection.
+    :param deadline: The time after which the device is no longer waited for.
+    :param probe_timeout: The timeout in seconds of each request of a probe.
+    :param interval: The initial number of seconds between probes, increased by half after every probe.
+    :param max_interval: The maximum number of seconds between probes.
+    :return: True once the device is ready, False if it was not ready by the deadline.
+    """
+    while not connection.probe(probe_timeout):
+        if time.time() >= deadline:
+            return False
+        time.sleep(max(min(interval, deadline - time.time()), 0))
+        interval = min(interval * 1.5, max_interval)
+    return True
+
+
+def get_file_checksum(path, algorithm='sha256', block_size=1024 * 1024, decompress=False):
+    """
+    Computes the checksum of a file, reading it a block at a time.
+    :param path: The path of the file.
+    :param algorithm: The name of a hashlib algorithm.
+    :param block_size: The number of bytes read at a time.
+    :param decompress: Whether the file is gzip compressed and the checksum is computed on its content.
+    :return: The hexadecimal digest of the file.
+    """
+    digest = hashlib.new(algorithm)
+    with (gzip.open(path, 'rb') if decompress else open(path, 'rb')) as file_handle:
+        for block in iter(lambda: file_handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StageProfiler(object):
+    """
+    Profiles the stages of a module run with cProfile and tracemalloc. Each stage writes a cProfile stats file,
+    readable with pstats or snakeviz, and a text file with its peak memory and the lines allocating the most memory.
+    """
+
+    TOP_ALLOCATIONS = 25
+
+    def __init__(self, directory, get_prefix):
+        """
+        :param directory: The directory the stats files are written to, profiling being disabled when empty.
+        :param get_prefix: A function returning the prefix of the stats file names, called once stats are written.
+        """
+        self.directory = directory
+        self._get_prefix = get_prefix
+        self._prefix = None
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        if not self.directory:
+            yield
+            return
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        started = time.time()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.time() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.write(name, profiler, elapsed, peak, snapshot)
+
+    def write(self, name, profiler, elapsed, peak, snapshot):
+        if self._prefix is None:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            self._prefix = os.path.join(self.directory, self._get_prefix())
+        profile_file = '%s-%s.prof' % (self._prefix, name)
+        memory_file = '%s-%s.mem' % (self._prefix, name)
+        profiler.dump_stats(profile_file)
+        with open(memory_file, 'w') as file_handle:
+            file_handle.write('%s: %.3f seconds, %d bytes peak memory\n' % (name, elapsed, peak))
+            for statistic in snapshot.statistics('lineno')[:self.TOP_ALLOCATIONS]:
+                file_handle.write('%s\n' % statistic)
+        self.stages[name] = {'seconds': round(elapsed, 3), 'peak_memory': peak, 'files': [profile_file, memory_file]}
+
+
+def get_fingerprint(facts):
+    """
+    Computes a stable fingerprint of a facts structure, used to detect whether the device configuration changed
+    between planning and applying a set of commands.
+    :param facts: The facts (as returned by the facts classes) to fingerprint.
+    :return: A hex encoded sha256 digest of the canonical JSON form of the facts.
+    """
+    canonical = json.dumps(facts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def find_secrets(data, keys):
+    """
+    Finds the keys holding a value that must not be stored, such as a clear text password, in commands or facts.
+    :param data: The commands or facts, as nested dictionaries and lists.
+    :param keys: The keys whose values must not be stored.
+    :return: The sorted keys holding a value.
+    """
+    found = set()
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in keys and value:
+                found.add(key)
+            else:
+                found.update(find_secrets(value, keys))
+    elif isinstance(data, list):
+        for item in data:
+            found.update(find_secrets(item, keys))
+    return sorted(found)
+
+
+def write_plan(plan_file, resource, state, fingerprint, commands):
+    """
+    Writes the commands generated for a resource to a plan file, along with the fingerprint of the configuration
+    the commands were generated against.
+    :param plan_file: The path of the plan file.
+    :param resource: The resource name (users, groups, etc).
+    :param state: The state used to generate the commands.
+    :param fingerprint: The fingerprint of the facts the commands were generated against.
+    :param commands: The generated commands.
+    :return: The plan that was written.
+    """
+    plan = {
+        'resource': resource,
+        'state': state,
+        'fingerprint': fingerprint,
+        'commands': commands,
+    }
+    plan_dir = os.path.dirname(os.path.abspath(plan_file))
+    fd, tmp_path = tempfile.mkstemp(dir=plan_dir, prefix='.om_plan')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(plan, f, indent=2, sort_keys=True)
+        os.rename(tmp_path, plan_file)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    return plan
+
+
+def read_plan(plan_file, resource, state, fingerprint):
+    """
+    Reads the commands from a plan file, ensuring the plan was created for the same resource and state, and that the
+    current configuration still matches the one the plan was generated against.
+    :param plan_file: The path of the plan file.
+    :param resource: The resource name (users, groups, etc).
+    :param state: The state the module is being run with.
+    :param fingerprint: The fingerprint of the current facts of the resource.
+    :return: The commands of the plan.
+    :raises ValueError: If the plan does not apply to the current configuration.
+    """
+    with open(plan_file) as f:
+        plan = json.load(f)
+    if plan.get('resource') != resource or plan.get('state') != state:
+        raise ValueError('plan file %s was created for %s state %s, not %s state %s'
+                         % (plan_file, plan.get('resource'), plan.get('state'), resource, state))
+    if plan.get('fingerprint') != fingerprint:
+        raise ValueError('the %s configuration of the device has changed since plan file %s was created'
+                         % (resource, plan_file))
+    return plan['commands']
+
+
+def _is_object_list(value):
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) and 'id' in item for item in value)
+
+
+def _diff_objects(before, after, counts):
+    """
+    Records the changes between two versions of an object (or of a resource configured as a single object). Lists of
+    objects with an id are compared object by object, nested objects key by key.
+    """
+    changes = {}
+    for key in sorted(set(before) | set(after)):
+        old, new = before.get(key), after.get(key)
+        if old == new:
+            continue
+        if (_is_object_list(old) or not old) and (_is_object_list(new) or not new) and (old or new):
+            changes[key] = _diff_object_lists(old or [], new or [], counts)
+        elif isinstance(old, dict) and isinstance(new, dict):
+            changes[key] = _diff_objects(old, new, counts)
+        else:
+            changes[key] = {'before': old, 'after': new}
+    return changes
+
+
+def _diff_object_lists(before, after, counts):
+    old_objects = dict((obj['id'], obj) for obj in before)
+    new_objects = dict((obj['id'], obj) for obj in after)
+    changes = {'added': [], 'removed': [], 'modified': {}}
+    for obj_id, obj in new_objects.items():
+        if obj_id not in old_objects:
+            changes['added'].append(obj)
+        elif obj != old_objects[obj_id]:
+            changes['modified'][obj_id] = _diff_objects(old_objects[obj_id], obj, {})
+        else:
+            counts['unchanged'] += 1
+    changes['removed'] = [obj_id for obj_id in old_objects if obj_id not in new_objects]
+    counts['added'] += len(changes['added'])
+    counts['removed'] += len(changes['removed'])
+    counts['modified'] += len(changes['modified'])
+    return dict((key, value) for key, value in changes.items() if value)
+
+
+def get_facts_changes(before, after):
+    """
+    Computes the per object changes between the facts of a resource before and after the module ran.
+    :param before: The facts before the commands were sent.
+    :param after: The facts after the commands were sent.
+    :return: A tuple of the changes and of the number of added, removed, modified and unchanged objects. A resource
+             configured as a single object counts as one object, modified when any of its settings changed.
+    """
+    counts = {'added': 0, 'removed': 0, 'modified': 0, 'unchanged': 0}
+    if isinstance(before, list) or isinstance(after, list):
+        changes = _diff_object_lists(before or [], after or [], counts)
+    else:
+        changes = _diff_objects(before or {}, after or {}, counts)
+        if not any(_is_object_list(value) for value in list((before or {}).values()) + list((after or {}).values())):
+            counts['modified' if changes else 'unchanged'] += 1
+    return changes, counts
+
+
+def _repeat_to_length(data, length):
+    return (data * (length // len(data) + 1))[:length]
+
+
+def sha_crypt(password, setting):
+    """
+    Computes a SHA-256 or SHA-512 crypt hash, as stored by the device for user passwords.
+    :param password: The plain text password.
+    :param setting: An existing hash, or the leading part of one, providing the method, rounds and salt
+     ($5$salt, $6$rounds=10000$salt$...).
+    :return: The hash of the password, in crypt format.
+    :raises ValueError: If the setting is not a SHA-256 or SHA-512 crypt setting.
+    """
+    fields = setting.split('$')
+    if len(fields) < 3 or fields[0] or fields[1] not in SHA_CRYPT_METHODS:
+        raise ValueError('unsupported password hash method')
+    digest, order = SHA_CRYPT_METHODS[fields[1]]
+    rounds = None
+    salt = fields[2]
+    if salt.startswith('rounds='):
+        rounds = min(max(int(salt[len('rounds='):]), 1000), 999999999)
+        salt = fields[3] if len(fields) > 3 else ''
+    salt = salt[:16].encode('utf-8')
+    key = password.encode('utf-8')
+
+    b = digest(key + salt + key).digest()
+    a = digest(key + salt + _repeat_to_length(b, len(key)))
+    length = len(key)
+    while length:
+        a.update(b if length & 1 else key)
+        length >>= 1
+    a = a.digest()
+    p = _repeat_to_length(digest(key * len(key)).digest(), len(key))
+    s = _repeat_to_length(digest(salt * (16 + bytearray(a)[0])).digest(), len(salt))
+
+    c = a
+    for i in range(rounds or 5000):
+        ctx = digest(p if i & 1 else c)
+        if i % 3:
+            ctx.update(s)
+        if i % 7:
+            ctx.update(p)
+        ctx.update(c if i & 1 else p)
+        c = ctx.digest()
+
+    c = bytearray(c)
+    encoded = []
+    for indexes in order:
+        value = 0
+        count = 0
+        for index in indexes:
+            value = (value << 8) | (c[index] if index is not None else 0)
+            count += 1 if index is not None else 0
+        for dummy in range(count + 1):
+            encoded.append(CRYPT_ALPHABET[value & 0x3f])
+            value >>= 6
+    rounds_setting = 'rounds=%d$' % rounds if rounds else ''
+    return '$%s$%s%s$%s' % (fields[1], rounds_setting, salt.decode('utf-8'), ''.join(encoded))
+
+
+def hash_password(password, method='5'):
+    """
+    Hashes a password with a random salt, so that the device can be sent a hashed_password instead of a password.
+    :param password: The plain text password.
+    :param method: The crypt method id, 5 for SHA-256 or 6 for SHA-512.
+    :return: The hash of the password, in crypt format.
+    """
+    rand = random.SystemRandom()
+    salt = ''.join(rand.choice(CRYPT_ALPHABET) for dummy in range(16))
+    return sha_crypt(password, '$%s$%s' % (method, salt))
+
+
+def verify_password(password, hashed_password):
+    """
+    Checks a plain text password against a crypt hash.
+    :param password: The plain text password.
+    :param hashed_password: The crypt hash, as returned by the device.
+    :return: True if the password matches the hash, False if it doesn't or the hash method is not supported.
+    """
+    if not password or not hashed_password:
+        return False
+    try:
+        return sha_crypt(password, hashed_password) == hashed_password
+    except ValueError:
+        return False
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'opengear'}
+
+
+DOCUMENTATION = """
+---
+module: om_backup
+version_added: "1.1.0"
+short_description: Back up the configuration of an om device to the controller.
+description:
+  - Backs up the full configuration of a device running the om operating system, as returned by its configuration
+    export endpoint, to a file on the controller.
+  - The export is streamed to the file a block at a time and is never held in memory.
+  - The backup files are named C(<prefix>-<UTC timestamp>.json), with a C(.gz) suffix when compressed.
+  - A backup with the same content as the previous backup of the device is not kept, and the module reports no change.
+author:
+  - "Ansible Network Engineer"
+notes:
+  - In check mode the configuration is still exported and downloaded, to a temporary file in I(dest) that is then
+    removed, so that its checksum shows whether a new backup would be kept. No backup is written or removed.
+    Check mode therefore costs the same device load and transfer as a backup.
+options:
+  dest:
+    description:
+      - The directory on the controller the backups are written to. It is created when missing.
+    type: path
+    required: true
+  prefix:
+    description:
+      - The prefix of the backup file names.
+      - The host of the device by default.
+    type: str
+  compress:
+    description:
+      - Whether the backups are gzip compressed.
+    type: bool
+    default: true
+  dedup:
+    description:
+      - Whether a backup with the same content as the previous backup of the device is discarded.
+      - The content is compared by its SHA-256 checksum, before compression, so that compressed and uncompressed
+        backups compare equal.
+    type: bool
+    default: true
+  keep:
+    description:
+      - The number of backups of the device kept in I(dest), the oldest backups being removed.
+      - Set to C(0) to keep all the backups.
+    type: int
+    default: 0
+"""
+EXAMPLES = """
+- name: Back up the configuration of every device, keeping the last 30 distinct backups
+  opengear.om.om_backup:
+    dest: /srv/backups/om
+    prefix: "{{ inventory_hostname }}"
+    keep: 30
+"""
+RETURN = """
+backup_file:
+  description:
+    - The path of the new backup, or of the previous backup when the configuration did not change.
+  returned: unless in check mode with a changed configuration
+  type: str
+  sample: /srv/backups/om/om1-20241105T020000.json.gz
+checksum:
+  description:
+    - The checksum of the configuration export.
+  returned: when the configuration was exported
+  type: str
+  sample: "sha256:3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855b"
+size:
+  description:
+    - The size in bytes of the configuration export, before compression.
+  returned: when the configuration was exported
+  type: int
+  sample: 48213
+removed_backups:
+  description:
+    - The paths of the old backups removed to keep I(keep) backups.
+  returned: unless in check mode
+  type: list
+  sample: ["/srv/backups/om/om1-20240905T020000.json.gz"]
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.backup.backup import BackupArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.backup.backup import Backup
+
+
+def main():
+    """
+    Main entry point for module execution
+
+    :returns: the result form module invocation
+    """
+    module = AnsibleModule(argument_spec=BackupArgs.argument_spec,
+                           supports_check_mode=True)
+
+    result = Backup(module).execute_module()
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
@@ -100,6 +100,68 @@ options:
           dns2:
             type: str
             description: secondary dns server
+  settle_time:
+    description:
+    - The changes are applied in batches, each change being sent on its own. Deleted network connections are
+      removed first, then new ones are created, then the others are updated. The changes to the network connections
+      carrying the management connection are applied last.
+    - The number of seconds to wait after each batch, before checking that the device is ready again with a new
+      session.
+    type: int
+    default: 0
+    version_added: "1.1.0"
+  health_check_timeout:
+    description:
+    - The number of seconds to wait for the device to be ready again after a batch of changes, before failing
+      without applying the remaining batches.
+    - The checks do not count as failures of the circuit breaker of the P(opengear.om.om#httpapi) plugin.
+    type: int
+    default: 120
+    version_added: "1.1.0"
+  plan_mode:
+    description:
+    - When set to C(plan), the commands needed to reach the desired configuration are written to I(plan_file)
+      along with a fingerprint of the current configuration, and nothing is sent to the device. A change is
+      reported when the plan holds commands, and the configuration is not read back.
+    - I(running_config) cannot be used to plan the changes, as the changes to the management connection are
+      ordered last using the address the device is connected to.
+    - When set to C(apply), the commands are read from I(plan_file) and sent to the device, provided the current
+      configuration still matches the fingerprint recorded in the plan.
+    - Only used with the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    type: str
+    choices:
+    - plan
+    - apply
+    version_added: "1.1.0"
+  plan_file:
+    description:
+    - The path of the plan file written or read when I(plan_mode) is set.
+    type: path
+    version_added: "1.1.0"
+  result_format:
+    description:
+    - How the configuration change is reported by the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    - C(full) returns the whole configuration before and after the change, along with the commands sent.
+    - C(diff) returns the commands sent, the objects added, removed and modified, with the before and after values
+      of the modified settings only, in I(changes), and the number of objects changed in I(counts).
+    - C(summary) returns only the number of objects and commands in I(counts).
+    - In check mode and when I(plan_mode=plan), the configuration is not read back after the change, so
+      I(changes) is left out and I(counts) only holds the number of commands.
+    type: str
+    choices:
+    - full
+    - diff
+    - summary
+    default: full
+    version_added: "1.1.0"
+  running_config:
+    description:
+    - The configuration parsed by the C(parsed) state, as the JSON the facts of the resource read from the device
+      REST API. No connection to a device is made.
+    - A list of the objects of the resource, or an object holding the settings of the resource when it is configured
+      as a single object.
+    type: str
+    version_added: "1.1.0"
   state:
     description:
     - The state of the configuration after module completion.
@@ -111,6 +173,7 @@ options:
     - deleted
     - gathered
     - rendered
+    - parsed
     default: merged
 """
 
@@ -127,6 +190,8 @@ def main():
     :returns: the result form module invocation
     """
     module = AnsibleModule(argument_spec=ConnsArgs.argument_spec,
+                           required_by={'plan_mode': 'plan_file'},
+                           required_if=[('state', 'parsed', ('running_config',))],
                            supports_check_mode=True)
 
     result = Conns(module).execute_module()
@@ -39,8 +39,12 @@ options:
 
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.ansible.netcommon.plugins.module_utils.network.common.network import (
+    get_resource_connection,
+)
 from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.facts.facts import FactsArgs
 from ansible_collections.opengear.om.plugins.module_utils.network.om.facts.facts import Facts
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import add_request_stats
 
 
 def main():
@@ -59,7 +63,9 @@ def main():
     ansible_facts, additional_warnings = result
     warnings.extend(additional_warnings)
 
-    module.exit_json(ansible_facts=ansible_facts, warnings=warnings)
+    result = {'ansible_facts': ansible_facts, 'warnings': warnings}
+    add_request_stats(get_resource_connection(module), result)
+    module.exit_json(**result)
 
 
 if __name__ == '__main__':
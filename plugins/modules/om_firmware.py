@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'opengear'}
+
+
+DOCUMENTATION = """
+---
+module: om_firmware
+version_added: "1.1.0"
+short_description: Upgrade the firmware of an om device.
+description:
+  - Upgrades the firmware of a device running the om operating system, and waits for the device to be ready again
+    with the new firmware.
+  - The device either fetches the image itself from I(firmware_url), which keeps the image off the connection to the
+    controller and is preferred when upgrading many devices, or the image is uploaded from the controller.
+  - An uploaded image is streamed from disk, after its checksum was verified. A failed upload is restarted from the
+    beginning, the device not accepting partial images.
+  - The number of devices upgraded at a time is bounded with the C(serial) and C(max_fail_percentage) keywords of
+    the play, see the C(firmware_upgrade.yaml) playbook of the collection.
+author:
+  - "Ansible Network Engineer"
+notes:
+  - An upload has to complete within the command timeout of the persistent connection, which is raised with the
+    C(ansible_command_timeout) variable.
+options:
+  src:
+    description:
+      - The path of the firmware image on the controller, uploaded to the device.
+      - Mutually exclusive with I(firmware_url).
+    type: path
+  firmware_url:
+    description:
+      - The URL the device fetches the firmware image from.
+      - Mutually exclusive with I(src).
+    type: str
+  checksum:
+    description:
+      - The expected checksum of the image given by I(src), as C(digest) or C(algorithm:digest). The algorithm is
+        C(sha256) by default.
+      - The module fails without contacting the device further when the image does not match.
+    type: str
+  version:
+    description:
+      - The firmware version the image installs.
+      - A device already running this version is left alone, and the module fails if the device runs another version
+        after the upgrade.
+      - Without it, the image is installed on every run.
+    type: str
+  firmware_options:
+    description:
+      - The options passed to the upgrade command of the device.
+    type: str
+  upload_retries:
+    description:
+      - The number of times a failed upload is restarted.
+      - After a failed upload, the upgrade status of the device is read first, and the image is not uploaded again
+        when the device reports that the upgrade is running. The module fails when the device reports a state it
+        does not know, rather than uploading the image again.
+    type: int
+    default: 3
+  wait:
+    description:
+      - Whether to wait for the device to install the image, restart and be ready again.
+    type: bool
+    default: true
+  timeout:
+    description:
+      - The number of seconds to wait for the device to be ready again, from the start of the upgrade.
+    type: int
+    default: 1800
+"""
+EXAMPLES = """
+- name: Have the device fetch and install the image
+  opengear.om.om_firmware:
+    firmware_url: "http://images.example.com/om/operations_manager-24.11.0.om"
+    version: "24.11.0"
+
+- name: Upload a verified image from the controller
+  opengear.om.om_firmware:
+    src: /srv/images/operations_manager-24.11.0.om
+    checksum: "sha256:9b1d4e5f0c2a7b8e3d6f1a4c7e0b3d6f9a2c5e8b1d4f7a0c3e6b9d2f5a8c1e4b"
+    version: "24.11.0"
+  vars:
+    ansible_command_timeout: 900
+"""
+RETURN = """
+firmware_version:
+  description:
+    - The firmware version running on the device, after the upgrade when it was waited for.
+  returned: always
+  type: str
+  sample: "24.11.0"
+previous_firmware_version:
+  description:
+    - The firmware version running on the device before the upgrade.
+  returned: when the upgrade was waited for
+  type: str
+  sample: "24.07.0"
+checksum:
+  description:
+    - The checksum of the image given by I(src).
+  returned: when src is given and the device does not run I(version) yet
+  type: str
+  sample: "sha256:9b1d4e5f0c2a7b8e3d6f1a4c7e0b3d6f9a2c5e8b1d4f7a0c3e6b9d2f5a8c1e4b"
+upload_attempts:
+  description:
+    - The number of attempts it took to start the upgrade.
+  returned: when the upgrade was started
+  type: int
+  sample: 1
+time_to_ready:
+  description:
+    - The number of seconds from the start of the upgrade until the device was ready again.
+  returned: when the upgrade was waited for
+  type: float
+  sample: 412.6
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.firmware.firmware import FirmwareArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.firmware.firmware import Firmware
+
+
+def main():
+    """
+    Main entry point for module execution
+
+    :returns: the result form module invocation
+    """
+    module = AnsibleModule(argument_spec=FirmwareArgs.argument_spec,
+                           mutually_exclusive=[['src', 'firmware_url']],
+                           required_one_of=[['src', 'firmware_url']],
+                           supports_check_mode=True)
+
+    result = Firmware(module).execute_module()
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
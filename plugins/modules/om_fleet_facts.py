@@ -0,0 +1,114 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'opengear'}
+
+
+DOCUMENTATION = """
+---
+module: om_fleet_facts
+version_added: "1.1.0"
+short_description: Get resource facts from many om devices at once.
+description:
+  - Collects network resource facts from many devices running the om operating system concurrently, from a
+    single task on the controller.
+  - Unlike M(opengear.om.om_facts) this does not use a worker, a persistent connection or a module execution per
+    device. The requests are blocking HTTP requests sent from a pool of threads on the controller, up to
+    I(max_hosts) devices at a time. The resources of a device are read concurrently, up to its
+    C(ansible_om_max_concurrency) requests at a time (4 by default). Run it once for the whole play, for example
+    with C(run_once=true).
+  - The connection settings of each device are read from its C(ansible_host), C(ansible_httpapi_port),
+    C(ansible_httpapi_use_ssl), C(ansible_httpapi_validate_certs), C(ansible_httpapi_use_proxy),
+    C(ansible_httpapi_ca_path), C(ansible_httpapi_client_cert), C(ansible_httpapi_client_key),
+    C(ansible_httpapi_ciphers), C(ansible_user) and C(ansible_httpapi_password) variables.
+  - When the C(ansible_om_collect_stats) variable of a device is set, the statistics of the requests sent to it are
+    returned in I(fleet_request_stats), for the P(opengear.om.om_stats#callback) callback plugin to report on.
+  - When the circuit breaker is enabled (see the C(circuit_breaker_threshold) option of the
+    P(opengear.om.om#httpapi) plugin), devices whose circuit breaker is open are skipped, and failures to connect
+    are recorded in their circuit breaker.
+author:
+  - "Ansible Network Engineer"
+notes:
+  - This module is implemented as an action plugin and runs on the controller.
+options:
+  hosts:
+    description:
+      - The inventory hostnames of the devices to gather facts from.
+      - Defaults to all the hosts in the current batch of the play.
+      - A host that is not in the inventory is reported in I(failed_hosts).
+    type: list
+    elements: str
+  gather_network_resources:
+    description:
+      - When supplied, this argument will restrict the facts collected to a given subset.
+    type: list
+    elements: str
+    choices: ['all', 'auth', 'conns', 'failover', 'groups', 'pdu', 'physifs', 'ports', 'services',
+              'static_routes', 'system', 'users']
+    default: ['all']
+  max_hosts:
+    description:
+      - The maximum number of devices queried at the same time.
+    type: int
+    default: 100
+  timeout:
+    description:
+      - The timeout in seconds for connecting to a device and for each request.
+    type: float
+    default: 30
+  dest:
+    description:
+      - A directory to write the facts of each device to, as one JSON file named after the inventory hostname.
+      - The files use the format of the C(jsonfile) fact cache, so this can be pointed at the
+        C(fact_caching_connection) directory of a play that uses it.
+    type: path
+"""
+EXAMPLES = """
+- name: Gather the users and groups of every device in the play
+  opengear.om.om_fleet_facts:
+    gather_network_resources:
+      - users
+      - groups
+  run_once: true
+  register: fleet
+
+- name: Gather all facts from a group of devices to a directory
+  opengear.om.om_fleet_facts:
+    hosts: "{{ groups['console_servers'] }}"
+    max_hosts: 200
+    dest: /var/cache/om_facts
+  run_once: true
+"""
+RETURN = """
+om_fleet_facts:
+  description: The facts gathered from each device, keyed by inventory hostname.
+  returned: always
+  type: dict
+  sample: >
+    {"om1": {"ansible_network_resources": {"users": [{"username": "root", "enabled": true}]}}}
+failed_hosts:
+  description: The error for each device facts could not be gathered from, keyed by inventory hostname.
+  returned: always
+  type: dict
+  sample: >
+    {"om2": "Could not connect to 192.168.0.2: timed out"}
+fleet_request_stats:
+  description:
+    - The statistics of the requests sent to each device whose C(ansible_om_collect_stats) variable is set, keyed by
+      inventory hostname, in the form of the C(request_stats) returned by the other modules of the collection.
+  returned: when the statistics of a device are collected
+  type: dict
+  sample: >
+    {"om1": {"requests": 3, "errors": 0, "retries": 0, "cache_hits": 0, "seconds": 0.42, "bytes_sent": 48,
+     "bytes_received": 2210, "endpoints": {"GET users": {"requests": 1, "seconds": 0.2}}}}
+"""
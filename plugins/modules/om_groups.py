@@ -69,8 +69,65 @@ options:
         description: group description
       ports:
         type: list
-        description: ports assigned to group
+        description:
+        - ports assigned to group
+        - Ports may be given as port range expressions, listing port numbers and ranges of port numbers in
+          brackets, for example C(serial/by-opengear-id/port[01:16,20]) for ports 1 to 16 and 20.
         elements: str
+  port_format:
+    description:
+    - How the ports of the groups are written in the I(before), I(after) and I(gathered) results.
+    - C(expanded) lists every port name, C(compact) writes them as port range expressions.
+    type: str
+    choices:
+    - expanded
+    - compact
+    default: expanded
+    version_added: "1.1.0"
+  plan_mode:
+    description:
+    - When set to C(plan), the commands needed to reach the desired configuration are written to I(plan_file)
+      along with a fingerprint of the current configuration, and nothing is sent to the device. A change is
+      reported when the plan holds commands, and the configuration is not read back.
+    - When I(running_config) is set, the commands are planned against it instead of the current configuration,
+      without connecting to the device, for example to plan against a saved configuration.
+    - When set to C(apply), the commands are read from I(plan_file) and sent to the device, provided the current
+      configuration still matches the fingerprint recorded in the plan.
+    - Only used with the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    type: str
+    choices:
+    - plan
+    - apply
+    version_added: "1.1.0"
+  plan_file:
+    description:
+    - The path of the plan file written or read when I(plan_mode) is set.
+    type: path
+    version_added: "1.1.0"
+  result_format:
+    description:
+    - How the configuration change is reported by the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    - C(full) returns the whole configuration before and after the change, along with the commands sent.
+    - C(diff) returns the commands sent, the objects added, removed and modified, with the before and after values
+      of the modified settings only, in I(changes), and the number of objects changed in I(counts).
+    - C(summary) returns only the number of objects and commands in I(counts).
+    - In check mode and when I(plan_mode=plan), the configuration is not read back after the change, so
+      I(changes) is left out and I(counts) only holds the number of commands.
+    type: str
+    choices:
+    - full
+    - diff
+    - summary
+    default: full
+    version_added: "1.1.0"
+  running_config:
+    description:
+    - The configuration parsed by the C(parsed) state, as the JSON the facts of the resource read from the device
+      REST API. No connection to a device is made.
+    - A list of the objects of the resource, or an object holding the settings of the resource when it is configured
+      as a single object.
+    type: str
+    version_added: "1.1.0"
   state:
     description:
     - The state of the configuration after module completion.
@@ -82,6 +139,7 @@ options:
     - deleted
     - gathered
     - rendered
+    - parsed
     default: merged
 """
 
@@ -97,6 +155,8 @@ def main():
     :returns: the result form module invocation
     """
     module = AnsibleModule(argument_spec=GroupsArgs.argument_spec,
+                           required_by={'plan_mode': 'plan_file'},
+                           required_if=[('state', 'parsed', ('running_config',))],
                            supports_check_mode=True)
 
     result = Groups(module).execute_module()
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'opengear'}
+
+
+DOCUMENTATION = """
+---
+module: om_port_sessions
+version_added: "1.1.0"
+short_description: List and terminate the serial port sessions of an om device.
+description:
+  - Lists the active sessions of the serial ports of a device running the om operating system, and terminates the
+    selected sessions.
+  - The sessions of all the ports are listed with a single request.
+  - Sessions are terminated concurrently, with at most I(max_in_flight) requests in flight.
+author:
+  - "Ansible Network Engineer"
+options:
+  ports:
+    description:
+      - Only select the sessions of these ports.
+      - A port may be given by id (C(ports-1)), range expression (C(ports-[1:16,20])) or glob pattern (C(ports-*)).
+    type: list
+    elements: str
+  usernames:
+    description:
+      - Only select the sessions of these users.
+    type: list
+    elements: str
+  client_pids:
+    description:
+      - Only select the sessions with these client process ids.
+    type: list
+    elements: int
+  max_in_flight:
+    description:
+      - The maximum number of sessions being terminated at a time.
+      - The number of requests in flight is also bounded by the C(max_concurrency) option of the
+        P(opengear.om.om#httpapi) plugin.
+    type: int
+    default: 8
+  state:
+    description:
+      - C(gathered) returns the selected sessions.
+      - C(terminated) terminates the selected sessions. The module fails if a session could not be terminated,
+        after attempting to terminate all of them. A session the device reports without a client process id
+        cannot be terminated.
+    type: str
+    choices:
+      - gathered
+      - terminated
+    default: gathered
+"""
+EXAMPLES = """
+- name: List the sessions of the first 16 ports
+  opengear.om.om_port_sessions:
+    ports:
+      - "ports-[1:16]"
+  register: port_sessions
+
+- name: Terminate all the sessions of a user
+  opengear.om.om_port_sessions:
+    usernames:
+      - operator
+    state: terminated
+"""
+RETURN = """
+sessions:
+  description:
+    - The selected sessions.
+    - With C(state=terminated), each session also holds whether it was terminated, and the error returned by the
+      device otherwise.
+  returned: always
+  type: list
+  sample: >
+    [{"port": "ports-1", "label": "router1", "username": "operator", "client_pid": 2045, "terminated": true}]
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.port_sessions.port_sessions import (
+    PortSessionsArgs,
+)
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.port_sessions.port_sessions import (
+    PortSessions,
+)
+
+
+def main():
+    """
+    Main entry point for module execution
+
+    :returns: the result form module invocation
+    """
+    module = AnsibleModule(argument_spec=PortSessionsArgs.argument_spec,
+                           supports_check_mode=True)
+
+    result = PortSessions(module).execute_module()
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
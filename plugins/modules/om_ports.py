@@ -53,8 +53,35 @@ options:
         description: ports
         suboptions:
           id:
-            description: The ID of the serial port. This ID can be used to fetch individual ports using the /ports/endpoint.
+            description:
+              - The ID of the serial port. This ID can be used to fetch individual ports using the /ports/endpoint.
+              - A range expression such as C(ports-[1:16,20]) or a glob pattern such as C(ports-*) selects all the
+                matching ports of the device, which are then configured with the values of this entry.
+              - With the C(rendered) state the ports of the device are not known, a range expression selects the
+                ports it names and the glob patterns are not supported.
             type: str
+          filter:
+            description:
+              - Selects the ports of the device to configure with the values of this entry, by matching glob
+                patterns against their current configuration. A pattern starting with C(!) excludes the ports it
+                matches.
+              - Used together with I(id) it narrows down the ports selected by I(id), on its own it selects from
+                all the ports of the device.
+              - A port selected by several entries is configured with the values of all of them, the later entries
+                taking precedence.
+              - Not supported with the C(rendered) state.
+            type: dict
+            version_added: "1.1.0"
+            suboptions:
+              mode:
+                description: A pattern matching the mode of the ports.
+                type: str
+              pinout:
+                description: A pattern matching the pinout of the ports.
+                type: str
+              label:
+                description: A pattern matching the label of the ports.
+                type: str
           parity:
             description: The format of the parity byte.
             type: str
@@ -146,6 +173,64 @@ options:
           start:
             description: Triggers the port Auto-Discovery process if start value is true.
             type: bool
+          wait:
+            description:
+              - When the Auto-Discovery process is started, wait for it to complete, polling its status with an
+                increasing interval, and return the ports whose label it changed in I(discovered_ports).
+              - The process is polled until it reports a C(completed), C(complete) or C(finished) status, and the
+                module fails when it reports a C(failed) or C(error) status. While it reports any other status, it is
+                polled until I(wait_timeout).
+            type: bool
+            version_added: "1.1.0"
+          wait_timeout:
+            description:
+              - The number of seconds to wait for the Auto-Discovery process to complete, 300 when not set.
+            type: int
+            version_added: "1.1.0"
+  plan_mode:
+    description:
+    - When set to C(plan), the commands needed to reach the desired configuration are written to I(plan_file)
+      along with a fingerprint of the current configuration, and nothing is sent to the device. A change is
+      reported when the plan holds commands, and the configuration is not read back.
+    - When I(running_config) is set, the commands are planned against it instead of the current configuration,
+      without connecting to the device, for example to plan against a saved configuration.
+    - When set to C(apply), the commands are read from I(plan_file) and sent to the device, provided the current
+      configuration still matches the fingerprint recorded in the plan.
+    - Only used with the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    type: str
+    choices:
+    - plan
+    - apply
+    version_added: "1.1.0"
+  plan_file:
+    description:
+    - The path of the plan file written or read when I(plan_mode) is set.
+    type: path
+    version_added: "1.1.0"
+  result_format:
+    description:
+    - How the configuration change is reported by the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    - C(full) returns the whole configuration before and after the change, along with the commands sent.
+    - C(diff) returns the commands sent, the objects added, removed and modified, with the before and after values
+      of the modified settings only, in I(changes), and the number of objects changed in I(counts).
+    - C(summary) returns only the number of objects and commands in I(counts).
+    - In check mode and when I(plan_mode=plan), the configuration is not read back after the change, so
+      I(changes) is left out and I(counts) only holds the number of commands.
+    type: str
+    choices:
+    - full
+    - diff
+    - summary
+    default: full
+    version_added: "1.1.0"
+  running_config:
+    description:
+    - The configuration parsed by the C(parsed) state, as the JSON the facts of the resource read from the device
+      REST API. No connection to a device is made.
+    - A list of the objects of the resource, or an object holding the settings of the resource when it is configured
+      as a single object.
+    type: str
+    version_added: "1.1.0"
   state:
     description:
     - The state of the configuration after module completion.
@@ -157,6 +242,7 @@ options:
     - deleted
     - gathered
     - rendered
+    - parsed
     default: merged
 """
 
@@ -172,6 +258,8 @@ def main():
     :returns: the result form module invocation
     """
     module = AnsibleModule(argument_spec=PortsArgs.argument_spec,
+                           required_by={'plan_mode': 'plan_file'},
+                           required_if=[('state', 'parsed', ('running_config',))],
                            supports_check_mode=True)
 
     result = Ports(module).execute_module()
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'opengear'}
+
+
+DOCUMENTATION = """
+---
+module: om_power
+version_added: "1.1.0"
+short_description: Switch the power of the ports and PDU outlets of an om device.
+description:
+  - Powers on, off or cycles the devices connected to the serial ports and to the PDU outlets of a device running
+    the om operating system.
+  - The power actions are sent concurrently, or one at a time starting at least I(stagger) seconds apart to limit
+    the inrush current, and the targets are then polled until they report the requested state.
+  - Targets already in the requested state are left alone, except when cycling.
+author:
+  - "Ansible Network Engineer"
+notes:
+  - The I(stagger) delays are waited for by the module, between the requests to the persistent connection, so a
+    long schedule is not bounded by its command timeout. Without I(stagger), the actions are sent I(max_in_flight)
+    at a time, each group having to complete within the command timeout, which is raised with the
+    C(ansible_command_timeout) variable.
+options:
+  ports:
+    description:
+      - The ports to switch the power of.
+      - A port may be given by id (C(ports-1)), range expression (C(ports-[1:16,20])) or glob pattern (C(ports-*)).
+    type: list
+    elements: str
+  outlets:
+    description:
+      - The PDU outlets to switch the power of.
+    type: list
+    elements: dict
+    suboptions:
+      pdu:
+        description:
+          - The id or name of the PDU.
+        type: str
+        required: true
+      outlets:
+        description:
+          - The ids or names of the outlets, glob patterns being allowed.
+          - All the outlets of the PDU by default.
+        type: list
+        elements: str
+  action:
+    description:
+      - The power action. A cycled target is complete once it was seen off, then on again.
+    type: str
+    choices:
+      - "on"
+      - "off"
+      - cycle
+    required: true
+  stagger:
+    description:
+      - The minimum delay in seconds between the start of two power actions.
+      - When set, the actions are sent one at a time, each starting once the previous one completed and its delay
+        elapsed.
+    type: float
+    default: 0
+  max_in_flight:
+    description:
+      - The maximum number of power actions in flight at a time, when I(stagger) is not set.
+      - The number of requests in flight is also bounded by the C(max_concurrency) option of the
+        P(opengear.om.om#httpapi) plugin.
+    type: int
+    default: 8
+  wait:
+    description:
+      - Whether to poll the targets until they report the requested state.
+      - A target whose status cannot be read by I(timeout) fails. A target that does not report its power status
+        is returned with the C(unknown) status and a null I(succeeded), with a warning.
+    type: bool
+    default: true
+  timeout:
+    description:
+      - The number of seconds to wait for the targets to report the requested state, from the start of the first
+        power action.
+    type: int
+    default: 60
+"""
+EXAMPLES = """
+- name: Power cycle the devices of a rack, a second apart
+  opengear.om.om_power:
+    ports:
+      - "ports-[1:40]"
+    action: cycle
+    stagger: 1
+
+- name: Power off two outlets of a PDU
+  opengear.om.om_power:
+    outlets:
+      - pdu: rack1-pdu
+        outlets:
+          - "1"
+          - "2"
+    action: "off"
+"""
+RETURN = """
+targets:
+  description:
+    - The targets the power action was sent to, with the outcome of the action.
+    - I(succeeded) is null for a target that does not report its power status.
+  returned: always
+  type: list
+  sample: >
+    [{"port": "ports-1", "action": "cycle", "status": "on", "succeeded": true, "elapsed": 3.5},
+     {"pdu": "pdus-1", "outlet": "2", "action": "cycle", "succeeded": false, "msg": "Outlet is locked"}]
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.power.power import PowerArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.power.power import Power
+
+
+def main():
+    """
+    Main entry point for module execution
+
+    :returns: the result form module invocation
+    """
+    module = AnsibleModule(argument_spec=PowerArgs.argument_spec,
+                           required_one_of=[['ports', 'outlets']],
+                           supports_check_mode=True)
+
+    result = Power(module).execute_module()
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
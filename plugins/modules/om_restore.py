@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2021 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+ANSIBLE_METADATA = {'metadata_version': '1.0',
+                    'status': ['preview'],
+                    'supported_by': 'opengear'}
+
+
+DOCUMENTATION = """
+---
+module: om_restore
+version_added: "1.1.0"
+short_description: Restore the configuration of an om device from a backup.
+description:
+  - Restores the full configuration of a device running the om operating system from a backup made by
+    M(opengear.om.om_backup), for example to rebuild a replacement device.
+  - The configuration exported by the device is compared to the backup first, and a device already holding the
+    configuration of the backup is left alone.
+  - The backup is imported with a single request, instead of the many requests of the resource modules, then the
+    configuration is exported again and compared to the backup.
+author:
+  - "Ansible Network Engineer"
+options:
+  src:
+    description:
+      - The path of the backup on the controller, gzip compressed or not.
+    type: path
+    required: true
+  verify:
+    description:
+      - Whether the configuration exported after the import is compared to the backup. The module fails when they
+        differ.
+    type: bool
+    default: true
+"""
+EXAMPLES = """
+- name: Rebuild a replacement device from the last backup of the device it replaces
+  opengear.om.om_restore:
+    src: /srv/backups/om/om1-20241105T020000.json.gz
+"""
+RETURN = """
+changes:
+  description:
+    - The changes the import makes to the configuration of the device, objects with an id being compared one by one.
+  returned: always
+  type: dict
+  sample: >
+    {"users": {"modified": {"users-2": {"enabled": {"before": false, "after": true}}}}}
+counts:
+  description:
+    - The number of objects the import adds, removes, modifies and leaves unchanged.
+  returned: always
+  type: dict
+  sample: {"added": 0, "removed": 0, "modified": 1, "unchanged": 12}
+differences:
+  description:
+    - The differences remaining between the backup and the configuration exported after the import.
+  returned: when the verification fails
+  type: dict
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.opengear.om.plugins.module_utils.network.om.argspec.restore.restore import RestoreArgs
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.restore.restore import Restore
+
+
+def main():
+    """
+    Main entry point for module execution
+
+    :returns: the result form module invocation
+    """
+    module = AnsibleModule(argument_spec=RestoreArgs.argument_spec,
+                           supports_check_mode=True)
+
+    result = Restore(module).execute_module()
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
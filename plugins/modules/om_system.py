@@ -69,7 +69,10 @@ options:
       type: int
       description: Update the CLI session timeout (in minutes)
     system_authorized_keys:
-      description: Add an SSH key for the specified user
+      description:
+        - Add an SSH key for the specified user
+        - Keys are identified by their user and SHA256 fingerprint, so only the keys missing from the device are
+          added and, with the C(overridden) state, only the keys not listed are removed.
       elements: dict
       suboptions:
         id:
@@ -78,6 +81,16 @@ options:
         key:
           type: str
           description: The SSH key
+        key_fingerprint:
+          type: str
+          description:
+            - The SHA256 fingerprint of the SSH key, as displayed by C(ssh-keygen -l), for example
+              C(SHA256:nThbg6kXUpJWGl7E1IGOCspRomTxdCARLviKw6E5SY8).
+            - May be used instead of I(key) to identify a key to be deleted, or a key to be kept with the
+              C(overridden) state.
+            - When I(key) is also set, the fingerprint computed from I(key) is used instead.
+            - The fingerprint is never sent to the device, it is only used to match the keys of the device.
+          version_added: "1.1.0"
         username:
           type: str
           description: The user associated with the SSH key
@@ -117,6 +130,68 @@ options:
     reboot:
       type: bool
       description: reboot
+  plan_mode:
+    description:
+    - When set to C(plan), the commands needed to reach the desired configuration are written to I(plan_file)
+      along with a fingerprint of the current configuration, and nothing is sent to the device. A change is
+      reported when the plan holds commands, and the configuration is not read back.
+    - When I(running_config) is set, the commands are planned against it instead of the current configuration,
+      without connecting to the device, for example to plan against a saved configuration.
+    - When set to C(apply), the commands are read from I(plan_file) and sent to the device, provided the current
+      configuration still matches the fingerprint recorded in the plan.
+    - Only used with the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    type: str
+    choices:
+    - plan
+    - apply
+    version_added: "1.1.0"
+  plan_file:
+    description:
+    - The path of the plan file written or read when I(plan_mode) is set.
+    type: path
+    version_added: "1.1.0"
+  wait_for_reboot:
+    description:
+    - When the configuration requests a reboot, wait for the device to go down and to be ready again, and return
+      the number of seconds it took in I(time_to_ready).
+    - Readiness is probed with an increasing interval by opening a new session and reading C(system/version). The
+      new session is used for the rest of the task.
+    - A device that is not seen going down within a minute, for example because it restarted between two probes,
+      is waited for until it is ready, and its C(system/uptime) then shows whether it restarted since the reboot was
+      requested.
+    type: bool
+    default: false
+    version_added: "1.1.0"
+  reboot_timeout:
+    description:
+    - The number of seconds to wait for the device to be ready again after a reboot, when I(wait_for_reboot) is set.
+    type: int
+    default: 600
+    version_added: "1.1.0"
+  result_format:
+    description:
+    - How the configuration change is reported by the C(merged), C(replaced), C(overridden) and C(deleted) states.
+    - C(full) returns the whole configuration before and after the change, along with the commands sent.
+    - C(diff) returns the commands sent, the objects added, removed and modified, with the before and after values
+      of the modified settings only, in I(changes), and the number of objects changed in I(counts).
+    - C(summary) returns only the number of objects and commands in I(counts).
+    - In check mode and when I(plan_mode=plan), the configuration is not read back after the change, so
+      I(changes) is left out and I(counts) only holds the number of commands.
+    type: str
+    choices:
+    - full
+    - diff
+    - summary
+    default: full
+    version_added: "1.1.0"
+  running_config:
+    description:
+    - The configuration parsed by the C(parsed) state, as the JSON the facts of the resource read from the device
+      REST API. No connection to a device is made.
+    - A list of the objects of the resource, or an object holding the settings of the resource when it is configured
+      as a single object.
+    type: str
+    version_added: "1.1.0"
   state:
     description:
     - The state of the configuration after module completion.
@@ -127,8 +202,46 @@ options:
     - deleted
     - gathered
     - rendered
+    - parsed
     default: merged
 """
+RETURN = """
+before:
+  description:
+    - The configuration before the module ran.
+    - Each of the I(system_authorized_keys) holds the I(key_fingerprint) reported by the device.
+  returned: with the C(merged), C(overridden) and C(deleted) states, when I(result_format=full)
+  type: dict
+  sample: >
+    {"hostname": "om1", "system_authorized_keys": [{"id": "system_authorized_keys-1", "username": "root",
+     "key": "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIO... admin@example.com",
+     "key_fingerprint": "SHA256:nThbg6kXUpJWGl7E1IGOCspRomTxdCARLviKw6E5SY8"}]}
+after:
+  description:
+    - The configuration after the module ran, in the same form as I(before).
+  returned: when changed and I(result_format=full), unless in check mode or I(plan_mode=plan)
+  type: dict
+commands:
+  description:
+    - The requests sent to the device. The authorized keys are added and removed with a request per key, without
+      their I(key_fingerprint).
+  returned: with the C(merged), C(overridden) and C(deleted) states, unless I(result_format=summary)
+  type: list
+  sample: >
+    [{"path": "system/system_authorized_keys", "method": "POST",
+      "data": {"system_authorized_key": {"username": "root", "key": "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIO..."}}}]
+gathered:
+  description:
+    - The configuration of the device, in the same form as I(before).
+  returned: when I(state=gathered)
+  type: dict
+time_to_ready:
+  description:
+    - The number of seconds the device took to be ready again after a reboot.
+  returned: when the device was rebooted with I(wait_for_reboot) set
+  type: float
+  sample: 94.5
+"""
 
 
 from ansible.module_utils.basic import AnsibleModule
@@ -143,6 +256,8 @@ def main():
     :returns: the result form module invocation
     """
     module = AnsibleModule(argument_spec=SystemArgs.argument_spec,
+                           required_by={'plan_mode': 'plan_file'},
+                           required_if=[('state', 'parsed', ('running_config',))],
                            supports_check_mode=True)
 
     result = System(module).execute_module()
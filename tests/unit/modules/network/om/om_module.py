@@ -23,16 +23,27 @@ __metaclass__ = type
 import json
 import os
 
+from io import BytesIO
+
+from ansible import constants as C
+from ansible.parsing.yaml.loader import AnsibleLoader
+
+from ansible_collections.opengear.om.plugins.httpapi import om as om_httpapi
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
 from ansible_collections.opengear.om.tests.unit.modules.utils import (
     AnsibleExitJson,
     AnsibleFailJson,
     ModuleTestCase,
 )
 
-
 fixture_path = os.path.join(os.path.dirname(__file__), "fixtures")
 fixture_data = {}
 
+CONNECTION_TARGETS = (
+    "ansible_collections.ansible.netcommon.plugins.module_utils.network.common.cfg.base.get_resource_connection",
+    "ansible_collections.ansible.netcommon.plugins.module_utils.network.common.facts.facts.get_resource_connection",
+)
+
 
 def load_fixture(name):
     path = os.path.join(fixture_path, name)
@@ -51,7 +62,131 @@ def load_fixture(name):
     return data
 
 
+class CassetteDevice(object):
+    """ The connection of the om httpapi plugin while it replays a cassette, failing any request that would reach
+        the device
+    """
+
+    _auth = None
+    _url = "https://om.example.com"
+
+    def __init__(self, options):
+        self._options = options
+
+    def get_option(self, option):
+        return self._options.get(option)
+
+    def send(self, path, data, **kwargs):
+        raise AssertionError("%s was requested from the device while replaying a cassette" % path)
+
+
+class DeviceConnection(object):
+    """ The connection of the om httpapi plugin to a fake device, answering each request with the next response
+        queued for its method and path, the last one being repeated. A response is a status and a body, or an
+        exception raised instead. Like the httpapi connection, it logs in on the first request.
+    """
+
+    _url = "https://om.example.com"
+
+    def __init__(self, responses=None, **options):
+        self._auth = None
+        self._connected = False
+        self.httpapi = None
+        self.requests = []
+        self._responses = dict(responses or {})
+        self._responses.setdefault(("POST", "sessions/"), [(200, {"session": "token"})])
+        self._options = dict({"host": "om.example.com", "remote_user": "root", "password": "default",
+                              "validate_certs": False}, **options)
+
+    def get_option(self, option):
+        return self._options.get(option)
+
+    def send(self, path, data, method="GET", headers=None):
+        if not self._connected:
+            self._connected = True
+            self.httpapi.login(self.get_option("remote_user"), self.get_option("password"))
+        path = path[len(self.httpapi.path):]
+        self.requests.append((method, path))
+        queued = self._responses[(method, path)]
+        response = queued.pop(0) if len(queued) > 1 else queued[0]
+        if isinstance(response, Exception):
+            raise response
+        status, body = response
+        return om_httpapi.CassetteResponse(status), BytesIO(json.dumps(body).encode("utf-8"))
+
+
+class CassetteConnection(object):
+    """ The connection of a module, sending the requests through the om httpapi plugin replaying a cassette
+    """
+
+    def __init__(self, httpapi, device):
+        self._httpapi = httpapi
+        self._device = device
+
+    def get_option(self, option):
+        # Like the httpapi connection, only the options of the connection are read with get_option, the options
+        # of the httpapi plugin are read through its own methods
+        return self._device.get_option(option)
+
+    def __getattr__(self, name):
+        return getattr(self._httpapi, name)
+
+
+def load_httpapi(connection):
+    """ Load the om httpapi plugin for a connection, registering its options as the plugin loader does
+
+    The plugin is loaded from its module rather than through the plugin loader, which does not find the
+    collection when it was imported before the collection loader was set up, as it is by pytest.
+    """
+    name = "opengear.om.om"
+    if not C.config.has_configuration_definition("httpapi", name):
+        doc = AnsibleLoader(om_httpapi.DOCUMENTATION, file_name=om_httpapi.__file__).get_single_data()
+        C.config.initialize_plugin_configuration_definitions("httpapi", name, doc["options"])
+    httpapi = om_httpapi.HttpApi(connection)
+    httpapi._load_name = name
+    connection.httpapi = httpapi
+    return httpapi
+
+
+def load_cassette(name, latency=0, **options):
+    """ Get a connection replaying the exchanges recorded in a cassette of the fixtures directory
+
+    :param name: The name of the cassette file.
+    :param latency: The factor the recorded response times are multiplied by.
+    :param options: Other options of the httpapi plugin.
+    """
+    device = CassetteDevice({"host": "om.example.com", "validate_certs": False})
+    httpapi = load_httpapi(device)
+    httpapi.set_options(direct=dict({
+        "cassette": os.path.join(fixture_path, name),
+        "cassette_latency": latency,
+        "circuit_breaker_threshold": 0,
+    }, **options))
+    return CassetteConnection(httpapi, device)
+
+
 class TestOmModule(ModuleTestCase):
+
+    cassette_patchers = ()
+    # The functions replaced to connect the module to a cassette
+    connection_targets = CONNECTION_TARGETS
+
+    def replay_cassette(self, name, latency=0, **options):
+        """ Answer the requests of the module from a cassette of the fixtures directory, through the om httpapi
+            plugin, instead of mocking the device data
+        """
+        connection = load_cassette(name, latency, **options)
+        self.cassette_patchers = [patch(target, return_value=connection) for target in self.connection_targets]
+        for patcher in self.cassette_patchers:
+            patcher.start()
+        return connection
+
+    def tearDown(self):
+        for patcher in reversed(self.cassette_patchers):
+            patcher.stop()
+        self.cassette_patchers = ()
+        super(TestOmModule, self).tearDown()
+
     def execute_module(
         self,
         failed=False,
@@ -0,0 +1,206 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_backup,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule
+
+EXPORT = b'{"system": {"hostname": "om1"}}'
+
+
+class ExportConnection(object):
+    """ The connection to a device exporting the configuration given, downloaded as the download method of the om
+        httpapi plugin does
+    """
+
+    def __init__(self, export):
+        self.export = export
+        self.downloads = 0
+
+    def get_option(self, option):
+        return "om1.example.com" if option == "host" else None
+
+    def download(self, path, dest_dir, compress=False, algorithm='sha256'):
+        self.downloads += 1
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix='.', suffix='.part')
+        os.close(file_descriptor)
+        with (gzip.open(tmp_path, 'wb') if compress else open(tmp_path, 'wb')) as file_handle:
+            file_handle.write(self.export)
+        return {'path': tmp_path, 'size': len(self.export), 'checksum': hashlib.new(algorithm, self.export).hexdigest()}
+
+    def get_stats(self):
+        return None
+
+
+class TestOmBackupModule(TestOmModule):
+
+    module = om_backup
+
+    def setUp(self):
+        super(TestOmBackupModule, self).setUp()
+
+        self.mock_get_resource_connection = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "config.backup.backup.get_resource_connection"
+        )
+        self.get_resource_connection = self.mock_get_resource_connection.start()
+        self.dest = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestOmBackupModule, self).tearDown()
+        self.mock_get_resource_connection.stop()
+        shutil.rmtree(self.dest)
+
+    def load_device(self, export=EXPORT):
+        self.connection = ExportConnection(export)
+        self.get_resource_connection.return_value = self.connection
+
+    def write_backup(self, name, content, compress=False):
+        path = os.path.join(self.dest, name)
+        with (gzip.open(path, 'wb') if compress else open(path, 'wb')) as file_handle:
+            file_handle.write(content)
+        return path
+
+    def test_om_backup_compressed(self):
+        self.load_device()
+        set_module_args({
+            'dest': self.dest,
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertTrue(result['backup_file'].startswith(os.path.join(self.dest, 'om1.example.com-')))
+        self.assertTrue(result['backup_file'].endswith('.json.gz'))
+        with gzip.open(result['backup_file'], 'rb') as file_handle:
+            self.assertEqual(EXPORT, file_handle.read())
+        self.assertEqual('sha256:' + hashlib.sha256(EXPORT).hexdigest(), result['checksum'])
+        self.assertEqual(len(EXPORT), result['size'])
+        self.assertEqual([os.path.basename(result['backup_file'])], os.listdir(self.dest))
+
+    def test_om_backup_uncompressed(self):
+        self.load_device()
+        set_module_args({
+            'dest': self.dest,
+            'prefix': "om1",
+            'compress': False,
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertRegex(os.path.basename(result['backup_file']), r'^om1-\d{8}T\d{6}\.json$')
+        with open(result['backup_file'], 'rb') as file_handle:
+            self.assertEqual(EXPORT, file_handle.read())
+
+    def test_om_backup_dedup(self):
+        # The previous backup is not compressed, its content is compared before compression
+        previous = self.write_backup('om1-20240101T000000.json', EXPORT)
+        self.load_device()
+        set_module_args({
+            'dest': self.dest,
+            'prefix': "om1",
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual(previous, result['backup_file'])
+        self.assertEqual(['om1-20240101T000000.json'], os.listdir(self.dest))
+
+    def test_om_backup_dedup_changed(self):
+        self.write_backup('om1-20240101T000000.json.gz', EXPORT, compress=True)
+        self.load_device(b'{"system": {"hostname": "om2"}}')
+        set_module_args({
+            'dest': self.dest,
+            'prefix': "om1",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual(2, len(os.listdir(self.dest)))
+        self.assertNotEqual(os.path.join(self.dest, 'om1-20240101T000000.json.gz'), result['backup_file'])
+
+    def test_om_backup_no_dedup(self):
+        self.write_backup('om1-20240101T000000.json.gz', EXPORT, compress=True)
+        self.load_device()
+        set_module_args({
+            'dest': self.dest,
+            'prefix': "om1",
+            'dedup': False,
+        })
+
+        self.execute_module(changed=True)
+        self.assertEqual(2, len(os.listdir(self.dest)))
+
+    def test_om_backup_keep(self):
+        for day in range(1, 4):
+            self.write_backup('om1-2024010%dT000000.json.gz' % day, b'{"day": %d}' % day, compress=True)
+        # The backups of other devices and other files are not removed
+        self.write_backup('om10-20240101T000000.json.gz', EXPORT, compress=True)
+        self.write_backup('om1-notes.txt', b'notes')
+        self.load_device()
+        set_module_args({
+            'dest': self.dest,
+            'prefix': "om1",
+            'keep': 2,
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual([os.path.join(self.dest, 'om1-20240101T000000.json.gz'),
+                          os.path.join(self.dest, 'om1-20240102T000000.json.gz')], result['removed_backups'])
+        self.assertEqual(sorted(['om1-20240103T000000.json.gz', os.path.basename(result['backup_file']),
+                                 'om10-20240101T000000.json.gz', 'om1-notes.txt']), sorted(os.listdir(self.dest)))
+
+    def test_om_backup_check_mode(self):
+        for day in range(1, 4):
+            self.write_backup('om1-2024010%dT000000.json.gz' % day, b'{"day": %d}' % day, compress=True)
+        self.load_device()
+        set_module_args({
+            'dest': self.dest,
+            'prefix': "om1",
+            'keep': 1,
+            '_ansible_check_mode': True,
+        })
+
+        # The export is downloaded to compare it, then removed, and no backup is removed
+        result = self.execute_module(changed=True)
+        self.assertEqual(1, self.connection.downloads)
+        self.assertNotIn('backup_file', result)
+        self.assertNotIn('removed_backups', result)
+        self.assertEqual(3, len(os.listdir(self.dest)))
+
+    def test_om_backup_check_mode_missing_dest(self):
+        dest = os.path.join(self.dest, 'om')
+        self.load_device()
+        set_module_args({
+            'dest': dest,
+            '_ansible_check_mode': True,
+        })
+
+        self.execute_module(changed=True)
+        self.assertFalse(os.path.exists(dest))
+        self.assertEqual(0, self.connection.downloads)
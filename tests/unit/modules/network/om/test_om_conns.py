@@ -0,0 +1,182 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible.module_utils.connection import ConnectionError
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_conns,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class TestOmConnsModule(TestOmModule):
+
+    module = om_conns
+
+    def setUp(self):
+        super(TestOmConnsModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.conns.conns.ConnsFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+        self.mock_sleep = patch("time.sleep")
+        self.sleep = self.mock_sleep.start()
+
+    def tearDown(self):
+        super(TestOmConnsModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+        self.mock_sleep.stop()
+
+    def load_fixtures(self, commands=None, filename="om_conns_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+
+    def load_device(self, probes):
+        """ A device managed through 192.168.0.1, whose readiness probes return the results given, the last one
+            being repeated
+        """
+        connection = self.get_resource_connection_config.return_value
+        connection.get_option.side_effect = lambda option: "192.168.0.1" if option == "host" else None
+        connection.probe.side_effect = lambda timeout: probes.pop(0) if len(probes) > 1 else probes[0]
+        connection.send_request.return_value = None
+        return connection
+
+    def get_exchanges(self, connection):
+        """ The commands sent and the probes, in order
+        """
+        exchanges = []
+        for name, args, kwargs in connection.mock_calls:
+            if name == "send_request":
+                exchanges.append((args[2], args[1]))
+            elif name == "probe":
+                exchanges.append("probe")
+        return exchanges
+
+    def set_overridden_args(self, **args):
+        set_module_args(dict({
+            'config': [
+                {
+                    'name': "default-conn-1",
+                    'physif': "net1",
+                    'mode': "static",
+                    'ipv4_static_settings': {
+                        'address': "192.168.0.1",
+                        'netmask': "255.255.255.0",
+                        'gateway': "192.168.0.253"
+                    }
+                },
+                {
+                    'name': "default-conn-2",
+                    'physif': "net2",
+                    'mode': "static",
+                    'ipv4_static_settings': {
+                        'address': "10.0.0.1",
+                        'netmask': "255.255.255.0"
+                    }
+                },
+                {
+                    'name': "new-conn",
+                    'physif': "net3",
+                    'mode': "dhcp"
+                }
+            ],
+            'state': "overridden",
+        }, **args))
+
+    def test_om_conns_overridden_batches(self):
+        # The device is not ready at the first probe after the first batch
+        connection = self.load_device([False, True])
+        self.set_overridden_args(settle_time=5)
+
+        result = self.execute_module(changed=True)
+        # The connections are deleted, then created, then updated, the management connection being updated last
+        self.assertEqual([('DELETE', 'conns/conns-3'), ('POST', 'conns/'), ('PUT', 'conns/conns-2'),
+                          ('PUT', 'conns/conns-1')], [(command['method'], command['path'])
+                                                      for command in result['commands']])
+        self.assertEqual([('DELETE', 'conns/conns-3'), 'probe', 'probe', ('POST', 'conns/'), 'probe',
+                          ('PUT', 'conns/conns-2'), 'probe', ('PUT', 'conns/conns-1'), 'probe'],
+                         self.get_exchanges(connection))
+        # The settle time is waited after each batch, and the probes are repeated after the health check interval
+        self.assertEqual([5, 2, 5, 5, 5], [args[0] for args, kwargs in self.sleep.call_args_list])
+
+    def test_om_conns_overridden_not_ready(self):
+        connection = self.load_device([False])
+        self.set_overridden_args(health_check_timeout=0)
+
+        self.load_fixtures()
+        with self.assertRaises(ConnectionError) as exc:
+            self.module.main()
+        self.assertEqual('the device was not ready within 0 seconds of applying batch 1 of 4', exc.exception.args[0])
+        # The remaining batches are not sent
+        self.assertEqual([('DELETE', 'conns/conns-3'), 'probe'], self.get_exchanges(connection))
+
+    def test_om_conns_rendered(self):
+        set_module_args({
+            'config': [
+                {
+                    'name': "net1-dhcp",
+                    'physif': "net1",
+                    'mode': "dhcp"
+                }
+            ],
+            'state': "rendered",
+        })
+
+        rendered = [
+            {
+                'path': 'conns/',
+                'data': {
+                    'conn': {
+                        'physif': "net1",
+                        'mode': "dhcp"
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
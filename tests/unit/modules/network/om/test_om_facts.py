@@ -0,0 +1,58 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.opengear.om.plugins.modules import (
+    om_facts,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import CONNECTION_TARGETS, TestOmModule
+
+
+class TestOmFactsModule(TestOmModule):
+
+    module = om_facts
+    connection_targets = CONNECTION_TARGETS + (
+        "ansible_collections.opengear.om.plugins.modules.om_facts.get_resource_connection",
+    )
+
+    def test_om_facts_request_stats(self):
+        self.replay_cassette("om_users_merged.cassette", collect_stats=True)
+        set_module_args({
+            'gather_subset': ["!all"],
+            'gather_network_resources': ["users"],
+        })
+
+        result = self.changed()
+        self.assertEqual(2, len(result['ansible_facts']['ansible_network_resources']['users']))
+        self.assertEqual(1, result['request_stats']['endpoints']['GET users']['requests'])
+
+    def test_om_facts_no_request_stats(self):
+        self.replay_cassette("om_users_merged.cassette")
+        set_module_args({
+            'gather_subset': ["!all"],
+            'gather_network_resources': ["users"],
+        })
+
+        result = self.changed()
+        self.assertNotIn('request_stats', result)
@@ -0,0 +1,130 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_failover,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class TestOmFailoverModule(TestOmModule):
+
+    module = om_failover
+
+    def setUp(self):
+        super(TestOmFailoverModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.failover.failover.FailoverFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+    def tearDown(self):
+        super(TestOmFailoverModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+
+    def load_fixtures(self, commands=None, filename="om_failover_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+
+    def test_om_failover_merged(self):
+        set_module_args({
+            'config': {
+                'enabled': True
+            },
+            'state': "merged",
+        })
+
+        commands = [
+            {
+                'path': 'failover/settings',
+                'data': {
+                    'failover_settings': {
+                        'enabled': True,
+                        'probe_address': "192.168.1.1",
+                        'probe_physif': "net1"
+                    }
+                },
+                'method': 'PUT'
+            }
+        ]
+        self.execute_module(changed=True, commands=commands)
+
+    def test_om_failover_merged_idempotent(self):
+        set_module_args({
+            'config': {
+                'enabled': False,
+                'probe_physif': "net1"
+            },
+            'state': "merged",
+        })
+
+        commands = []
+        self.execute_module(changed=False, commands=commands)
+
+    def test_om_failover_rendered(self):
+        set_module_args({
+            'config': {
+                'enabled': True,
+                'probe_address': "8.8.8.8"
+            },
+            'state': "rendered",
+        })
+
+        rendered = [
+            {
+                'path': 'failover/settings',
+                'data': {
+                    'failover_settings': {
+                        'enabled': True,
+                        'probe_address': "8.8.8.8"
+                    }
+                },
+                'method': 'PUT'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
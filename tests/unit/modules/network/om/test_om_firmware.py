@@ -0,0 +1,141 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+import shutil
+import tempfile
+
+from ansible.module_utils.connection import ConnectionError
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_firmware,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule
+
+
+class FirmwareConnection(object):
+    """ The connection to a device whose uploads fail with the errors queued for them, then succeed, and whose
+        upgrade status reports the state given
+    """
+
+    def __init__(self, upload_errors, state):
+        self.upload_errors = upload_errors
+        self.state = state
+        self.uploads = 0
+
+    def get_option(self, option):
+        return None
+
+    def get(self, command, path):
+        return {'system_version': {'firmware_version': '24.11.0'}}
+
+    def upload(self, path, src, name, fields):
+        self.uploads += 1
+        if self.upload_errors:
+            raise ConnectionError(self.upload_errors.pop(0))
+        raise ConnectionError('Expecting value: line 1 column 1 (char 0)')
+
+    def send_requests(self, commands, max_in_flight=None, refresh=False):
+        return [{'response': {'system_firmware_upgrade_status': {'state': self.state}}} for command in commands]
+
+    def get_stats(self):
+        return None
+
+
+class TestOmFirmwareModule(TestOmModule):
+
+    module = om_firmware
+
+    def setUp(self):
+        super(TestOmFirmwareModule, self).setUp()
+
+        self.mock_get_resource_connection = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "config.firmware.firmware.get_resource_connection"
+        )
+        self.get_resource_connection = self.mock_get_resource_connection.start()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmpdir, 'operations_manager-24.11.1.raucb')
+        with open(self.src, 'wb') as f:
+            f.write(b'image')
+
+    def tearDown(self):
+        super(TestOmFirmwareModule, self).tearDown()
+        self.mock_get_resource_connection.stop()
+        shutil.rmtree(self.tmpdir)
+
+    def load_device(self, upload_errors, state):
+        self.connection = FirmwareConnection(upload_errors, state)
+        self.get_resource_connection.return_value = self.connection
+
+    def test_om_firmware_upload_failed_upgrade_running(self):
+        # The connection failed after the device received the whole image
+        self.load_device(['Connection reset by peer'], 'running')
+        set_module_args({
+            'src': self.src,
+            'version': "24.11.1",
+            'wait': False,
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual(1, self.connection.uploads)
+        self.assertEqual(1, result['upload_attempts'])
+
+    def test_om_firmware_upload_failed_retried(self):
+        self.load_device(['Connection reset by peer'], 'idle')
+        set_module_args({
+            'src': self.src,
+            'version': "24.11.1",
+            'wait': False,
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual(2, self.connection.uploads)
+        self.assertEqual(2, result['upload_attempts'])
+
+    def test_om_firmware_upload_failed(self):
+        self.load_device(['Connection reset by peer'] * 2, 'idle')
+        set_module_args({
+            'src': self.src,
+            'upload_retries': 1,
+            'wait': False,
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertEqual(2, result['upload_attempts'])
+        self.assertIn('Connection reset by peer', result['msg'])
+
+    def test_om_firmware_upload_failed_unknown_state(self):
+        # An unknown state is neither taken for a running upgrade nor retried over
+        self.load_device(['Connection reset by peer'], 'downloading')
+        set_module_args({
+            'src': self.src,
+            'wait': False,
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertEqual(1, self.connection.uploads)
+        self.assertIn('unknown firmware upgrade state downloading', result['msg'])
@@ -0,0 +1,164 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from ansible.module_utils.six.moves import BaseHTTPServer, socketserver
+from ansible.parsing.dataloader import DataLoader
+from ansible.playbook.play_context import PlayContext
+from ansible.playbook.task import Task
+from ansible.template import Templar
+
+from ansible_collections.opengear.om.plugins.action.om_fleet_facts import ActionModule
+from ansible_collections.opengear.om.tests.unit.compat import unittest
+from ansible_collections.opengear.om.tests.unit.compat.mock import MagicMock
+from .om_module import load_fixture
+
+
+class DeviceHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """ Answers as a device with the users of the om_users_config fixture
+    """
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.reply({'session': 'token'})
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.headers.get('Authorization') != 'Token token':
+            self.reply({'error': [{'text': 'Unauthorized'}]}, 401)
+        elif self.path == '/api/v2/users':
+            self.reply({'users': load_fixture('om_users_config.cfg')})
+        elif self.path == '/api/v2/groups':
+            self.reply({'groups': []})
+        else:
+            self.reply({}, 404)
+
+    def do_DELETE(self):
+        self.reply(None)
+
+    def reply(self, data, status=200):
+        body = json.dumps(data).encode('utf-8') if data is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ClosingHandler(socketserver.BaseRequestHandler):
+    """ Closes the connection without answering
+    """
+
+    def handle(self):
+        self.request.recv(65536)
+
+
+class GarbageHandler(socketserver.BaseRequestHandler):
+    """ Answers with a response that is not HTTP
+    """
+
+    def handle(self):
+        self.request.recv(65536)
+        self.request.sendall(b'garbage\r\n\r\n')
+
+
+class TestOmFleetFacts(unittest.TestCase):
+
+    def setUp(self):
+        DeviceHandler.requests = []
+        self.servers = {}
+        for host, server_class, handler in (('om1', BaseHTTPServer.HTTPServer, DeviceHandler),
+                                            ('om2', socketserver.TCPServer, ClosingHandler),
+                                            ('om3', socketserver.TCPServer, GarbageHandler)):
+            server = server_class(('127.0.0.1', 0), handler)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.daemon = True
+            thread.start()
+            self.servers[host] = server
+
+    def tearDown(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def run_action(self, args, **host_vars):
+        hostvars = dict((host, dict({
+            'ansible_host': '127.0.0.1',
+            'ansible_httpapi_port': server.server_address[1],
+            'ansible_user': 'root',
+            'ansible_httpapi_password': 'default',
+        }, **host_vars)) for host, server in self.servers.items())
+        task = Task()
+        task.args = args
+        loader = DataLoader()
+        action = ActionModule(task, MagicMock(), PlayContext(), loader, Templar(loader=loader), None)
+        return action.run(task_vars={'hostvars': hostvars, 'ansible_play_batch': sorted(hostvars)})
+
+    def test_om_fleet_facts(self):
+        result = self.run_action({'gather_network_resources': ['users']})
+
+        users = result['om_fleet_facts']['om1']['ansible_network_resources']['users']
+        self.assertEqual(['user1', 'user2'], [user['username'] for user in users])
+        self.assertEqual(['om2', 'om3'], sorted(result['failed_hosts']))
+        self.assertIn('Remote end closed connection', result['failed_hosts']['om2'])
+        self.assertIn('invalid HTTP response', result['failed_hosts']['om3'])
+
+    def test_om_fleet_facts_dest(self):
+        dest = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dest)
+        result = self.run_action({'hosts': ['om1'], 'gather_network_resources': ['users'], 'dest': dest})
+
+        self.assertEqual({}, result['failed_hosts'])
+        with open(os.path.join(dest, 'om1')) as f:
+            self.assertEqual(result['om_fleet_facts']['om1'], json.load(f))
+
+    def test_om_fleet_facts_resources_read_once(self):
+        result = self.run_action({'hosts': ['om1'], 'gather_network_resources': ['groups', 'users']})
+
+        resources = result['om_fleet_facts']['om1']['ansible_network_resources']
+        self.assertEqual(2, len(resources['users']))
+        self.assertEqual(['/api/v2/groups', '/api/v2/users'], sorted(DeviceHandler.requests))
+
+    def test_om_fleet_facts_unknown_host(self):
+        result = self.run_action({'hosts': ['om1', 'om9'], 'gather_network_resources': ['users']})
+
+        self.assertEqual(['om1'], list(result['om_fleet_facts']))
+        self.assertEqual({'om9': 'om9 is not in the inventory'}, result['failed_hosts'])
+
+    def test_om_fleet_facts_request_stats(self):
+        result = self.run_action({'hosts': ['om1'], 'gather_network_resources': ['users']},
+                                 ansible_om_collect_stats=True)
+
+        stats = result['fleet_request_stats']['om1']
+        self.assertEqual(3, stats['requests'])
+        self.assertEqual(['DELETE sessions/self', 'GET users', 'POST sessions/'], sorted(stats['endpoints']))
@@ -0,0 +1,161 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_groups,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class TestOmGroupsModule(TestOmModule):
+
+    module = om_groups
+
+    def setUp(self):
+        super(TestOmGroupsModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.groups.groups.GroupsFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+    def tearDown(self):
+        super(TestOmGroupsModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+
+    def load_fixtures(self, commands=None, filename="om_groups_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+
+    def test_om_groups_gathered_compact(self):
+        set_module_args({
+            'port_format': "compact",
+            'state': "gathered",
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual(['serial/by-opengear-id/port[01:03,05,10:11]'], result['gathered'][1]['ports'])
+
+    def test_om_groups_gathered_expanded(self):
+        set_module_args({
+            'state': "gathered",
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual(load_fixture("om_groups_config.cfg")[1]['ports'], result['gathered'][1]['ports'])
+
+    def test_om_groups_merged_port_ranges(self):
+        set_module_args({
+            'config': [
+                {
+                    'groupname': "ops",
+                    'ports': ["serial/by-opengear-id/port[04:06]", "serial/by-opengear-id/port12"]
+                }
+            ],
+            'state': "merged",
+            '_ansible_check_mode': True,
+        })
+
+        # The ranges are merged with the ports of the group, and expanded in the order of the port numbers
+        result = self.execute_module(changed=True)
+        self.assertEqual('groups/groups-2', result['commands'][0]['path'])
+        ports = ['01', '02', '03', '04', '05', '06', '10', '11', '12']
+        self.assertEqual(['serial/by-opengear-id/port' + port for port in ports],
+                         result['commands'][0]['data']['group']['ports'])
+
+    def test_om_groups_merged_port_ranges_idempotent(self):
+        set_module_args({
+            'config': [
+                {
+                    'groupname': "ops",
+                    'ports': ["serial/by-opengear-id/port[01:03]", "serial/by-opengear-id/port[10:11]"]
+                }
+            ],
+            'state': "merged",
+        })
+
+        self.execute_module(changed=False, commands=[])
+
+    def test_om_groups_invalid_port_range(self):
+        set_module_args({
+            'config': [
+                {
+                    'groupname': "ops",
+                    'ports': ["serial/by-opengear-id/port[05:01]"]
+                }
+            ],
+            'state': "merged",
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertEqual('invalid port range expression serial/by-opengear-id/port[05:01]', result['msg'])
+
+    def test_om_groups_rendered(self):
+        set_module_args({
+            'config': [
+                {
+                    'groupname': "ops",
+                    'role': "ConsoleUser",
+                    'enabled': True
+                }
+            ],
+            'state': "rendered",
+        })
+
+        rendered = [
+            {
+                'path': 'groups/',
+                'data': {
+                    'group': {
+                        'groupname': "ops",
+                        'role': "ConsoleUser",
+                        'enabled': True
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
@@ -0,0 +1,377 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import socket
+import tempfile
+import threading
+
+from io import BytesIO
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils.six.moves.urllib.error import HTTPError, URLError
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import get_instances
+from ansible_collections.opengear.om.tests.unit.compat import unittest
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from .om_module import CassetteConnection, DeviceConnection, load_httpapi
+
+OPEN_URL = "ansible_collections.opengear.om.plugins.httpapi.om.open_url"
+USERS = {"users": [{"id": "users-1", "username": "root"}]}
+
+
+HOSTNAME = {"system_hostname": {"hostname": "om1"}}
+
+
+def unreachable():
+    return AnsibleConnectionFailure("Could not connect to https://om.example.com/api/v2/users")
+
+
+class ProbedDevice(object):
+    """ A device answering the requests of probes, each new session getting the next token, and logging each request
+        as its method, path and session token
+    """
+
+    def __init__(self, version_error=None):
+        self.requests = []
+        self.sessions = 0
+        self.version_error = version_error
+
+    def open_url(self, url, data=None, method="GET", headers=None, **kwargs):
+        path = url[len("https://om.example.com/api/v2/"):]
+        token = (headers or {}).get("Authorization", " ").split(" ")[1] or None
+        self.requests.append((method, path, token))
+        if path == "sessions/" and method == "POST":
+            self.sessions += 1
+            return BytesIO(json.dumps({"session": "probe%d" % self.sessions}).encode("utf-8"))
+        if path == "system/version" and self.version_error:
+            raise self.version_error
+        return BytesIO(json.dumps({"system_version": {"firmware_version": "24.11.0"}}).encode("utf-8"))
+
+
+class SlowDevice(DeviceConnection):
+    """ A device holding the responses to the GETs of a path until it is released, to keep them in flight
+    """
+
+    def __init__(self, responses, slow_path):
+        super(SlowDevice, self).__init__(responses)
+        self.slow_path = slow_path
+        self.started = threading.Event()
+        self.released = threading.Event()
+        self.timed_out = False
+
+    def send(self, path, data, method="GET", headers=None):
+        if method == "GET" and path.endswith("/" + self.slow_path):
+            self.started.set()
+            self.timed_out = not self.released.wait(5) or self.timed_out
+        return super(SlowDevice, self).send(path, data, method, headers)
+
+
+class TestOmHttpApi(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_sleep = patch("time.sleep")
+        self.mock_sleep.start()
+        self.addCleanup(self.mock_sleep.stop)
+
+    def load_httpapi(self, responses, **options):
+        self.connection = DeviceConnection(responses)
+        httpapi = load_httpapi(self.connection)
+        httpapi.set_options(direct=dict({"circuit_breaker_threshold": 0}, **options))
+        return httpapi
+
+    def test_om_httpapi_login_through_limiter(self):
+        httpapi = self.load_httpapi({("GET", "users"): [(200, USERS)]})
+        result = {}
+
+        def send():
+            result["response"] = httpapi.send_request(None, "users")
+
+        # The first request logs in while holding the only slot of the limiter
+        thread = threading.Thread(target=send)
+        thread.daemon = True
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive(), "the request waited for the limiter to log in")
+        self.assertEqual(USERS, result["response"])
+        self.assertEqual([("POST", "sessions/"), ("GET", "users")], self.connection.requests)
+
+    def test_om_httpapi_retry_get_timeout(self):
+        httpapi = self.load_httpapi({("GET", "users"): [socket.timeout("timed out"), (200, USERS)]})
+
+        self.assertEqual(USERS, httpapi.send_request(None, "users"))
+        self.assertEqual([("POST", "sessions/"), ("GET", "users"), ("GET", "users")], self.connection.requests)
+
+    def test_om_httpapi_no_retry_post_timeout(self):
+        httpapi = self.load_httpapi({("POST", "users/"): [socket.timeout("timed out"), (200, USERS)]})
+
+        self.assertRaises(socket.timeout, httpapi.send_request, {"user": {"username": "user3"}}, "users/", "POST")
+        self.assertEqual([("POST", "sessions/"), ("POST", "users/")], self.connection.requests)
+
+    def test_om_httpapi_write_invalidates_pages(self):
+        page = "users?offset=0&limit=2"
+        changed = {"users": [{"id": "users-1", "username": "admin"}]}
+        httpapi = self.load_httpapi({
+            ("GET", page): [(200, USERS), (200, changed)],
+            ("PUT", "users/users-1"): [(200, {"user": changed["users"][0]})],
+        }, page_size=2)
+
+        self.assertEqual(USERS, httpapi.send_request(None, page))
+        self.assertEqual(USERS, httpapi.send_request(None, page))
+        httpapi.send_request({"user": {"username": "admin"}}, "users/users-1", "PUT")
+        self.assertEqual(changed, httpapi.send_request(None, page))
+        self.assertEqual([("POST", "sessions/"), ("GET", page), ("PUT", "users/users-1"), ("GET", page)],
+                         self.connection.requests)
+
+    def start_get(self, httpapi, path, results):
+        thread = threading.Thread(target=lambda: results.append(httpapi.send_request(None, path)))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def test_om_httpapi_request_cache_hits(self):
+        httpapi = self.load_httpapi({("GET", "users"): [(200, USERS)]}, collect_stats=True)
+
+        self.assertEqual(USERS, httpapi.send_request(None, "users"))
+        response = httpapi.send_request(None, "users")
+        self.assertEqual(USERS, response)
+        # The cached response is a copy, changing it does not change the next one
+        response["users"].append({"id": "users-2", "username": "admin"})
+        self.assertEqual(USERS, httpapi.send_request(None, "users"))
+        self.assertEqual([("POST", "sessions/"), ("GET", "users")], self.connection.requests)
+        self.assertEqual(2, httpapi.get_stats()["endpoints"]["GET users"]["cache_hits"])
+
+    def test_om_httpapi_request_cache_disabled(self):
+        httpapi = self.load_httpapi({("GET", "users"): [(200, USERS)]}, request_cache=False)
+
+        httpapi.send_request(None, "users")
+        httpapi.send_request(None, "users")
+        self.assertEqual([("POST", "sessions/"), ("GET", "users"), ("GET", "users")], self.connection.requests)
+
+    def test_om_httpapi_request_cache_refresh(self):
+        status = "ports/auto_discover"
+        httpapi = self.load_httpapi({("GET", status): [(200, {"status": "running"}), (200, {"status": "completed"})]})
+
+        self.assertEqual({"status": "running"}, httpapi.send_request(None, status))
+        commands = [{"data": None, "path": status, "method": "GET"}]
+        self.assertEqual([{"response": {"status": "completed"}}], httpapi.send_requests(commands, refresh=True))
+        self.assertEqual([("POST", "sessions/"), ("GET", status), ("GET", status)], self.connection.requests)
+
+    def test_om_httpapi_request_cache_coalesces(self):
+        self.connection = SlowDevice({("GET", "users"): [(200, USERS)]}, "users")
+        httpapi = load_httpapi(self.connection)
+        httpapi.set_options(direct={"circuit_breaker_threshold": 0, "collect_stats": True})
+        results = []
+
+        threads = [self.start_get(httpapi, "users", results)]
+        self.assertTrue(self.connection.started.wait(5))
+        # The other GETs wait for the one in flight rather than sending their own
+        threads.extend(self.start_get(httpapi, "users", results) for index in range(3))
+        threading.Event().wait(0.1)
+        self.connection.released.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertFalse(self.connection.timed_out)
+        self.assertEqual([USERS] * 4, results)
+        self.assertEqual([("POST", "sessions/"), ("GET", "users")], self.connection.requests)
+        self.assertEqual(3, httpapi.get_stats()["endpoints"]["GET users"]["cache_hits"])
+
+    def test_om_httpapi_request_cache_write_invalidates(self):
+        user = {"user": {"id": "users-1", "username": "root"}}
+        httpapi = self.load_httpapi({
+            ("GET", "users"): [(200, USERS)],
+            ("GET", "users/users-1"): [(200, user)],
+            ("GET", "system/hostname"): [(200, HOSTNAME)],
+            ("PUT", "users/users-1"): [(200, user)],
+            ("POST", "users"): [(200, user)],
+        })
+        gets = [("GET", "users"), ("GET", "users/users-1")]
+
+        for path in ("users", "users/users-1", "system/hostname"):
+            httpapi.send_request(None, path)
+        # A write to an instance drops the instance and its list
+        httpapi.send_request(user, "users/users-1", "PUT")
+        for path in ("users", "users/users-1", "system/hostname"):
+            httpapi.send_request(None, path)
+        # A write to the list drops its instances
+        httpapi.send_request(user, "users", "POST")
+        for path in ("users", "users/users-1", "system/hostname"):
+            httpapi.send_request(None, path)
+        self.assertEqual([("POST", "sessions/")] + gets + [("GET", "system/hostname"), ("PUT", "users/users-1")] + gets
+                         + [("POST", "users")] + gets, self.connection.requests)
+
+    def test_om_httpapi_request_cache_write_in_flight(self):
+        changed = {"users": [{"id": "users-1", "username": "admin"}]}
+        self.connection = SlowDevice({
+            ("GET", "users"): [(200, USERS), (200, changed)],
+            ("GET", "system/hostname"): [(200, HOSTNAME)],
+            ("PUT", "users/users-1"): [(200, {"user": changed["users"][0]})],
+        }, "users")
+        httpapi = load_httpapi(self.connection)
+        httpapi.set_options(direct={"circuit_breaker_threshold": 0, "max_concurrency": 2})
+        results = []
+
+        # A first request raises the concurrency limit to 2, for the write to be sent while the GET is in flight
+        httpapi.send_request(None, "system/hostname")
+        thread = self.start_get(httpapi, "users", results)
+        self.assertTrue(self.connection.started.wait(5))
+        httpapi.send_request({"user": {"username": "admin"}}, "users/users-1", "PUT")
+        self.connection.released.set()
+        thread.join(5)
+        self.assertFalse(self.connection.timed_out)
+        # The response read before the write completed is returned, but not cached
+        self.assertEqual([USERS], results)
+        self.assertEqual(changed, httpapi.send_request(None, "users"))
+
+    def test_om_httpapi_page_size_from_environment(self):
+        users = [{"id": "users-%d" % index, "username": "user%d" % index} for index in range(1, 4)]
+        self.connection = DeviceConnection({
+            ("GET", "users?offset=0&limit=2"): [(200, {"users": users[:2]})],
+            ("GET", "users?offset=2&limit=2"): [(200, {"users": users[2:]})],
+        })
+        httpapi = load_httpapi(self.connection)
+        with patch.dict(os.environ, {"ANSIBLE_OM_PAGE_SIZE": "2"}):
+            httpapi.set_options()
+
+        # The option is resolved by the plugin, and read by the modules through the connection
+        connection = CassetteConnection(httpapi, self.connection)
+        self.assertEqual(users, list(get_instances(connection, "users", "users")))
+        self.assertEqual([("POST", "sessions/"), ("GET", "users?offset=0&limit=2"), ("GET", "users?offset=2&limit=2")],
+                         self.connection.requests)
+
+    def test_om_httpapi_cassette_records_tasks(self):
+        cassette = os.path.join(tempfile.mkdtemp(), "om.cassette")
+        options = {"cassette": cassette, "cassette_mode": "record", "circuit_breaker_threshold": 0}
+        self.connection = DeviceConnection({("GET", "users"): [(200, USERS)], ("GET", "groups"): [(200, {"groups": []})]})
+        persistent = load_httpapi(self.connection)
+
+        # The options are set for every task, both on the controller and in the persistent connection
+        for path in ("users", "groups"):
+            load_httpapi(DeviceConnection()).set_options(direct=options)
+            persistent.set_options(direct=options)
+            persistent.send_request(None, path)
+
+        with open(cassette) as cassette_file:
+            exchanges = [json.loads(line) for line in cassette_file]
+        self.assertEqual([("POST", "sessions/"), ("GET", "users"), ("GET", "groups")],
+                         [(exchange["method"], exchange["path"]) for exchange in exchanges])
+
+    def load_breaker_httpapi(self, responses, **options):
+        return self.load_httpapi(responses, circuit_breaker_threshold=2, circuit_breaker_dir=self.breaker_dir,
+                                 **options)
+
+    def test_om_httpapi_circuit_breaker_opens(self):
+        self.breaker_dir = tempfile.mkdtemp()
+        httpapi = self.load_breaker_httpapi({("GET", "users"): [unreachable(), unreachable()]})
+
+        self.assertRaises(AnsibleConnectionFailure, httpapi.send_request, None, "users")
+        self.assertRaises(AnsibleConnectionFailure, httpapi.send_request, None, "users")
+        requests = list(self.connection.requests)
+
+        # The state is shared with the next task, which fails without contacting the device
+        httpapi = self.load_breaker_httpapi({("GET", "users"): [(200, USERS)]})
+        with self.assertRaises(AnsibleConnectionFailure) as exc:
+            httpapi.send_request(None, "users")
+        self.assertIn("unreachable for 2 consecutive attempts", str(exc.exception))
+        self.assertEqual([], self.connection.requests)
+        self.assertEqual([("POST", "sessions/"), ("GET", "users"), ("GET", "users")], requests)
+
+    def test_om_httpapi_circuit_breaker_half_open(self):
+        self.breaker_dir = tempfile.mkdtemp()
+        httpapi = self.load_breaker_httpapi({("GET", "users"): [unreachable(), unreachable()]}, circuit_breaker_cooldown=0)
+        self.assertRaises(AnsibleConnectionFailure, httpapi.send_request, None, "users")
+        self.assertRaises(AnsibleConnectionFailure, httpapi.send_request, None, "users")
+
+        # Once the cooldown elapsed, a single probe is sent, and the circuit stays open when it fails
+        httpapi = self.load_breaker_httpapi({("GET", "users"): [(200, USERS)]}, circuit_breaker_cooldown=0)
+        with patch(OPEN_URL, side_effect=URLError("timed out")) as open_url:
+            with self.assertRaises(AnsibleConnectionFailure) as exc:
+                httpapi.send_request(None, "users")
+        self.assertIn("still unreachable", str(exc.exception))
+        self.assertEqual(1, open_url.call_count)
+        self.assertEqual([], self.connection.requests)
+
+    def test_om_httpapi_circuit_breaker_recovers(self):
+        self.breaker_dir = tempfile.mkdtemp()
+        httpapi = self.load_breaker_httpapi({("GET", "users"): [unreachable(), unreachable()]}, circuit_breaker_cooldown=0)
+        self.assertRaises(AnsibleConnectionFailure, httpapi.send_request, None, "users")
+        self.assertRaises(AnsibleConnectionFailure, httpapi.send_request, None, "users")
+
+        # A successful probe closes the circuit, and the failures are counted again from zero
+        httpapi = self.load_breaker_httpapi({("GET", "users"): [(200, USERS), unreachable(), (200, USERS)]},
+                                            circuit_breaker_cooldown=0)
+        with patch(OPEN_URL):
+            self.assertEqual(USERS, httpapi._send_request(None, "users"))
+        self.assertRaises(AnsibleConnectionFailure, httpapi._send_request, None, "users")
+        self.assertEqual(USERS, httpapi._send_request(None, "users"))
+        self.assertEqual(0, httpapi._breaker.failures)
+
+    def test_om_httpapi_circuit_breaker_disabled_by_default(self):
+        httpapi = load_httpapi(DeviceConnection())
+        httpapi.set_options()
+        self.assertIsNone(httpapi._breaker)
+
+    def test_om_httpapi_probe_replaces_session(self):
+        httpapi = self.load_httpapi({("GET", "users"): [(200, USERS)]})
+        httpapi.send_request(None, "users")
+        device = ProbedDevice()
+        with patch(OPEN_URL, side_effect=device.open_url):
+            self.assertTrue(httpapi.probe(5))
+
+        # The session of the connection is logged out once the new session is known to work
+        self.assertEqual([("POST", "sessions/", None), ("GET", "system/version", "probe1"),
+                          ("DELETE", "sessions/self", "token")], device.requests)
+        self.assertEqual({"Authorization": "Token probe1"}, self.connection._auth)
+
+    def test_om_httpapi_probe_not_ready(self):
+        httpapi = self.load_httpapi({("GET", "users"): [(200, USERS)]})
+        httpapi.send_request(None, "users")
+        device = ProbedDevice(HTTPError("https://om.example.com/api/v2/system/version", 503, "Starting", {}, None))
+        with patch(OPEN_URL, side_effect=device.open_url):
+            self.assertFalse(httpapi.probe(5))
+
+        # The session of the probe is logged out, and the session of the connection is kept
+        self.assertEqual([("POST", "sessions/", None), ("GET", "system/version", "probe1"),
+                          ("DELETE", "sessions/self", "probe1")], device.requests)
+        self.assertEqual({"Authorization": "Token token"}, self.connection._auth)
+
+    def test_om_httpapi_probe_logout_failure(self):
+        # The replaced session did not survive the restart of the device
+        httpapi = self.load_httpapi({("GET", "users"): [(200, USERS)]})
+        httpapi.send_request(None, "users")
+        device = ProbedDevice()
+
+        def open_url(url, method="GET", **kwargs):
+            if method == "DELETE":
+                raise HTTPError(url, 401, "Unauthorized", {}, None)
+            return device.open_url(url, method=method, **kwargs)
+
+        with patch(OPEN_URL, side_effect=open_url):
+            self.assertTrue(httpapi.probe(5))
+        self.assertEqual({"Authorization": "Token probe1"}, self.connection._auth)
+
+    def test_om_httpapi_probe_without_login(self):
+        httpapi = self.load_httpapi({})
+        device = ProbedDevice()
+        with patch(OPEN_URL, side_effect=device.open_url):
+            self.assertTrue(httpapi.probe(5, False))
+        self.assertEqual([("GET", "system/version", None)], device.requests)
@@ -0,0 +1,59 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.opengear.om.plugins.modules import (
+    om_pdu,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule
+
+
+class TestOmPduModule(TestOmModule):
+
+    module = om_pdu
+
+    def test_om_pdu_rendered(self):
+        set_module_args({
+            'config': [
+                {
+                    'name': "pdu1",
+                    'driver': "apc_rackpdu"
+                }
+            ],
+            'state': "rendered",
+        })
+
+        rendered = [
+            {
+                'path': 'pdus/',
+                'data': {
+                    'pdu': {
+                        'name': "pdu1",
+                        'driver': "apc_rackpdu"
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
@@ -0,0 +1,151 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_physifs,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class TestOmPhysifsModule(TestOmModule):
+
+    module = om_physifs
+
+    def setUp(self):
+        super(TestOmPhysifsModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.physifs.physifs.PhysifsFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+        # The management physical interface is found from the network connections
+        self.mock_get_conns_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.conns.conns.ConnsFacts.get_device_data"
+        )
+        self.get_conns_data = self.mock_get_conns_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+        self.mock_sleep = patch("time.sleep")
+        self.sleep = self.mock_sleep.start()
+
+    def tearDown(self):
+        super(TestOmPhysifsModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_conns_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+        self.mock_sleep.stop()
+
+    def load_fixtures(self, commands=None, filename="om_physifs_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+        self.get_conns_data.side_effect = lambda *args, **kwargs: load_fixture("om_conns_config.cfg")
+
+    def load_device(self, probes):
+        """ A device managed through 192.168.0.1, whose readiness probes return the results given, the last one
+            being repeated
+        """
+        connection = self.get_resource_connection_config.return_value
+        connection.get_option.side_effect = lambda option: "192.168.0.1" if option == "host" else None
+        connection.probe.side_effect = lambda timeout: probes.pop(0) if len(probes) > 1 else probes[0]
+        connection.send_request.return_value = None
+        return connection
+
+    def get_exchanges(self, connection):
+        """ The commands sent and the probes, in order
+        """
+        exchanges = []
+        for name, args, kwargs in connection.mock_calls:
+            if name == "send_request":
+                exchanges.append((args[2], args[1]))
+            elif name == "probe":
+                exchanges.append("probe")
+        return exchanges
+
+    def test_om_physifs_merged_management_last(self):
+        connection = self.load_device([True])
+        set_module_args({
+            'config': [
+                {
+                    'name': "net1",
+                    'mtu': 1400
+                },
+                {
+                    'name': "net2",
+                    'mtu': 1400
+                }
+            ],
+            'state': "merged",
+        })
+
+        # net1 carries the management connection, its batch comes last
+        self.execute_module(changed=True)
+        self.assertEqual([('PUT', 'physifs/physifs-2'), 'probe', ('PUT', 'physifs/physifs-1'), 'probe'],
+                         self.get_exchanges(connection))
+        self.sleep.assert_not_called()
+
+    def test_om_physifs_rendered(self):
+        set_module_args({
+            'config': [
+                {
+                    'name': "net1",
+                    'mtu': 1400
+                }
+            ],
+            'state': "rendered",
+        })
+
+        rendered = [
+            {
+                'path': 'physifs',
+                'data': {
+                    'physif': {
+                        'name': "net1",
+                        'mtu': 1400
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
@@ -0,0 +1,172 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_port_sessions,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule
+
+PORTS = {
+    'ports': [
+        {'id': "ports-1", 'label': "router1", 'sessions': [{'username': "operator", 'client_pid': 2045},
+                                                           {'username': "root", 'client_pid': 2046}]},
+        {'id': "ports-2", 'label': "switch1", 'sessions': [{'username': "operator", 'client_pid': 3001}]},
+        {'id': "ports-3", 'label': "firewall1", 'sessions': [{'username': "operator"}]},
+        {'id': "ports-4", 'label': "spare"},
+    ]
+}
+
+
+class SessionsConnection(object):
+    """ The connection to a device whose ports have the sessions of PORTS, failing to terminate the sessions of the
+        client_pids given
+    """
+
+    def __init__(self, failing_pids=()):
+        self.failing_pids = failing_pids
+        self.requests = []
+
+    def get_page_size(self):
+        return 0
+
+    def get(self, command, path):
+        return PORTS
+
+    def send_requests(self, commands, max_in_flight=None, refresh=False):
+        self.requests.append(([(command['method'], command['path']) for command in commands], max_in_flight))
+        results = []
+        for command in commands:
+            if int(command['path'].split('/')[-1]) in self.failing_pids:
+                results.append({'error': "Session not found", 'code': 404})
+            else:
+                results.append({'response': None})
+        return results
+
+    def get_stats(self):
+        return None
+
+
+class TestOmPortSessionsModule(TestOmModule):
+
+    module = om_port_sessions
+
+    def setUp(self):
+        super(TestOmPortSessionsModule, self).setUp()
+
+        self.mock_get_resource_connection = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection = self.mock_get_resource_connection.start()
+
+    def tearDown(self):
+        super(TestOmPortSessionsModule, self).tearDown()
+        self.mock_get_resource_connection.stop()
+
+    def load_device(self, failing_pids=()):
+        self.connection = SessionsConnection(failing_pids)
+        self.get_resource_connection.return_value = self.connection
+
+    def test_om_port_sessions_gathered(self):
+        self.load_device()
+        set_module_args({})
+
+        result = self.execute_module(changed=False)
+        self.assertEqual([("ports-1", 2045), ("ports-1", 2046), ("ports-2", 3001), ("ports-3", None)],
+                         [(session['port'], session['client_pid']) for session in result['sessions']])
+        self.assertEqual([], self.connection.requests)
+
+    def test_om_port_sessions_select(self):
+        self.load_device()
+        set_module_args({
+            'ports': ["ports-[1:2]"],
+            'usernames': ["operator"],
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual([2045, 3001], [session['client_pid'] for session in result['sessions']])
+
+    def test_om_port_sessions_select_client_pids(self):
+        self.load_device()
+        set_module_args({
+            'ports': ["ports-*"],
+            'client_pids': [2046, 3001],
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual([("ports-1", "root"), ("ports-2", "operator")],
+                         [(session['port'], session['username']) for session in result['sessions']])
+
+    def test_om_port_sessions_terminated(self):
+        self.load_device()
+        set_module_args({
+            'ports': ["ports-[1:2]"],
+            'max_in_flight': 2,
+            'state': "terminated",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertTrue(all(session['terminated'] for session in result['sessions']))
+        self.assertEqual([([('DELETE', 'ports/ports-1/sessions/2045'), ('DELETE', 'ports/ports-1/sessions/2046'),
+                            ('DELETE', 'ports/ports-2/sessions/3001')], 2)], self.connection.requests)
+
+    def test_om_port_sessions_terminated_partial_failure(self):
+        self.load_device(failing_pids=[2046])
+        set_module_args({
+            'ports': ["ports-1"],
+            'state': "terminated",
+        })
+
+        # All the sessions are attempted, the module fails once they were
+        result = self.execute_module(failed=True)
+        self.assertTrue(result['changed'])
+        self.assertEqual('1 of 2 sessions could not be terminated', result['msg'])
+        self.assertEqual([True, False], [session['terminated'] for session in result['sessions']])
+        self.assertEqual('Session not found', result['sessions'][1]['msg'])
+
+    def test_om_port_sessions_terminated_no_client_pid(self):
+        self.load_device()
+        set_module_args({
+            'ports': ["ports-[2:3]"],
+            'state': "terminated",
+        })
+
+        # The session without a client_pid is not requested
+        result = self.execute_module(failed=True)
+        self.assertEqual([True, False], [session['terminated'] for session in result['sessions']])
+        self.assertEqual([([('DELETE', 'ports/ports-2/sessions/3001')], 8)], self.connection.requests)
+
+    def test_om_port_sessions_terminated_check_mode(self):
+        self.load_device()
+        set_module_args({
+            'usernames': ["root"],
+            'state': "terminated",
+            '_ansible_check_mode': True,
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual([2046], [session['client_pid'] for session in result['sessions']])
+        self.assertEqual([], self.connection.requests)
@@ -0,0 +1,377 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_ports,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class FakeClock(object):
+    """ The time module seen by om_ports, time passing only when it sleeps
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class AutoDiscoverConnection(object):
+    """ The connection to a device reporting the Auto-Discovery statuses queued, one per read, the last one being
+        repeated. A status is a response, or an error. Once the process ran, the device lists the ports given.
+    """
+
+    def __init__(self, statuses, ports):
+        self.statuses = statuses
+        self.ports = ports
+        self.requests = []
+
+    def get_option(self, option):
+        return None
+
+    def get_page_size(self):
+        return 0
+
+    def get(self, command, path):
+        return {'ports': self.ports}
+
+    def send_request(self, data, path, method='GET'):
+        self.requests.append((method, path))
+
+    def send_requests(self, commands, max_in_flight=None, refresh=False):
+        results = []
+        for command in commands:
+            self.requests.append((command['method'], command['path']))
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            results.append(status if 'error' in status else {'response': status})
+        return results
+
+    def get_stats(self):
+        return None
+
+
+class TestOmPortsModule(TestOmModule):
+
+    module = om_ports
+
+    def setUp(self):
+        super(TestOmPortsModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.ports.ports.PortsFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+    def tearDown(self):
+        super(TestOmPortsModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+
+    def load_fixtures(self, commands=None, filename="om_ports_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+
+    def load_auto_discover(self, statuses, labels=None):
+        """ A device running the Auto-Discovery process, which labels the ports as given
+        """
+        ports = load_fixture("om_ports_config.cfg")['ports']
+        ports = [dict(port, label=(labels or {}).get(port['id'], port['label'])) for port in ports]
+        self.connection = AutoDiscoverConnection(statuses, ports)
+        self.get_resource_connection_config.return_value = self.connection
+        self.clock = FakeClock()
+        self.mock_time = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "config.ports.ports.time", self.clock
+        )
+        self.mock_time.start()
+        self.addCleanup(self.mock_time.stop)
+
+    def set_auto_discover_args(self, wait_timeout=None):
+        set_module_args({
+            'config': {
+                'auto_discover': {
+                    'ports': [1, 2],
+                    'start': True,
+                    'wait': True,
+                    'wait_timeout': wait_timeout
+                }
+            },
+            'state': "merged",
+        })
+
+    def get_labels(self, result):
+        """ The labels the commands of a result set, by port id
+        """
+        return dict((command['path'][len('ports/'):], command['data']['port']['label'])
+                    for command in result['commands'])
+
+    def test_om_ports_merged_range(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'id': "ports-[1:2,4:6]",
+                        'label': "Rack"
+                    }
+                ]
+            },
+            'state': "merged",
+        })
+
+        # The ports the device does not have are not selected
+        result = self.execute_module(changed=True)
+        self.assertEqual({'ports-1': "Rack", 'ports-2': "Rack", 'ports-4': "Rack"}, self.get_labels(result))
+
+    def test_om_ports_merged_padded_range(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'id': "ports-[01:02]",
+                        'label': "Rack"
+                    }
+                ]
+            },
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual({'ports-1': "Rack", 'ports-2': "Rack"}, self.get_labels(result))
+
+    def test_om_ports_merged_glob_negated_filter(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'id': "ports-*",
+                        'filter': {'pinout': "!USB"},
+                        'label': "Rack"
+                    }
+                ]
+            },
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual({'ports-1': "Rack", 'ports-2': "Rack", 'ports-3': "Rack"}, self.get_labels(result))
+
+    def test_om_ports_merged_filter(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'filter': {'mode': "consoleServer", 'label': "S*"},
+                        'label': "Core switch"
+                    }
+                ]
+            },
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual({'ports-2': "Core switch"}, self.get_labels(result))
+
+    def test_om_ports_merged_several_selectors(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'id': "ports-[1:2]",
+                        'label': "Rack",
+                        'baudrate': "115200"
+                    },
+                    {
+                        'id': "ports-2",
+                        'label': "Core switch"
+                    }
+                ]
+            },
+            'state': "merged",
+        })
+
+        # The later entry takes precedence, the values it does not set are kept from the earlier one
+        commands = [
+            {
+                'path': 'ports/ports-1',
+                'data': {
+                    'port': {
+                        'id': "ports-1",
+                        'label': "Rack",
+                        'mode': "consoleServer",
+                        'pinout': "X2",
+                        'baudrate': "115200"
+                    }
+                },
+                'method': 'PUT'
+            },
+            {
+                'path': 'ports/ports-2',
+                'data': {
+                    'port': {
+                        'id': "ports-2",
+                        'label': "Core switch",
+                        'mode': "consoleServer",
+                        'pinout': "X2",
+                        'baudrate': "115200"
+                    }
+                },
+                'method': 'PUT'
+            }
+        ]
+        self.execute_module(changed=True, commands=commands)
+
+    def test_om_ports_merged_no_selector(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'label': "Rack"
+                    }
+                ]
+            },
+            'state': "merged",
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertEqual('each port entry needs an id or a filter', result['msg'])
+
+    def test_om_ports_rendered(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'id': "ports-[1:2]",
+                        'label': "Rack",
+                        'power': "on"
+                    },
+                    {
+                        'id': "ports-2",
+                        'label': "Router"
+                    }
+                ],
+                'auto_discover': {
+                    'ports': [1, 2],
+                    'start': True
+                }
+            },
+            'state': "rendered",
+        })
+
+        rendered = [
+            {'path': 'ports/ports-1', 'data': {'port': {'id': "ports-1", 'label': "Rack"}}, 'method': 'PUT'},
+            {'path': 'ports/ports-1/power', 'data': {'cmd': "on"}, 'method': 'PUT'},
+            {'path': 'ports/ports-2', 'data': {'port': {'id': "ports-2", 'label': "Router"}}, 'method': 'PUT'},
+            {'path': 'ports/ports-2/power', 'data': {'cmd': "on"}, 'method': 'PUT'},
+            {'path': 'ports/auto_discover', 'data': {'auto_discover': [1, 2]}, 'method': 'POST'},
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
+
+    def test_om_ports_rendered_filter(self):
+        set_module_args({
+            'config': {
+                'ports': [
+                    {
+                        'filter': {'pinout': "X2"},
+                        'label': "Rack"
+                    }
+                ]
+            },
+            'state': "rendered",
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertIn('filters and glob patterns need the ports of the device', result['msg'])
+
+    def test_om_ports_auto_discover_wait(self):
+        self.load_auto_discover([{'status': "running"}, {'auto_discover': {'status': "running"}},
+                                 {'auto_discover': {'status': "completed"}}],
+                                labels={'ports-1': "router1.example.com"})
+        self.set_auto_discover_args()
+
+        result = self.execute_module(changed=True)
+        self.assertEqual([{'id': "ports-1", 'label': "router1.example.com", 'previous_label': "Router"}],
+                         result['discovered_ports'])
+        self.assertEqual([('POST', 'ports/auto_discover')] + [('GET', 'ports/auto_discover')] * 3,
+                         self.connection.requests)
+        # The interval grows by half after each poll
+        self.assertEqual([2, 3.0, 4.5], self.clock.sleeps)
+
+    def test_om_ports_auto_discover_failed(self):
+        self.load_auto_discover([{'status': "running"}, {'status': "failed"}])
+        self.set_auto_discover_args()
+
+        result = self.execute_module(failed=True)
+        self.assertTrue(result['changed'])
+        self.assertEqual('Auto-Discovery failed, its status is failed', result['msg'])
+
+    def test_om_ports_auto_discover_timeout(self):
+        self.load_auto_discover([{'status': "scanning"}])
+        self.set_auto_discover_args(wait_timeout=10)
+
+        # The last poll is made at the deadline
+        result = self.execute_module(failed=True)
+        self.assertEqual('Auto-Discovery did not complete within 10 seconds, its status is scanning', result['msg'])
+        self.assertEqual([2, 3.0, 4.5, 0.5], self.clock.sleeps)
+
+    def test_om_ports_auto_discover_no_status(self):
+        self.load_auto_discover([{}])
+        self.set_auto_discover_args(wait_timeout=5)
+
+        result = self.execute_module(failed=True)
+        self.assertEqual('the Auto-Discovery status was not reported within 5 seconds', result['msg'])
+
+    def test_om_ports_auto_discover_read_error(self):
+        self.load_auto_discover([{'error': "Service unavailable", 'code': 503}])
+        self.set_auto_discover_args()
+
+        result = self.execute_module(failed=True)
+        self.assertEqual('Could not read the Auto-Discovery status: Service unavailable', result['msg'])
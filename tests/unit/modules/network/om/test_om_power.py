@@ -0,0 +1,177 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_power,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class PowerConnection(object):
+    """ The connection to a device whose ports report the power statuses queued for them, one per read, the last one
+        being repeated. A status of None is not reported, and an error is returned instead of a dictionary.
+    """
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.reads = 0
+        self.actions = []
+
+    def get_option(self, option):
+        return None
+
+    def get_page_size(self):
+        return 0
+
+    def get(self, command, path):
+        return load_fixture("om_power_ports.cfg")
+
+    def send_requests(self, commands, max_in_flight=None, refresh=False):
+        results = []
+        if commands[0]['method'] != 'GET':
+            self.actions.append([command['path'] for command in commands])
+        for command in commands:
+            if command['method'] != 'GET':
+                results.append({'response': None})
+                continue
+            self.reads += 1
+            queued = self.statuses[command['path'].split('/')[1]]
+            status = queued.pop(0) if len(queued) > 1 else queued[0]
+            if isinstance(status, dict):
+                results.append(status)
+            else:
+                results.append({'response': {'power': {'status': status} if status else {}}})
+        return results
+
+    def get_stats(self):
+        return None
+
+
+class TestOmPowerModule(TestOmModule):
+
+    module = om_power
+
+    def setUp(self):
+        super(TestOmPowerModule, self).setUp()
+
+        self.mock_get_resource_connection = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "config.power.power.get_resource_connection"
+        )
+        self.get_resource_connection = self.mock_get_resource_connection.start()
+
+    def tearDown(self):
+        super(TestOmPowerModule, self).tearDown()
+        self.mock_get_resource_connection.stop()
+
+    def load_device(self, statuses):
+        self.connection = PowerConnection(statuses)
+        self.get_resource_connection.return_value = self.connection
+
+    def test_om_power_cycle(self):
+        # The status read right after the action is still the one from before the cycle
+        self.load_device({'ports-1': ['on', 'off', 'on']})
+        set_module_args({
+            'ports': ["ports-1"],
+            'action': "cycle",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual(3, self.connection.reads)
+        self.assertTrue(result['targets'][0]['succeeded'])
+        self.assertEqual('on', result['targets'][0]['status'])
+
+    def test_om_power_cycle_off_not_seen(self):
+        self.load_device({'ports-1': ['on']})
+        set_module_args({
+            'ports': ["ports-1"],
+            'action': "cycle",
+            'timeout': 0,
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertFalse(result['targets'][0]['succeeded'])
+        self.assertIn('off then on', result['targets'][0]['msg'])
+
+    def test_om_power_status_read_error(self):
+        self.load_device({'ports-1': ['on', {'error': "Port is busy", 'code': 503}]})
+        set_module_args({
+            'ports': ["ports-1"],
+            'action': "off",
+            'timeout': 0,
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertFalse(result['targets'][0]['succeeded'])
+        self.assertIn('could not be read: Port is busy', result['targets'][0]['msg'])
+
+    def test_om_power_status_unknown(self):
+        self.load_device({'ports-1': ['off', None], 'ports-2': ['off', 'on']})
+        set_module_args({
+            'ports': ["ports-*"],
+            'action': "on",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual([None, True], [target['succeeded'] for target in result['targets']])
+        self.assertEqual('unknown', result['targets'][0]['status'])
+        self.assertEqual(1, len(result['warnings']))
+
+    def test_om_power_batches(self):
+        self.load_device({'ports-1': ['on', 'off'], 'ports-2': ['on', 'off']})
+        set_module_args({
+            'ports': ["ports-*"],
+            'action': "off",
+            'max_in_flight': 1,
+        })
+
+        self.execute_module(changed=True)
+        self.assertEqual([['ports/ports-1/power'], ['ports/ports-2/power']], self.connection.actions)
+
+    def test_om_power_stagger(self):
+        # The stagger is waited for between the calls to the persistent connection, not within one
+        self.load_device({'ports-1': ['on', 'off'], 'ports-2': ['on', 'off']})
+        set_module_args({
+            'ports': ["ports-*"],
+            'action': "off",
+            'stagger': 30,
+        })
+
+        with patch("time.sleep") as sleep:
+            self.execute_module(changed=True)
+        self.assertEqual([['ports/ports-1/power'], ['ports/ports-2/power']], self.connection.actions)
+        self.assertGreater(sleep.call_args_list[0][0][0], 29)
+
+    def test_om_power_padded_range(self):
+        # The port numbers are compared by value, ports-[01:02] selects ports-1 and ports-2
+        self.load_device({'ports-1': ['on', 'off'], 'ports-2': ['on', 'off']})
+        set_module_args({
+            'ports': ["ports-[01:02]"],
+            'action': "off",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual(['ports-1', 'ports-2'], [target['port'] for target in result['targets']])
@@ -0,0 +1,207 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from ansible.module_utils.connection import ConnectionError
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_restore,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule
+
+CONFIG = {
+    'system': {'hostname': "om1"},
+    'users': [{'id': "users-1", 'username': "root", 'enabled': True},
+              {'id': "users-2", 'username': "operator", 'enabled': True}],
+}
+
+
+class ImportConnection(object):
+    """ The connection to a device exporting the configurations queued, one per export, the last one being repeated,
+        and recording the imports
+    """
+
+    def __init__(self, exports, import_error=None):
+        self.exports = exports
+        self.import_error = import_error
+        self.imports = []
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def download(self, path, dest_dir, compress=False, algorithm='sha256'):
+        export = self.exports.pop(0) if len(self.exports) > 1 else self.exports[0]
+        file_descriptor, tmp_path = tempfile.mkstemp(dir=dest_dir or self.tmp_dir, prefix='.', suffix='.part')
+        with os.fdopen(file_descriptor, 'w') as file_handle:
+            json.dump(export, file_handle)
+        return {'path': tmp_path}
+
+    def send_request(self, data, path, method='GET'):
+        self.imports.append((method, path, data))
+        if self.import_error:
+            raise self.import_error
+        return None
+
+    def get_stats(self):
+        return None
+
+
+class TestOmRestoreModule(TestOmModule):
+
+    module = om_restore
+
+    def setUp(self):
+        super(TestOmRestoreModule, self).setUp()
+
+        self.mock_get_resource_connection = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "config.restore.restore.get_resource_connection"
+        )
+        self.get_resource_connection = self.mock_get_resource_connection.start()
+        self.src_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super(TestOmRestoreModule, self).tearDown()
+        self.mock_get_resource_connection.stop()
+        shutil.rmtree(self.src_dir)
+        if getattr(self, 'connection', None):
+            # The exports are removed once read
+            self.assertEqual([], os.listdir(self.connection.tmp_dir))
+            shutil.rmtree(self.connection.tmp_dir)
+
+    def load_device(self, exports, import_error=None):
+        self.connection = ImportConnection(exports, import_error)
+        self.get_resource_connection.return_value = self.connection
+
+    def write_backup(self, content, compress=False):
+        path = os.path.join(self.src_dir, 'om1-20240101T000000.json' + ('.gz' if compress else ''))
+        with (gzip.open(path, 'wb') if compress else open(path, 'wb')) as file_handle:
+            file_handle.write(content)
+        return path
+
+    def test_om_restore_unchanged(self):
+        self.load_device([CONFIG])
+        set_module_args({
+            'src': self.write_backup(json.dumps(CONFIG).encode('utf-8')),
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual([], self.connection.imports)
+        self.assertEqual(0, result['counts']['modified'])
+
+    def test_om_restore_import(self):
+        device_config = json.loads(json.dumps(CONFIG))
+        device_config['users'][1]['enabled'] = False
+        # The device exports the configuration of the backup once it was imported
+        self.load_device([device_config, CONFIG])
+        set_module_args({
+            'src': self.write_backup(json.dumps(CONFIG).encode('utf-8'), compress=True),
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual([('POST', 'import', CONFIG)], self.connection.imports)
+        self.assertEqual(1, result['counts']['modified'])
+        self.assertIn('users-2', json.dumps(result['changes']))
+
+    def test_om_restore_check_mode(self):
+        device_config = json.loads(json.dumps(CONFIG))
+        device_config['system']['hostname'] = "om2"
+        self.load_device([device_config])
+        set_module_args({
+            'src': self.write_backup(json.dumps(CONFIG).encode('utf-8')),
+            '_ansible_check_mode': True,
+        })
+
+        self.execute_module(changed=True)
+        self.assertEqual([], self.connection.imports)
+
+    def test_om_restore_verify_mismatch(self):
+        device_config = json.loads(json.dumps(CONFIG))
+        device_config['system']['hostname'] = "om2"
+        # The device keeps its hostname through the import
+        self.load_device([device_config])
+        set_module_args({
+            'src': self.write_backup(json.dumps(CONFIG).encode('utf-8')),
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertTrue(result['changed'])
+        self.assertIn('differs from', result['msg'])
+        self.assertTrue(result['differences'])
+
+    def test_om_restore_no_verify(self):
+        device_config = json.loads(json.dumps(CONFIG))
+        device_config['system']['hostname'] = "om2"
+        self.load_device([device_config])
+        set_module_args({
+            'src': self.write_backup(json.dumps(CONFIG).encode('utf-8')),
+            'verify': False,
+        })
+
+        self.execute_module(changed=True)
+        self.assertEqual(1, len(self.connection.imports))
+
+    def test_om_restore_import_failure(self):
+        device_config = json.loads(json.dumps(CONFIG))
+        device_config['system']['hostname'] = "om2"
+        self.load_device([device_config], ConnectionError("Import in progress", code=409))
+        set_module_args({
+            'src': self.write_backup(json.dumps(CONFIG).encode('utf-8')),
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertEqual('the configuration could not be imported: Import in progress', result['msg'])
+
+    def test_om_restore_missing_src(self):
+        set_module_args({
+            'src': os.path.join(self.src_dir, 'missing.json'),
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertIn('could not be read', result['msg'])
+
+    def test_om_restore_invalid_json(self):
+        set_module_args({
+            'src': self.write_backup(b'{"system": '),
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertIn('could not be read', result['msg'])
+
+    def test_om_restore_truncated_gzip(self):
+        compressed = gzip.compress(json.dumps(CONFIG).encode('utf-8'))
+        path = self.write_backup(b'')
+        with open(path, 'wb') as file_handle:
+            file_handle.write(compressed[:len(compressed) // 2])
+        set_module_args({
+            'src': path,
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertIn('could not be read', result['msg'])
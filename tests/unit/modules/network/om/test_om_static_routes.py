@@ -0,0 +1,234 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.modules import (
+    om_static_routes,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+
+class TestOmStaticRoutesModule(TestOmModule):
+
+    module = om_static_routes
+
+    def setUp(self):
+        super(TestOmStaticRoutesModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.static_routes.static_routes.StaticRoutesFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+    def tearDown(self):
+        super(TestOmStaticRoutesModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+
+    def load_fixtures(self, commands=None, filename="om_static_routes_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+
+    def test_om_static_routes_merged_normalised(self):
+        set_module_args({
+            'config': [
+                {
+                    'destination_address': "10.0.0.5/24",
+                    'gateway_address': "192.168.0.1",
+                    'interface': "net1",
+                    'metric': 1
+                },
+                {
+                    'destination_address': "2001:0db8:0::",
+                    'destination_netmask': 32,
+                    'gateway_address': "2001:DB8::0001",
+                    'interface': "net2"
+                }
+            ],
+            'state': "merged",
+        })
+
+        # The routes are written differently from the device routes, but are the same
+        self.execute_module(changed=False, commands=[])
+
+    def test_om_static_routes_merged_partial_key(self):
+        set_module_args({
+            'config': [
+                {
+                    'destination_address': "10.1.0.0",
+                    'destination_netmask': 16,
+                    'metric': 5
+                },
+                {
+                    'destination_address': "10.0.0.0",
+                    'destination_netmask': 24,
+                    'metric': 5
+                }
+            ],
+            'state': "merged",
+        })
+
+        # The first route matches a single device route and is merged into it, the second one matches two device
+        # routes and is added
+        commands = [
+            {
+                'path': 'static_routes/static_routes-2',
+                'data': {
+                    'static_route': {
+                        'destination_address': "10.1.0.0",
+                        'destination_netmask': 16,
+                        'gateway_address': "192.168.0.254",
+                        'interface': "net1",
+                        'description': None,
+                        'metric': 5
+                    }
+                },
+                'method': 'PUT'
+            },
+            {
+                'path': 'static_routes/',
+                'data': {
+                    'static_route': {
+                        'destination_address': "10.0.0.0",
+                        'destination_netmask': 24,
+                        'metric': 5
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        self.execute_module(changed=True, commands=commands)
+
+    def test_om_static_routes_replaced_ambiguous(self):
+        set_module_args({
+            'config': [
+                {
+                    'id': "static_routes-1",
+                    'destination_address': "10.0.0.0",
+                    'destination_netmask': 24,
+                    'gateway_address': "192.168.0.1",
+                    'interface': "net1",
+                    'metric': 2
+                },
+                {
+                    'destination_address': "10.0.0.0/24",
+                    'gateway_address': "192.168.0.1",
+                    'interface': "net1",
+                    'metric': 3
+                }
+            ],
+            'state': "replaced",
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertEqual('several routes match the device route static_routes-1, only one of them can replace it',
+                         result['msg'])
+
+    def test_om_static_routes_overridden(self):
+        set_module_args({
+            'config': [
+                {
+                    'destination_address': "10.0.0.0/24",
+                    'gateway_address': "192.168.0.1",
+                    'interface': "net1",
+                    'metric': 1
+                },
+                {
+                    'destination_address': "172.16.0.0",
+                    'destination_netmask': 12,
+                    'gateway_address': "192.168.0.1",
+                    'interface': "net1"
+                }
+            ],
+            'state': "overridden",
+        })
+
+        # The device routes that are not kept are deleted before the new route is added
+        commands = [
+            {'path': 'static_routes/static_routes-2', 'data': None, 'method': 'DELETE'},
+            {'path': 'static_routes/static_routes-3', 'data': None, 'method': 'DELETE'},
+            {'path': 'static_routes/static_routes-4', 'data': None, 'method': 'DELETE'},
+            {
+                'path': 'static_routes/',
+                'data': {
+                    'static_route': {
+                        'destination_address': "172.16.0.0",
+                        'destination_netmask': 12,
+                        'gateway_address': "192.168.0.1",
+                        'interface': "net1"
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        self.execute_module(changed=True, commands=commands)
+
+    def test_om_static_routes_rendered(self):
+        set_module_args({
+            'config': [
+                {
+                    'destination_address': "10.0.0.0",
+                    'destination_netmask': 24,
+                    'gateway_address': "192.168.0.1",
+                    'interface': "net1"
+                }
+            ],
+            'state': "rendered",
+        })
+
+        rendered = [
+            {
+                'path': 'static_routes/',
+                'data': {
+                    'static_route': {
+                        'destination_address': "10.0.0.0",
+                        'destination_netmask': 24,
+                        'gateway_address': "192.168.0.1",
+                        'interface': "net1"
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
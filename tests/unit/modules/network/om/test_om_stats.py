@@ -0,0 +1,109 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import tempfile
+
+from ansible import constants as C
+from ansible.parsing.yaml.loader import AnsibleLoader
+
+from ansible_collections.opengear.om.plugins.callback import om_stats
+from ansible_collections.opengear.om.tests.unit.compat import unittest
+from ansible_collections.opengear.om.tests.unit.compat.mock import MagicMock
+
+
+def request_stats(requests, seconds, endpoint="GET users"):
+    return {"requests": requests, "errors": 0, "retries": 1, "cache_hits": 0, "seconds": seconds,
+            "bytes_sent": 10, "bytes_received": 100,
+            "endpoints": {endpoint: {"requests": requests, "errors": 0, "retries": 1, "cache_hits": 0,
+                                     "seconds": seconds, "max_seconds": seconds, "bytes_sent": 10,
+                                     "bytes_received": 100}}}
+
+
+def task_result(host, task, result):
+    task_result = MagicMock()
+    task_result._host.get_name.return_value = host
+    task_result._task._uuid = task
+    task_result._task.get_name.return_value = task
+    task_result._result = result
+    return task_result
+
+
+class TestOmStatsCallback(unittest.TestCase):
+
+    def setUp(self):
+        name = "opengear.om.om_stats"
+        if not C.config.has_configuration_definition("callback", name):
+            doc = AnsibleLoader(om_stats.DOCUMENTATION, file_name=om_stats.__file__).get_single_data()
+            C.config.initialize_plugin_configuration_definitions("callback", name, doc["options"])
+        self.callback = om_stats.CallbackModule()
+        self.callback._load_name = name
+        self.callback._display = MagicMock()
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.output_file = os.path.join(self.output_dir, "om_stats.json")
+        self.callback.set_options(direct={"output_file": self.output_file})
+
+    def test_om_stats_aggregates_hosts_and_tasks(self):
+        self.callback.v2_runner_on_ok(task_result("om1", "users", {"request_stats": request_stats(2, 0.5)}))
+        self.callback.v2_runner_on_failed(task_result("om1", "facts", {"request_stats": request_stats(3, 1.5)}))
+        self.callback.v2_runner_on_ok(task_result("om2", "users", {"results": [
+            {"request_stats": request_stats(1, 0.25)}, {"request_stats": request_stats(1, 0.25, "PUT users/{id}")}]}))
+        self.callback.v2_runner_on_ok(task_result("om2", "ping", {"changed": False}))
+
+        summary = self.callback.summary()
+        self.assertEqual(7, summary["totals"]["requests"])
+        self.assertEqual(2.5, summary["totals"]["seconds"])
+        self.assertEqual(5, summary["hosts"]["om1"]["requests"])
+        self.assertEqual(2, summary["hosts"]["om1"]["tasks"])
+        self.assertEqual(1, summary["hosts"]["om2"]["tasks"])
+        self.assertEqual({"users": 4, "facts": 3}, dict((task, totals["requests"])
+                                                        for task, totals in summary["tasks"].items()))
+        self.assertEqual(6, summary["endpoints"]["GET users"]["requests"])
+        self.assertEqual(0.25, summary["endpoints"]["PUT users/{id}"]["mean_seconds"])
+
+    def test_om_stats_fleet_facts_per_device(self):
+        # The requests of om_fleet_facts count for the devices they were sent to, not for the host it ran on
+        self.callback.v2_runner_on_ok(task_result("localhost", "fleet", {"fleet_request_stats": {
+            "om1": request_stats(4, 1.0), "om2": request_stats(2, 0.5)}}))
+
+        summary = self.callback.summary()
+        self.assertEqual(["om1", "om2"], sorted(summary["hosts"]))
+        self.assertEqual(4, summary["hosts"]["om1"]["requests"])
+        self.assertEqual(2, summary["tasks"]["fleet"]["hosts"])
+
+    def test_om_stats_report(self):
+        self.callback.v2_runner_on_ok(task_result("om1", "users", {"request_stats": request_stats(2, 0.5)}))
+        self.callback.v2_playbook_on_stats(None)
+
+        self.callback._display.banner.assert_called_once_with("OM REQUESTS")
+        with open(self.output_file) as output:
+            self.assertEqual(2, json.load(output)["totals"]["requests"])
+
+    def test_om_stats_no_report_without_stats(self):
+        self.callback.v2_runner_on_ok(task_result("om1", "ping", {"changed": False}))
+        self.callback.v2_playbook_on_stats(None)
+
+        self.callback._display.banner.assert_not_called()
+        self.assertFalse(os.path.exists(self.output_file))
@@ -0,0 +1,342 @@
+# (c) 2016 Red Hat Inc.
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import shutil
+import tempfile
+
+from ansible.module_utils.connection import ConnectionError
+
+from ansible_collections.opengear.om.tests.unit.compat.mock import patch
+from ansible_collections.opengear.om.plugins.module_utils.network.om.config.base import PROFILE_DIR_ENV
+from ansible_collections.opengear.om.plugins.modules import (
+    om_system,
+)
+from ansible_collections.opengear.om.tests.unit.modules.utils import (
+    set_module_args,
+)
+from .om_module import TestOmModule, load_fixture
+
+# The keys of the om_system_keys_config.cfg fixture, root's then admin's, and a key the device does not have
+ROOT_KEY = "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIMqXgRLKG73K+sIxs5oj3E2nhu/4FHxOcrmAd4Wv7ki7 root@host"
+ADMIN_KEY = "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAID4j6BYAOVlKM4lPZWThsTSLvXoAiNQsSstz7q7VnACd admin@host"
+NEW_KEY = "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIC59LAOpUHriZez1tTVohaUzk6ICnSQTlJlyZaGiWu/G root@laptop"
+
+
+class TestOmSystemModule(TestOmModule):
+
+    module = om_system
+
+    def setUp(self):
+        super(TestOmSystemModule, self).setUp()
+
+        self.mock_get_device_data = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "facts.system.system.SystemFacts.get_device_data"
+        )
+        self.get_device_data = self.mock_get_device_data.start()
+
+        self.mock_get_resource_connection_config = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.cfg.base.get_resource_connection"
+        )
+        self.get_resource_connection_config = (
+            self.mock_get_resource_connection_config.start()
+        )
+        self.mock_get_resource_connection_facts = patch(
+            "ansible_collections.ansible.netcommon.plugins.module_utils."
+            "network.common.facts.facts.get_resource_connection"
+        )
+        self.get_resource_connection_facts = (
+            self.mock_get_resource_connection_facts.start()
+        )
+
+        # The device is not watched going down, its uptime shows whether it restarted
+        self.mock_reboot_down_timeout = patch(
+            "ansible_collections.opengear.om.plugins.module_utils.network.om."
+            "config.system.system.REBOOT_DOWN_TIMEOUT", 0
+        )
+        self.mock_reboot_down_timeout.start()
+
+    def tearDown(self):
+        super(TestOmSystemModule, self).tearDown()
+        self.mock_get_device_data.stop()
+        self.mock_get_resource_connection_facts.stop()
+        self.mock_get_resource_connection_config.stop()
+        self.mock_reboot_down_timeout.stop()
+
+    def load_fixtures(self, commands=None, filename="om_system_config.cfg"):
+        def load_from_file(*args, **kwargs):
+            return load_fixture(filename)
+
+        self.get_device_data.side_effect = load_from_file
+
+    def load_device(self, uptime):
+        """ A device that keeps answering probes, as if it restarted between two of them, with the uptime given
+        """
+        def send_request(data, path, method='GET'):
+            if path == 'system/uptime':
+                return {'system_uptime': {'uptime': uptime}}
+            return None
+
+        connection = self.get_resource_connection_config.return_value
+        connection.probe.return_value = True
+        connection.send_request.side_effect = send_request
+        return connection
+
+    def load_keys(self, responses=None):
+        """ The device holding the om_system_keys_config.cfg keys, answering the key commands with the responses given
+        """
+        connection = self.get_resource_connection_config.return_value
+        connection.send_requests.side_effect = lambda commands: (
+            responses if responses is not None else [{'response': None}] * len(commands))
+        return connection
+
+    def test_om_system_keys_existing(self):
+        connection = self.load_keys()
+        set_module_args({
+            'config': {
+                'system_authorized_keys': [
+                    {'key': ROOT_KEY, 'username': "root"},
+                    {'key': ADMIN_KEY}
+                ]
+            },
+            'state': "merged",
+        })
+
+        # The keys are matched by fingerprint, the comment of a key is not compared
+        self.execute_module(changed=False, commands=[], filename="om_system_keys_config.cfg")
+        connection.send_requests.assert_not_called()
+
+    def test_om_system_keys_new(self):
+        connection = self.load_keys()
+        set_module_args({
+            'config': {
+                'system_authorized_keys': [
+                    {'key': ROOT_KEY, 'username': "root"},
+                    {'key': NEW_KEY, 'username': "root"},
+                    {'key': ADMIN_KEY, 'username': "root"}
+                ]
+            },
+            'state': "merged",
+        })
+
+        # A known key is added for another user
+        commands = [
+            {'path': 'system/system_authorized_keys', 'method': 'POST',
+             'data': {'system_authorized_key': {'key': NEW_KEY, 'username': "root"}}},
+            {'path': 'system/system_authorized_keys', 'method': 'POST',
+             'data': {'system_authorized_key': {'key': ADMIN_KEY, 'username': "root"}}},
+        ]
+        self.execute_module(changed=True, commands=commands, filename="om_system_keys_config.cfg")
+        connection.send_requests.assert_called_once_with(commands)
+
+    def test_om_system_keys_overridden(self):
+        connection = self.load_keys()
+        set_module_args({
+            'config': {
+                'system_authorized_keys': [
+                    {'key': ROOT_KEY},
+                    {'key': NEW_KEY, 'username': "root"}
+                ]
+            },
+            'state': "overridden",
+        })
+
+        commands = [
+            {'path': 'system/system_authorized_keys/system_authorized_keys-2', 'method': 'DELETE', 'data': None},
+            {'path': 'system/system_authorized_keys', 'method': 'POST',
+             'data': {'system_authorized_key': {'key': NEW_KEY, 'username': "root"}}},
+        ]
+        result = self.execute_module(changed=True, filename="om_system_keys_config.cfg")
+        self.assertEqual(commands, [command for command in result['commands']
+                                    if command['path'].startswith('system/system_authorized_keys')])
+        connection.send_requests.assert_called_once_with(commands)
+
+    def test_om_system_keys_overridden_none(self):
+        self.load_keys()
+        set_module_args({
+            'config': {
+                'hostname': "om1"
+            },
+            'state': "overridden",
+        })
+
+        commands = [
+            {'path': 'system/system_authorized_keys/system_authorized_keys-1', 'method': 'DELETE', 'data': None},
+            {'path': 'system/system_authorized_keys/system_authorized_keys-2', 'method': 'DELETE', 'data': None},
+        ]
+        self.execute_module(changed=True, commands=commands, filename="om_system_keys_config.cfg")
+
+    def test_om_system_keys_deleted(self):
+        self.load_keys()
+        set_module_args({
+            'config': {
+                'system_authorized_keys': [
+                    {'key': ADMIN_KEY},
+                    {'id': "system_authorized_keys-1"},
+                    {'key': NEW_KEY}
+                ]
+            },
+            'state': "deleted",
+        })
+
+        commands = [
+            {'path': 'system/system_authorized_keys/system_authorized_keys-2', 'method': 'DELETE', 'data': None},
+            {'path': 'system/system_authorized_keys/system_authorized_keys-1', 'method': 'DELETE', 'data': None},
+        ]
+        self.execute_module(changed=True, commands=commands, filename="om_system_keys_config.cfg")
+
+    def test_om_system_keys_failed(self):
+        connection = self.load_keys([{'response': None}, {'error': "The key is not valid", 'code': 400}])
+        self.load_fixtures(filename="om_system_keys_config.cfg")
+        set_module_args({
+            'config': {
+                'hostname': "om2",
+                'system_authorized_keys': [
+                    {'key': ROOT_KEY, 'username': "root"},
+                    {'key': NEW_KEY, 'username': "root"},
+                    {'key': ADMIN_KEY, 'username': "root"}
+                ]
+            },
+            'state': "merged",
+        })
+
+        # The other commands are not sent once a key could not be added
+        with self.assertRaises(ConnectionError) as context:
+            self.module.main()
+        self.assertEqual("The key is not valid", context.exception.args[0])
+        self.assertEqual(400, context.exception.code)
+        connection.send_request.assert_not_called()
+
+    def load_profile_dir(self, profile_dir):
+        """ Profile the module into profile_dir, or not at all when it is None
+        """
+        self.mock_environ = patch.dict(os.environ)
+        self.mock_environ.start()
+        self.addCleanup(self.mock_environ.stop)
+        os.environ.pop(PROFILE_DIR_ENV, None)
+        if profile_dir:
+            os.environ[PROFILE_DIR_ENV] = profile_dir
+        self.get_resource_connection_config.return_value.get_option.return_value = "om1.example.com"
+
+    def test_om_system_profile(self):
+        profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_dir)
+        self.load_profile_dir(os.path.join(profile_dir, "profiles"))
+        set_module_args({
+            'config': {
+                'hostname': "om2"
+            },
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        stages = ['dispatch', 'format', 'gather', 'plan', 'verify']
+        self.assertEqual(stages, sorted(result['profile']))
+        files = []
+        for stage in stages:
+            profile_file, memory_file = result['profile'][stage]['files']
+            self.assertTrue(os.path.basename(profile_file).startswith("om1.example.com-system-merged-"))
+            self.assertTrue(profile_file.endswith("-%s.prof" % stage))
+            self.assertTrue(memory_file.endswith("-%s.mem" % stage))
+            with open(memory_file) as file_handle:
+                self.assertTrue(file_handle.readline().startswith("%s: " % stage))
+            self.assertGreater(os.path.getsize(profile_file), 0)
+            files.extend([profile_file, memory_file])
+        # The directory is created with the first stage
+        self.assertEqual(sorted(os.path.basename(path) for path in files),
+                         sorted(os.listdir(os.path.join(profile_dir, "profiles"))))
+
+    def test_om_system_profile_gathered(self):
+        profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_dir)
+        self.load_profile_dir(profile_dir)
+        set_module_args({
+            'state': "gathered",
+        })
+
+        result = self.execute_module()
+        self.assertEqual(['format', 'gather'], sorted(result['profile']))
+        self.assertEqual(4, len(os.listdir(profile_dir)))
+
+    def test_om_system_profile_unset(self):
+        profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, profile_dir)
+        self.load_profile_dir(None)
+        set_module_args({
+            'config': {
+                'hostname': "om2"
+            },
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertNotIn('profile', result)
+        self.assertEqual([], os.listdir(profile_dir))
+
+    def test_om_system_reboot_outage_not_seen(self):
+        connection = self.load_device(0)
+        set_module_args({
+            'config': {
+                'reboot': True
+            },
+            'wait_for_reboot': True,
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertIn('time_to_ready', result)
+        self.assertIn(((None, 'system/uptime', 'GET'), {}), connection.send_request.call_args_list)
+
+    def test_om_system_reboot_not_restarted(self):
+        self.load_device(86400)
+        set_module_args({
+            'config': {
+                'reboot': True
+            },
+            'wait_for_reboot': True,
+            'reboot_timeout': 0,
+            'state': "merged",
+        })
+
+        result = self.execute_module(failed=True)
+        self.assertIn('did not restart within 0 seconds', result['msg'])
+
+    def test_om_system_rendered(self):
+        set_module_args({
+            'config': {
+                'hostname': "om1",
+                'timezone': "UTC",
+                'cell_reliability_test': {
+                    'enabled': True
+                }
+            },
+            'state': "rendered",
+        })
+
+        # The cell reliability test has no endpoint to write it to
+        rendered = [
+            {'path': 'system/hostname', 'data': {'system_hostname': {'hostname': "om1"}}, 'method': 'PUT'},
+            {'path': 'system/timezone', 'data': {'system_timezone': {'timezone': "UTC"}}, 'method': 'PUT'},
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, sorted(result['rendered'], key=lambda command: command['path']))
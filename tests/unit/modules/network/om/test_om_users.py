@@ -20,6 +20,10 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import json
+import os
+import tempfile
+
 from ansible_collections.opengear.om.tests.unit.compat.mock import patch
 from ansible_collections.opengear.om.plugins.modules import (
     om_users,
@@ -27,6 +31,9 @@ from ansible_collections.opengear.om.plugins.modules import (
 from ansible_collections.opengear.om.tests.unit.modules.utils import (
     set_module_args,
 )
+from ansible_collections.opengear.om.plugins.module_utils.network.om.utils.utils import (
+    verify_password,
+)
 from .om_module import TestOmModule, load_fixture
 
 
@@ -34,8 +41,8 @@ class TestOmUsersModule(TestOmModule):
 
     module = om_users
 
-    def set_up(self):
-        super(TestOmUsersModule, self).set_up()
+    def setUp(self):
+        super(TestOmUsersModule, self).setUp()
 
         self.mock_get_device_data = patch(
             "ansible_collections.opengear.om.plugins.module_utils.network.om."
@@ -64,9 +71,9 @@ class TestOmUsersModule(TestOmModule):
         self.mock_get_resource_connection_facts.stop()
         self.mock_get_resource_connection_config.stop()
 
-    def load_fixtures(self, commands=None):
+    def load_fixtures(self, commands=None, filename="om_users_config.cfg"):
         def load_from_file(*args, **kwargs):
-            return load_fixture("om_users_config.cfg")
+            return load_fixture(filename)
 
         self.get_device_data.side_effect = load_from_file
 
@@ -104,9 +111,9 @@ class TestOmUsersModule(TestOmModule):
                         'ssh_password_enabled': True,
                         'password': None,
                         'hashed_password': (
-                            "{{ 'hash' }}"
+                            "$5$vqpQsIj./5/2OOBo$tTUYAJaEqbZYf4aipKicPF5bpkkGSEqtBy3t4dylp0/"
                         ),
-                        'groups': ['g2', 'g1']
+                        'groups': ['g1', 'g2']
                     }
                 },
                 'method': 'PUT'
@@ -125,7 +132,11 @@ class TestOmUsersModule(TestOmModule):
                 'method': 'POST'
             }
         ]
-        self.execute_module(changed=True, commands=commands)
+        result = self.execute_module(changed=True)
+        # The merged groups come out of a set, in no particular order
+        for command in result['commands']:
+            command['data']['user']['groups'].sort()
+        self.assertEqual(commands, result['commands'])
 
     def test_om_users_merged_idempotent(self):
         set_module_args({
@@ -134,7 +145,7 @@ class TestOmUsersModule(TestOmModule):
                     'username': "user1",
                     'enabled': True,
                     'hashed_password': (
-                        "{{ 'hash' }}"
+                        "$5$vqpQsIj./5/2OOBo$tTUYAJaEqbZYf4aipKicPF5bpkkGSEqtBy3t4dylp0/"
                     ),
                     'groups': ["g1"]
                 },
@@ -151,6 +162,103 @@ class TestOmUsersModule(TestOmModule):
         commands = []
         self.execute_module(changed=False, commands=commands)
 
+    def test_om_users_merged_password_idempotent(self):
+        set_module_args({
+            'config': [
+                {
+                    'username': "user1",
+                    'enabled': True,
+                    'password': "secret",
+                    'groups': ["g1"]
+                }
+            ],
+            'state': "merged",
+        })
+
+        commands = []
+        self.execute_module(changed=False, commands=commands, filename="om_users_password_config.cfg")
+
+    def test_om_users_merged_hash_passwords(self):
+        set_module_args({
+            'config': [
+                {
+                    'username': "user1",
+                    'password': "changed",
+                },
+                {
+                    'username': "user2",
+                    'password': "changed",
+                }
+            ],
+            'hash_passwords': True,
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True, filename="om_users_password_config.cfg")
+        self.assertEqual(['users/users-1', 'users/users-2'], [command['path'] for command in result['commands']])
+        for command in result['commands']:
+            self.assertNotIn('password', command['data']['user'])
+            self.assertTrue(verify_password('changed', command['data']['user']['hashed_password']))
+
+    def test_om_users_merged_result_format_summary(self):
+        set_module_args({
+            'config': [
+                {
+                    'username': "user2",
+                    'password': "changed",
+                }
+            ],
+            'hash_passwords': True,
+            'result_format': "summary",
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True, filename="om_users_password_config.cfg")
+        self.assertNotIn('before', result)
+        self.assertNotIn('after', result)
+        self.assertNotIn('commands', result)
+        self.assertEqual(1, result['counts']['commands'])
+
+    def test_om_users_merged_result_format_diff_check_mode(self):
+        set_module_args({
+            'config': [
+                {
+                    'username': "user2",
+                    'password': "changed",
+                }
+            ],
+            'hash_passwords': True,
+            'result_format': "diff",
+            'state': "merged",
+            '_ansible_check_mode': True,
+        })
+
+        # The configuration is not read back in check mode, so the changes are not reported
+        result = self.execute_module(changed=True, filename="om_users_password_config.cfg")
+        self.assertNotIn('changes', result)
+        self.assertEqual({'commands': 1}, result['counts'])
+        self.assertEqual(1, len(result['commands']))
+
+    def test_om_users_merged_cassette(self):
+        self.mock_get_device_data.stop()
+        self.replay_cassette("om_users_merged.cassette")
+        set_module_args({
+            'config': [
+                {
+                    'id': "users-1",
+                    'username': "user1",
+                    'description': "Changed while recording",
+                    'groups': ["g1", "g2"]
+                }
+            ],
+            'state': "merged",
+        })
+
+        result = self.execute_module(changed=True)
+        self.assertEqual(['users/users-1'], [command['path'] for command in result['commands']])
+        self.assertEqual("Changed while recording", result['after'][0]['description'])
+        self.assertEqual(result['before'][1], result['after'][1])
+
     def test_om_users_replaced(self):
         set_module_args({
             'config': [
@@ -210,7 +318,7 @@ class TestOmUsersModule(TestOmModule):
                     'username': "user1",
                     'enabled': True,
                     'hashed_password': (
-                        "{{ 'hash' }}"
+                        "$5$vqpQsIj./5/2OOBo$tTUYAJaEqbZYf4aipKicPF5bpkkGSEqtBy3t4dylp0/"
                     ),
                     'groups': ["g1"]
                 },
@@ -287,7 +395,7 @@ class TestOmUsersModule(TestOmModule):
                     'username': "user1",
                     'enabled': True,
                     'hashed_password': (
-                        "{{ 'hash' }}"
+                        "$5$vqpQsIj./5/2OOBo$tTUYAJaEqbZYf4aipKicPF5bpkkGSEqtBy3t4dylp0/"
                     ),
                     'groups': ["g1"]
                 },
@@ -346,8 +454,36 @@ class TestOmUsersModule(TestOmModule):
             'state': "rendered",
         })
 
-        commands = []
-        self.execute_module(changed=False, commands=commands)
+        rendered = [
+            {
+                'path': 'users/',
+                'data': {
+                    'user': {
+                        'username': "user1-modified",
+                        'description': "This user was changed",
+                        'enabled': False,
+                        'no_password': True,
+                        'groups': ["g2"]
+                    }
+                },
+                'method': 'POST'
+            },
+            {
+                'path': 'users/',
+                'data': {
+                    'user': {
+                        'username': "user3",
+                        'description': "This user was added",
+                        'enabled': True,
+                        'no_password': True,
+                        'groups': ["g1"]
+                    }
+                },
+                'method': 'POST'
+            }
+        ]
+        result = self.execute_module(changed=False)
+        self.assertEqual(rendered, result['rendered'])
 
     def test_om_users_gathered(self):
         set_module_args({
@@ -371,6 +507,123 @@ class TestOmUsersModule(TestOmModule):
             'state': "gathered",
         })
 
-        commands = []
+        result = self.execute_module(changed=False)
+        self.assertEqual(['user1', 'user2'], [user['username'] for user in result['gathered']])
 
-        self.execute_module(changed=False, commands=commands)
+    def test_om_users_parsed(self):
+        set_module_args({
+            'running_config': json.dumps([
+                {
+                    'id': "users-7",
+                    'username': "user7",
+                    'description': "A saved user",
+                    'enabled': True,
+                    'no_password': False,
+                    'groups': ["g1"],
+                    'rest_only': True
+                }
+            ]),
+            'state': "parsed",
+        })
+
+        result = self.execute_module(changed=False)
+        self.assertEqual([{
+            'id': "users-7",
+            'username': "user7",
+            'description': "A saved user",
+            'enabled': True,
+            'no_password': False,
+            'ssh_password_enabled': None,
+            'groups': ["g1"],
+            'hashed_password': None,
+            'password': None
+        }], result['parsed'])
+        self.get_device_data.assert_not_called()
+
+    def test_om_users_plan_and_apply(self):
+        plan_file = os.path.join(tempfile.mkdtemp(), 'users.plan')
+        set_module_args({
+            'config': [
+                {'username': "user2"}
+            ],
+            'state': "deleted",
+            'plan_mode': "plan",
+            'plan_file': plan_file,
+        })
+
+        commands = [
+            {
+                'path': 'users/users-2',
+                'data': None,
+                'method': 'DELETE'
+            }
+        ]
+        result = self.execute_module(changed=True, commands=commands)
+        self.assertNotIn('after', result)
+        with open(plan_file) as f:
+            self.assertEqual(commands, json.load(f)['commands'])
+
+        set_module_args({
+            'state': "deleted",
+            'plan_mode': "apply",
+            'plan_file': plan_file,
+        })
+        self.execute_module(changed=True, commands=commands)
+
+    def test_om_users_apply_stale_plan(self):
+        plan_file = os.path.join(tempfile.mkdtemp(), 'users.plan')
+        with open(plan_file, 'w') as f:
+            json.dump({'resource': 'users', 'state': 'deleted', 'fingerprint': 'stale', 'commands': []}, f)
+        set_module_args({
+            'state': "deleted",
+            'plan_mode': "apply",
+            'plan_file': plan_file,
+        })
+
+        self.execute_module(failed=True)
+
+    def test_om_users_plan_running_config(self):
+        # The real get_resource_connection would fail to reach the device
+        self.mock_get_resource_connection_config.stop()
+        self.mock_get_resource_connection_facts.stop()
+        plan_file = os.path.join(tempfile.mkdtemp(), 'users.plan')
+        set_module_args({
+            'config': [
+                {'username': "user2"}
+            ],
+            'state': "deleted",
+            'plan_mode': "plan",
+            'plan_file': plan_file,
+            'running_config': json.dumps(load_fixture("om_users_config.cfg")),
+        })
+
+        commands = [
+            {
+                'path': 'users/users-2',
+                'data': None,
+                'method': 'DELETE'
+            }
+        ]
+        result = self.execute_module(changed=True, commands=commands)
+        self.assertNotIn('after', result)
+        self.get_device_data.assert_not_called()
+        self.mock_get_resource_connection_config.start()
+        self.mock_get_resource_connection_facts.start()
+
+    def test_om_users_plan_clear_text_password(self):
+        plan_file = os.path.join(tempfile.mkdtemp(), 'users.plan')
+        set_module_args({
+            'config': [
+                {
+                    'username': "user1",
+                    'password': "changed",
+                }
+            ],
+            'state': "merged",
+            'plan_mode': "plan",
+            'plan_file': plan_file,
+        })
+
+        result = self.execute_module(failed=True, filename="om_users_password_config.cfg")
+        self.assertIn('clear text password', result['msg'])
+        self.assertFalse(os.path.exists(plan_file))